@@ -1,14 +1,31 @@
 # app.py
 import tkinter as tk
 from tkinter import ttk, messagebox, colorchooser, Toplevel
+import io
 import json
+from collections import OrderedDict
 import os
-from datetime import datetime
-import graphviz
-from PIL import Image, ImageTk
-from constants import DATA_FILE, GROW_LOG_FILE, CONFIG_FILE, DEFAULT_COLORS, BACKGROUND_COLOR, TEXT_COLOR
-from components import ScrollableFrame
+from datetime import date, datetime
+from constants import DATA_FILE, GROW_LOG_FILE, CONFIG_FILE, DEFAULT_COLORS, BACKGROUND_COLOR, TEXT_COLOR, LINEAGE_CACHE_SIZE
+from components import VirtualGrid, StrainPicker, BusyIndicator
+from strain_index import StrainNameIndex
+from roles import RoleIndex
+from detail_view import DetailViewPool
+from executor import BackgroundExecutor, write_json_text
+from lineage_render import render_lineage_png
+from events import EventBus, STRAIN_EVENTS, LOG_EVENTS, STRAIN_ADDED, STRAIN_UPDATED, STRAIN_DELETED, STRAINS_RESET
 from grow_log import GrowLogApp
+from grow_log_store import GrowLogStore
+from query import compile_query, strains_with_log_matches, QueryError, TRAIT_FIELDS
+from timeline import StageTimelineEngine, HARVESTED_STAGES
+from traits import TraitRangeCache
+from clones import clone_suffix, allocate_clone_names, migrate_clone_records, CloneRegistry, CLONE_FIELDS
+from trait_map import TraitMapPool, EMPTY_TRAITS
+from dashboard import StageDashboard
+from pheno_hunt import PhenoHuntEngine
+from similarity_view import SimilarStrainsWindow
+from breeding_view import BreedingPlannerWindow
+from cross_view import CrossRecommenderWindow
 
 import logging
 
@@ -22,15 +39,74 @@ class CannabisGeneticsApp:
         self.root.geometry("1400x1100")
         self.root.configure(bg=BACKGROUND_COLOR)
 
+        # Background work (saves, rendering) runs off the main loop
+        self.busy_indicator = BusyIndicator(self.root)
+        self.busy_indicator.pack(side='bottom', fill='x')
+        self.executor = BackgroundExecutor(self.root, busy_callback=self.busy_indicator.set_busy)
+        self.lineage_render_token = None
+        self.lineage_png_cache = OrderedDict()  # DOT source -> PNG bytes, most recent last
+        self.lineage_shown = None  # (plant name, roles drawn) for the tree on screen
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
         # Load or initialize configuration
         self.legend_colors = self.load_config()
+        self.applied_colors = dict(self.legend_colors)  # Colors the live widgets currently show
 
         # Load genetics data
         self.plant_genetics = self.load_genetics_data()
 
+        # Clones share their mother's read-only genetic_info until one of them is edited
+        self.trait_maps = TraitMapPool()
+        self.trait_maps.share_all(self.plant_genetics)
+
+        # Classify every strain once; kept current incrementally as strains change
+        self.roles = RoleIndex(lambda: self.plant_genetics)
+
+        # Mother -> clones, from each clone's 'mother' field (inferred once for older records)
+        migrate_clone_records(self.plant_genetics)
+        self.clone_registry = CloneRegistry(lambda: self.plant_genetics)
+
         # Determine parent strains
         self.parent_strains = self.get_parent_strains()
 
+        # Name indexes behind the type-ahead strain pickers
+        self.strain_index = StrainNameIndex(lambda: self.plant_genetics.keys())
+        self.parent_index = StrainNameIndex(lambda: self.parent_strains)
+
+        # Plant detail windows are built once and recycled
+        self.detail_views = DetailViewPool(self, self.root)
+
+        # Model changes are published here and applied to the views once per idle cycle
+        self.events = EventBus(self.root)
+        self.grid_view = "owned"  # Which builder last filled the strain grid: "owned" or "search"
+
+        # Flowering time and yield parsed into numeric ranges, reparsed only after edits
+        self.trait_ranges = TraitRangeCache(lambda: self.plant_genetics)
+
+        # Typed genetic_info traits in NumPy columns, built the first time a query needs them
+        self.trait_store = None
+        self.similarity_engines = {}  # (column set, metric) -> similarity.SimilarityEngine
+        self.breeding_planner = None
+        self.cross_recommender = None
+        self.genotype_projector = None
+
+        # Models and indexes subscribe before any view, so views never read them a batch behind
+        self.events.subscribe(self.apply_strain_models, STRAIN_EVENTS)
+
+        # The grow log and its index, loaded the first time anything reads the log
+        self.grow_log_store = None
+
+        # Stage, days in stage and harvest window for every plant, cached per strain
+        self.stage_timelines = StageTimelineEngine(self.get_grow_log_index, self.trait_ranges.flowering_days)
+        self.events.subscribe(self.stage_timelines.apply, LOG_EVENTS + (STRAINS_RESET,))
+
+        # Seed batches of each pheno hunt and their rankings, built the first time they are shown
+        self.pheno_hunts = None
+        self.events.subscribe(self.apply_pheno_hunts, STRAIN_EVENTS + LOG_EVENTS)
+
+        # Views last
+        self.events.subscribe(self.on_strains_changed, STRAIN_EVENTS)
+
         # Create Notebook
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill='both', expand=True)
@@ -47,15 +123,43 @@ class CannabisGeneticsApp:
         self.grow_log_tab = tk.Frame(self.notebook, bg=BACKGROUND_COLOR)
         self.notebook.add(self.grow_log_tab, text="Grow Log")
 
+        # Dashboard Tab
+        self.dashboard_tab = tk.Frame(self.notebook, bg=BACKGROUND_COLOR)
+        self.notebook.add(self.dashboard_tab, text="Dashboard")
+
         # Settings Tab
         self.settings_tab = tk.Frame(self.notebook, bg=BACKGROUND_COLOR)
         self.notebook.add(self.settings_tab, text="Settings")
 
-        # Initialize each tab
-        self.initialize_grow_log_tab()
-        self.initialize_genetics_tab()
-        self.initialize_lineage_tab()
-        self.initialize_settings_tab()
+        # Tabs are built the first time they are shown
+        self.tab_builders = {
+            str(self.genetics_tab): self.initialize_genetics_tab,
+            str(self.lineage_tab): self.initialize_lineage_tab,
+            str(self.grow_log_tab): self.initialize_grow_log_tab,
+            str(self.dashboard_tab): self.initialize_dashboard_tab,
+            str(self.settings_tab): self.initialize_settings_tab,
+        }
+        self.built_tabs = set()
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+        self.on_tab_changed()
+
+    def on_tab_changed(self, event=None):
+        self.ensure_tab(self.notebook.select())
+
+    def ensure_tab(self, tab):
+        """
+        Builds a tab if it has not been built yet. Used by code that needs
+        another tab's widgets or data before the user has opened it.
+        """
+        tab = str(tab)
+        if tab in self.built_tabs or tab not in self.tab_builders:
+            return
+        self.built_tabs.add(tab)
+        logging.debug(f"Building tab {tab} on first display...")
+        self.tab_builders[tab]()
+
+    def is_tab_built(self, tab):
+        return str(tab) in self.built_tabs
 
     def load_config(self):
         logging.debug("Loading configuration...")
@@ -108,28 +212,132 @@ class CannabisGeneticsApp:
             return {}
 
     def get_parent_strains(self):
-        logging.debug("Determining parent strains...")
-        parents = set()
-        for details in self.plant_genetics.values():
-            lineage = details.get('lineage', '')
-            if lineage and lineage != "Unknown":
-                parent_list = [parent.strip() for parent in lineage.split(' x ')]
-                parents.update(parent_list)
+        # The role index already tracks which names are referenced as parents
+        parents = self.roles.parent_names()
         logging.debug(f"Parent strains identified: {parents}")
         return parents
 
     def save_genetics_data(self):
         logging.debug("Saving genetics data...")
-        with open(DATA_FILE, 'w') as file:
-            json.dump(self.plant_genetics, file, indent=4)
-        logging.debug("Genetics data saved successfully.")
+        # Serialize now so later edits can't race the write, then write in the background
+        text = json.dumps(self.plant_genetics, indent=4)
+        self.executor.submit_write(write_json_text, DATA_FILE, text,
+                                   on_done=lambda _: logging.debug("Genetics data saved successfully."),
+                                   on_error=self.on_save_error)
+
+    def on_save_error(self, e):
+        messagebox.showerror("Error", f"Failed to save plant_genetics.json: {e}")
+        logging.error(f"Failed to save genetics data: {e}")
+
+    def on_close(self):
+        logging.debug("Closing application; flushing pending saves...")
+        self.executor.shutdown()
+        self.root.destroy()
 
     def initialize_grow_log_tab(self):
         logging.debug("Initializing Grow Log Tab...")
         # Initialize Grow Log App within the Grow Log Tab
-        self.grow_log_app = GrowLogApp(self.grow_log_tab, self.plant_genetics, self)
+        self.grow_log_app = GrowLogApp(self.grow_log_tab, self.plant_genetics, self, self.get_grow_log_store())
         logging.debug("Grow Log Tab initialized successfully.")
 
+    def get_grow_log_store(self):
+        """The shared grow log (see grow_log_store.py), loaded on first use without building any tab."""
+        if self.grow_log_store is None:
+            self.grow_log_store = GrowLogStore(GROW_LOG_FILE, self.executor)
+            if self.grow_log_store.error:
+                messagebox.showerror("Error", self.grow_log_store.error)
+            if self.grow_log_store.problems:
+                messagebox.showwarning(
+                    "Grow Log",
+                    f"{len(self.grow_log_store.problems)} row(s) in grow_log.json could not be read and were set "
+                    "aside; they are kept in the file but not shown:\n" + "\n".join(self.grow_log_store.problems[:10]))
+        return self.grow_log_store
+
+    def get_grow_log_index(self):
+        """The per-strain, date-sorted index over the grow log."""
+        return self.get_grow_log_store().index
+
+    def get_pheno_hunts(self):
+        """The PhenoHuntEngine (see pheno_hunt.py), built on first use."""
+        if self.pheno_hunts is None:
+            self.pheno_hunts = PhenoHuntEngine(lambda: self.plant_genetics, self.get_grow_log_index,
+                                               self.clone_registry.keeper_of, self.clone_registry.descendants)
+        return self.pheno_hunts
+
+    def apply_pheno_hunts(self, batch):
+        if self.pheno_hunts is not None:
+            self.pheno_hunts.apply(batch)
+
+    def get_trait_store(self):
+        """The columnar trait store (see trait_store.py), building it on first use so NumPy loads only then."""
+        if self.trait_store is None:
+            from trait_store import TraitStore
+            self.trait_store = TraitStore(lambda: self.plant_genetics)
+        return self.trait_store
+
+    def apply_strain_models(self, batch):
+        """Brings every strain model and index up to date with one batch of strain events."""
+        self.roles.apply(batch)
+        self.clone_registry.apply(batch)
+        self.trait_ranges.apply(batch)
+        if self.trait_store is not None:
+            self.trait_store.apply(batch)
+        for engine in self.similarity_engines.values():
+            engine.apply(batch)
+        if self.genotype_projector is not None:
+            self.genotype_projector.apply(batch)
+
+    def get_similarity_engine(self, column_set="traits", metric="cosine"):
+        """
+        The kNN engine comparing strains by all numeric traits ("traits") or
+        terpenes only ("terpenes"), one per column set and metric, kept for reuse.
+        """
+        key = (column_set, metric)
+        if key not in self.similarity_engines:
+            from similarity import SimilarityEngine, TRAIT_VECTOR_COLUMNS, TERPENE_COLUMNS
+            columns = TERPENE_COLUMNS if column_set == "terpenes" else TRAIT_VECTOR_COLUMNS
+            self.similarity_engines[key] = SimilarityEngine(self.get_trait_store(), columns, metric)
+        return self.similarity_engines[key]
+
+    def show_similar_strains(self, plant_name):
+        SimilarStrainsWindow(self.root, self, plant_name, BACKGROUND_COLOR, TEXT_COLOR)
+
+    def get_breeding_planner(self):
+        """Offspring simulation over the trait store and the lineage graph, built on first use."""
+        if self.breeding_planner is None:
+            from breeding import BreedingPlanner
+            self.breeding_planner = BreedingPlanner(self.get_trait_store(),
+                                                    lambda name: self.roles.lineages.get(name, []),
+                                                    self.clone_registry.keeper_of)
+        return self.breeding_planner
+
+    def get_genotype_projector(self):
+        """Genotype ratios at tracked loci for any cross, cached per parent pair."""
+        if self.genotype_projector is None:
+            from punnett import PunnettProjector
+            self.genotype_projector = PunnettProjector(lambda: self.plant_genetics)
+        return self.genotype_projector
+
+    def show_breeding_planner(self, plant_name=None, second=None):
+        BreedingPlannerWindow(self.root, self, plant_name, second, BACKGROUND_COLOR, TEXT_COLOR)
+
+    def get_cross_recommender(self):
+        """All-pairs cross ranking over the owned females and the males, built on first use."""
+        if self.cross_recommender is None:
+            from crosses import CrossRecommender
+            self.cross_recommender = CrossRecommender(self.get_trait_store(), lambda: self.plant_genetics,
+                                                      lambda name: self.roles.lineages.get(name, []),
+                                                      self.clone_registry.keeper_of)
+        return self.cross_recommender
+
+    def show_cross_recommender(self):
+        CrossRecommenderWindow(self.root, self, BACKGROUND_COLOR, TEXT_COLOR)
+
+    def initialize_dashboard_tab(self):
+        logging.debug("Initializing Dashboard Tab...")
+        self.stage_dashboard = StageDashboard(self.dashboard_tab, self, BACKGROUND_COLOR, TEXT_COLOR)
+        logging.debug("Dashboard Tab initialized successfully.")
+
     def initialize_genetics_tab(self):
         logging.debug("Initializing Genetics Tab...")
         # Top Frame with Search and Parent Strain Selector
@@ -153,15 +361,18 @@ class CannabisGeneticsApp:
 
         tk.Label(parent_selector_frame, text="Select Parent Strain:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 14, "bold")).pack(side="left")
         self.parent_strain_var = tk.StringVar()
-        parent_strain_options = ["All Parents"] + sorted(self.parent_strains, key=lambda x: x.lower())
-        self.parent_strain_dropdown = tk.OptionMenu(parent_selector_frame, self.parent_strain_var, *parent_strain_options, command=self.update_search_results)
-        self.parent_strain_dropdown.config(bg="white", fg="black", font=("Helvetica", 14))
+        self.parent_strain_dropdown = StrainPicker(parent_selector_frame, self.parent_index,
+                                                   textvariable=self.parent_strain_var,
+                                                   command=self.update_search_results,
+                                                   extra_options=["All Parents"], font=("Helvetica", 14))
         self.parent_strain_dropdown.pack(side="left", padx=10)
         self.parent_strain_var.set("All Parents")
 
-        # Genetics Buttons Frame with ScrollableFrame
-        self.genetics_scrollable_frame = ScrollableFrame(self.genetics_tab)
-        self.genetics_scrollable_frame.pack(pady=10, padx=20, fill='both', expand=True)
+        # Genetics Buttons Grid, only the buttons in view exist and are recycled on scroll
+        self.genetics_grid = VirtualGrid(self.genetics_tab, columns=5,
+                                         make_cell=self.make_strain_button,
+                                         bind_cell=self.bind_strain_button)
+        self.genetics_grid.pack(pady=10, padx=20, fill='both', expand=True)
 
         # Legend for Color Coding
         self.legend_frame = tk.Frame(self.genetics_tab, bg=BACKGROUND_COLOR)
@@ -178,29 +389,45 @@ class CannabisGeneticsApp:
         self.display_genetics_buttons()
         logging.debug("Genetics Tab initialized successfully.")
 
+    def match_search_query(self, search_text):
+        """
+        Returns the strain names matching the search box. The box accepts the
+        filter query language (see query.py) as well as plain name searches;
+        a "log:" query matches strains that have matching grow log entries.
+        """
+        try:
+            plan = compile_query(search_text)
+        except QueryError as e:
+            logging.debug(f"Search text is not a complete query ({e}), using name search.")
+            search_term = search_text.lower()
+            return [name for name in self.plant_genetics if search_term in name.lower()]
+
+        if plan.target == "log":
+            strains = strains_with_log_matches(search_text, self.get_grow_log_store().entries)
+            return [name for name in self.plant_genetics if name in strains]
+        indexes = None
+        if any(field in TRAIT_FIELDS for field, op, value in plan.conjuncts):
+            indexes = self.get_trait_store().query_indexes()
+        return plan.run(self.plant_genetics, indexes, parent_strains=self.parent_strains,
+                        trait_ranges=self.trait_ranges)
+
     def update_search_results(self, *args):
         """
         Updates the displayed plant buttons based on the search term and selected parent strain.
         This method is called whenever the search_var changes or a parent strain is selected.
         """
         logging.debug("Updating search results based on search term and selected parent strain.")
+        self.grid_view = "search"
         
-        # Retrieve the current search term and selected parent strain
-        search_term = self.search_var.get().strip().lower()
+        # Retrieve the current search query and selected parent strain
+        search_text = self.search_var.get().strip()
         selected_parent = self.parent_strain_var.get()
         
-        logging.debug(f"Search Term: '{search_term}', Selected Parent Strain: '{selected_parent}'")
-        
-        # Clear existing buttons in the genetics scrollable frame
-        for widget in self.genetics_scrollable_frame.scrollable_frame.winfo_children():
-            widget.destroy()
-        
-        # Filter strains based on ownership
-        owned_strains = [name for name, details in self.plant_genetics.items() if details.get('owned', True)]
+        logging.debug(f"Search Query: '{search_text}', Selected Parent Strain: '{selected_parent}'")
         
-        # Further filter based on search term
-        if search_term:
-            owned_strains = [name for name in owned_strains if search_term in name.lower()]
+        # Filter strains based on the search query, then ownership
+        owned_strains = [name for name in self.match_search_query(search_text)
+                         if self.plant_genetics[name].get('owned', True)]
         
         # Further filter based on selected parent strain if not "All Parents"
         if selected_parent != "All Parents":
@@ -211,50 +438,13 @@ class CannabisGeneticsApp:
         # Sort the filtered strains alphabetically
         sorted_plants = sorted(owned_strains, key=lambda x: x.lower())
         
-        # Arrange buttons in a grid layout
-        columns = 5  # Number of columns in the grid
-        row = 0
-        column = 0
+        # Build the backing list for the grid
+        items = []
         for plant_name in sorted_plants:
-            ownership_type = self.plant_genetics[plant_name].get('ownership_type', 'None')
-            is_parent = plant_name in self.parent_strains
-            is_owned = self.plant_genetics[plant_name].get('owned', True)
-
-            # Determine the color based on ownership and type
-            if is_parent and is_owned:
-                color = self.legend_colors.get("Owned & Parent Strain", "#32CD32")
-            elif not is_parent and is_owned:
-                if ownership_type == "Seed Start":
-                    color = self.legend_colors.get("Seed Start Strain", "#8000ff")
-                elif ownership_type == "Clone":
-                    color = self.legend_colors.get("Clone Strain", "#0000ff")
-                else:
-                    color = self.legend_colors.get("Owned Strain", "#0000ff")
-            else:
-                continue  # Skip strains that are not owned
-
-            # Create the plant button
-            btn = tk.Button(
-                self.genetics_scrollable_frame.scrollable_frame,
-                text=plant_name,
-                width=20,
-                command=lambda p=plant_name: self.show_plant_details(p),
-                bg=color,
-                fg=BACKGROUND_COLOR,
-                font=("Helvetica", 12, "bold"),
-                activebackground=color,
-                activeforeground=BACKGROUND_COLOR
-            )
-            btn.grid(row=row, column=column, padx=5, pady=5, sticky='nsew')
-
-            column += 1
-            if column >= columns:
-                column = 0
-                row += 1
+            # The role (and so the color) comes from the shared classification cache
+            items.append((plant_name, self.roles.role(plant_name)))
 
-        # Make the buttons expand equally within their columns
-        for i in range(columns):
-            self.genetics_scrollable_frame.scrollable_frame.columnconfigure(i, weight=1)
+        self.genetics_grid.set_items(items)
 
         logging.debug("Search results updated successfully.")
 
@@ -266,8 +456,8 @@ class CannabisGeneticsApp:
 
         tk.Label(selection_frame, text="Select Strain:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12)).pack(side="left")
         self.plant_options_lineage = tk.StringVar(value="Select Strain")
-        self.dropdown_lineage = tk.OptionMenu(selection_frame, self.plant_options_lineage, *sorted(self.plant_genetics.keys(), key=lambda x: x.lower()))
-        self.dropdown_lineage.config(bg="white", fg="black", font=("Helvetica", 12))
+        self.dropdown_lineage = StrainPicker(selection_frame, self.strain_index,
+                                             textvariable=self.plant_options_lineage, font=("Helvetica", 12))
         self.dropdown_lineage.pack(side="left", padx=10)
 
         self.btn_lineage = tk.Button(selection_frame, text="Show Lineage Tree", command=self.display_lineage_tree,
@@ -275,6 +465,15 @@ class CannabisGeneticsApp:
                                      activebackground="lightgrey", activeforeground="black")
         self.btn_lineage.pack(side="left", padx=10)
 
+        tk.Button(selection_frame, text="Plan Cross",
+                  command=lambda: self.show_breeding_planner(self.plant_options_lineage.get()),
+                  bg="white", fg="black", font=("Helvetica", 14, "bold"),
+                  activebackground="lightgrey", activeforeground="black").pack(side="left", padx=10)
+
+        tk.Button(selection_frame, text="Recommend Crosses", command=self.show_cross_recommender,
+                  bg="white", fg="black", font=("Helvetica", 14, "bold"),
+                  activebackground="lightgrey", activeforeground="black").pack(side="left", padx=10)
+
         # Create a Canvas with Scrollbars for the lineage tree image
         self.tree_canvas = tk.Canvas(self.lineage_tab, bg=BACKGROUND_COLOR)
         self.v_scrollbar_tree = tk.Scrollbar(self.lineage_tab, orient="vertical", command=self.tree_canvas.yview)
@@ -298,10 +497,6 @@ class CannabisGeneticsApp:
 
     def initialize_settings_tab(self):
         logging.debug("Initializing Settings Tab...")
-        # Settings Tab
-        self.settings_tab = tk.Frame(self.notebook, bg=BACKGROUND_COLOR)
-        self.notebook.add(self.settings_tab, text="Settings")
-
         # Title
         tk.Label(self.settings_tab, text="Settings", bg=BACKGROUND_COLOR, fg=TEXT_COLOR,
                  font=("Helvetica", 16, "bold")).pack(pady=10)
@@ -327,11 +522,14 @@ class CannabisGeneticsApp:
 
         tk.Label(self.legend_frame, text="Legend:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 14, "bold")).pack(side="left", padx=(0, 20))
 
+        # Swatches are kept by role so color changes can be applied in place
+        self.legend_swatches = {}
         for legend_item, color in self.legend_colors.items():
             legend = tk.Frame(self.legend_frame, bg=color, width=25, height=25)
             legend.pack(side="left", padx=5)
             legend.pack_propagate(False)
             tk.Label(self.legend_frame, text=legend_item, bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12)).pack(side="left", padx=(0, 20))
+            self.legend_swatches[legend_item] = legend
         logging.debug("Legend created successfully.")
 
     def customize_colors(self):
@@ -402,12 +600,43 @@ class CannabisGeneticsApp:
         messagebox.showinfo("Colors Saved", "Legend colors have been updated successfully.")
         logging.debug("Customized colors saved and window closed.")
 
+    def role_color(self, role):
+        return self.legend_colors.get(role, DEFAULT_COLORS.get(role, "#A9A9A9"))
+
     def update_legend_colors(self):
         logging.debug("Updating legend colors in UI...")
-        self.create_legend()
-        # Refresh the genetics buttons to apply color changes if necessary
-        self.display_genetics_buttons()
-        logging.debug("Legend colors updated.")
+        # Only widgets of roles whose color changed are touched; the grid keeps
+        # whatever it was showing, including an active search
+        changed = {role for role in set(self.legend_colors) | set(self.applied_colors)
+                   if self.legend_colors.get(role) != self.applied_colors.get(role)}
+        self.applied_colors = dict(self.legend_colors)
+        if not changed:
+            logging.debug("No legend colors changed.")
+            return
+
+        if self.is_tab_built(self.genetics_tab):
+            if set(self.legend_swatches) != set(self.legend_colors):
+                self.create_legend()
+            else:
+                for role in changed:
+                    self.legend_swatches[role].configure(bg=self.role_color(role))
+            self.recolor_strain_grid(changed)
+
+        # Re-render the lineage tree on screen only if it draws a changed role
+        if self.lineage_shown and changed & self.lineage_shown[1]:
+            self.display_lineage_tree(self.lineage_shown[0])
+        logging.debug(f"Legend colors updated for: {sorted(changed)}")
+
+    def recolor_strain_grid(self, roles):
+        # Visible buttons are reconfigured in place; off-screen cells pick the color up when rebound
+        by_role = {}
+        for cell, (plant_name, role) in self.genetics_grid.visible_cells():
+            by_role.setdefault(role, []).append(cell)
+        for role in roles:
+            color = self.role_color(role)
+            for cell in by_role.get(role, ()):
+                cell.configure(bg=color, activebackground=color)
+                cell.bound_color = color
 
     def delete_all_data(self):
         logging.debug("Attempting to delete all data...")
@@ -420,10 +649,7 @@ class CannabisGeneticsApp:
 
             # Save the empty data to the JSON file
             self.save_genetics_data()
-
-            # Update the UI
-            self.display_genetics_buttons()
-            self.update_dropdown_options()
+            self.events.publish(STRAINS_RESET)
 
             messagebox.showinfo("Data Deleted", "All strain data has been deleted. You can start adding new strains.")
             logging.debug("All data deleted and UI updated.")
@@ -494,54 +720,43 @@ class CannabisGeneticsApp:
 
         logging.debug("Entry fields created successfully.")
 
+    def make_strain_button(self, parent):
+        """
+        Creates one pooled strain button for the genetics grid. The command reads
+        the plant name bound to the button, so rebinding never allocates a new callback.
+        """
+        btn = tk.Button(parent, width=20, fg=BACKGROUND_COLOR, font=("Helvetica", 12, "bold"),
+                        activeforeground=BACKGROUND_COLOR)
+        btn.bound_item = None
+        btn.bound_color = None
+        btn.configure(command=lambda b=btn: self.show_plant_details(b.bound_item[0]))
+        return btn
+
+    def bind_strain_button(self, btn, item):
+        """Points a pooled strain button at a (plant_name, role) item."""
+        plant_name, role = item
+        color = self.role_color(role)
+        if btn.bound_item == item and btn.bound_color == color:
+            return
+        btn.configure(text=plant_name, bg=color, activebackground=color)
+        btn.bound_item = item
+        btn.bound_color = color
+
     def display_genetics_buttons(self):
         logging.debug("Displaying Genetics Buttons...")
-        # Clear existing buttons
-        for widget in self.genetics_scrollable_frame.scrollable_frame.winfo_children():
-            widget.destroy()
+        self.grid_view = "owned"
 
         # Filter strains to only those that are owned
         owned_strains = [name for name, details in self.plant_genetics.items() if details.get('owned', True)]
         sorted_plants = sorted(owned_strains, key=lambda x: x.lower())
 
-        # Arrange buttons in grid
-        columns = 5  # Number of columns in grid
-        row = 0
-        column = 0
+        # Build the backing list for the grid
+        items = []
         for plant_name in sorted_plants:
-            ownership_type = self.plant_genetics[plant_name].get('ownership_type', 'None')
-            is_parent = plant_name in self.parent_strains
-            is_owned = self.plant_genetics[plant_name].get('owned', True)
-
-            # Determine role and color using legend_colors
-            if is_parent and is_owned:
-                color = self.legend_colors.get("Owned & Parent Strain", "#32CD32")
-            elif not is_parent and is_owned:
-                # Assign color based on ownership type
-                if ownership_type == "Seed Start":
-                    color = self.legend_colors.get("Seed Start Strain", "#8000ff")
-                elif ownership_type == "Clone":
-                    color = self.legend_colors.get("Clone Strain", "#0000ff")
-                else:
-                    color = self.legend_colors.get("Owned Strain", "#0000ff")
-            else:
-                # Skip strains that are not owned
-                continue  # We already filtered for owned strains, but this is extra safety
-
-            # Create Button (Retain Color Coding)
-            btn = tk.Button(self.genetics_scrollable_frame.scrollable_frame, text=plant_name, width=20,
-                           command=lambda p=plant_name: self.show_plant_details(p),
-                           bg=color, fg=BACKGROUND_COLOR, font=("Helvetica", 12, "bold"),
-                           activebackground=color, activeforeground=BACKGROUND_COLOR)
-            btn.grid(row=row, column=column, padx=5, pady=5, sticky='nsew')
-            column += 1
-            if column >= columns:
-                column = 0
-                row += 1
-
-        # Make buttons expand equally
-        for i in range(columns):
-            self.genetics_scrollable_frame.scrollable_frame.columnconfigure(i, weight=1)
+            # The role (and so the color) comes from the shared classification cache
+            items.append((plant_name, self.roles.role(plant_name)))
+
+        self.genetics_grid.set_items(items)
         logging.debug("Genetics Buttons displayed successfully.")
 
     def add_or_update_plant(self):
@@ -561,6 +776,10 @@ class CannabisGeneticsApp:
             logging.warning("Strain name not provided.")
             return
 
+        # Clone records keep their mother and cut date through edits
+        clone_fields = {field: self.plant_genetics[name][field]
+                        for field in CLONE_FIELDS if field in self.plant_genetics.get(name, {})}
+
         # Handle Clone Naming
         if ownership_type == "Clone":
             # Extract mother plant from lineage
@@ -580,18 +799,13 @@ class CannabisGeneticsApp:
                 logging.warning(f"Mother plant '{mother_plant}' does not exist.")
                 return
 
-            # Generate clone name
-            clone_count = self.plant_genetics[mother_plant].get('clone_count', 0) + 1
-            clone_suffix = self.get_clone_suffix(clone_count)
-            clone_name = f"{mother_plant} Clone {clone_suffix}"
-
-            if clone_name in self.plant_genetics:
-                messagebox.showwarning("Duplicate Clone", f"The clone name '{clone_name}' already exists.")
-                logging.warning(f"Clone name '{clone_name}' already exists.")
-                return
+            # Generate a clone name that isn't taken yet
+            (clone_name,), clone_count = allocate_clone_names(self.plant_genetics, mother_plant, 1)
+            clone_fields = {"mother": mother_plant, "cut_date": date.today().strftime('%Y-%m-%d')}
 
             # Update clone count
             self.plant_genetics[mother_plant]['clone_count'] = clone_count
+            self.events.publish(STRAIN_UPDATED, mother_plant)
 
             name = clone_name  # Override the entered name with the auto-generated clone name
 
@@ -612,8 +826,9 @@ class CannabisGeneticsApp:
                             "owned": False,
                             "ownership_type": "None",
                             "clone_count": 0,
-                            "genetic_info": {}
+                            "genetic_info": EMPTY_TRAITS
                         }
+                        self.events.publish(STRAIN_ADDED, parent)
                         logging.info(f"Added unknown parent strain '{parent}'.")
                     else:
                         logging.warning(f"Unknown parent strain '{parent}' not added.")
@@ -623,7 +838,9 @@ class CannabisGeneticsApp:
         original_name = plant_name  # Store the original name
         if name in self.plant_genetics and original_name != name:
             del self.plant_genetics[original_name]
+            self.events.publish(STRAIN_DELETED, original_name)
 
+        self.events.publish(STRAIN_UPDATED if name in self.plant_genetics else STRAIN_ADDED, name)
         self.plant_genetics[name] = {
             "lineage": lineage if lineage else "Unknown",
             "yield": yield_info or "Unknown",
@@ -634,16 +851,11 @@ class CannabisGeneticsApp:
             "owned": owned,
             "ownership_type": ownership_type if owned else "None",
             "clone_count": self.plant_genetics.get(name, {}).get('clone_count', 0),
-            "genetic_info": self.plant_genetics.get(name, {}).get('genetic_info', {})
+            "genetic_info": self.plant_genetics.get(name, {}).get('genetic_info', EMPTY_TRAITS),
+            **clone_fields
         }
 
-        # Update parent strains after adding new plant
-        self.parent_strains = self.get_parent_strains()
-
         self.save_genetics_data()
-        self.display_genetics_buttons()
-        self.update_dropdown_options()
-        self.update_genetic_traits_tree()
         messagebox.showinfo("Success", f"'{name}' has been added/updated!")
 
         # Clear input fields
@@ -653,16 +865,9 @@ class CannabisGeneticsApp:
     def get_clone_suffix(self, clone_count):
         """
         Generates a clone suffix based on the clone count.
-        For example: 1 -> A, 2 -> B, ..., 26 -> Z, 27 -> A1, 28 -> B1, etc.
+        For example: 1 -> A, 2 -> B, ..., 26 -> Z, 27 -> AA, 28 -> AB, etc.
         """
-        import string
-        if clone_count <= 26:
-            return string.ascii_uppercase[clone_count - 1]
-        else:
-            # For counts beyond 26, append numbers
-            first_part = string.ascii_uppercase[(clone_count - 1) // 26 - 1]
-            second_part = string.ascii_uppercase[(clone_count - 1) % 26]
-            return f"{first_part}{second_part}"
+        return clone_suffix(clone_count)
 
     def clear_entry_fields(self):
         logging.debug("Clearing entry fields...")
@@ -679,31 +884,41 @@ class CannabisGeneticsApp:
 
     def update_dropdown_options(self):
         logging.debug("Updating dropdown options...")
-        # Update options in the Lineage Tree tab
-        menu = self.dropdown_lineage["menu"]
-        menu.delete(0, "end")
-        for strain in sorted(self.plant_genetics.keys(), key=lambda x: x.lower()):
-            menu.add_command(label=strain, command=lambda value=strain: self.plant_options_lineage.set(value))
-        self.plant_options_lineage.set("Select Strain")  # Reset selection
-
-        # Update options in Grow Log strain selection
-        if hasattr(self.grow_log_app, 'strain_var'):
-            strain_options = ["Select Strain"] + sorted(self.plant_genetics.keys(), key=lambda x: x.lower())
-            menu = self.grow_log_app.strain_dropdown["menu"]
-            menu.delete(0, "end")
-            for strain in strain_options:
-                menu.add_command(label=strain, command=lambda value=strain: self.grow_log_app.strain_var.set(value))
+        # The strain pickers query their name indexes lazily, so only the
+        # indexes need invalidating and stale selections resetting
+        self.strain_index.invalidate()
+        self.parent_index.invalidate()
+
+        # Tabs that have not been built yet will read fresh data when they are
+        if self.is_tab_built(self.lineage_tab) and self.plant_options_lineage.get() not in self.plant_genetics:
+            self.plant_options_lineage.set("Select Strain")
+
+        if self.is_tab_built(self.grow_log_tab) and self.grow_log_app.strain_var.get() not in self.plant_genetics:
             self.grow_log_app.strain_var.set("Select Strain")
 
-        # Update options in the Genetics tab parent strain dropdown
-        menu = self.parent_strain_dropdown["menu"]
-        menu.delete(0, "end")
-        parent_strain_options = ["All Parents"] + sorted(self.parent_strains, key=lambda x: x.lower())
-        for parent in parent_strain_options:
-            menu.add_command(label=parent, command=lambda value=parent: self.parent_strain_var.set(value))
-        self.parent_strain_var.set("All Parents")
+        if self.is_tab_built(self.genetics_tab) and self.parent_strain_var.get() not in self.parent_strains:
+            self.parent_strain_var.set("All Parents")
         logging.debug("Dropdown options updated.")
 
+    def on_strains_changed(self, batch):
+        logging.debug(f"Applying {len(batch)} strain change(s)...")
+        # One refresh per idle cycle, however many mutations were published
+        # The models were brought up to date by apply_strain_models, subscribed first
+        self.parent_strains = self.get_parent_strains()
+        self.update_dropdown_options()
+        if self.is_tab_built(self.genetics_tab):
+            self.refresh_strain_grid()
+        self.update_genetic_traits_tree()
+        for name in batch.names():
+            self.detail_views.refresh(name)
+
+    def refresh_strain_grid(self):
+        # Re-run whichever builder last filled the grid so an active search survives
+        if self.grid_view == "search":
+            self.update_search_results()
+        else:
+            self.display_genetics_buttons()
+
     def update_genetic_traits_tree(self):
         # Implement the method to update the genetic traits tree
         # This could involve redrawing the tree or updating related UI elements
@@ -718,173 +933,39 @@ class CannabisGeneticsApp:
             logging.error(f"Plant '{plant_name}' not found.")
             return
 
-        details = self.plant_genetics[plant_name]
-
-        # Create a new Toplevel window (popup)
-        details_window = Toplevel(self.root)
-        details_window.title(f"{plant_name} Details")
-        details_window.geometry("800x600")
-        details_window.configure(bg=BACKGROUND_COLOR)
-
-        # Create main frame
-        main_frame = tk.Frame(details_window, bg=BACKGROUND_COLOR)
-        main_frame.pack(fill='both', expand=True)
-
-        # Left frame for plant's details
-        left_frame = tk.Frame(main_frame, bg=BACKGROUND_COLOR)
-        left_frame.pack(side='left', fill='both', expand=True, padx=10, pady=10)
-
-        # Right frame for clones
-        right_frame = tk.Frame(main_frame, bg=BACKGROUND_COLOR)
-        right_frame.pack(side='left', fill='both', expand=True, padx=10, pady=10)
-
-        # Display plant details in the left frame
-        info_text = f"{plant_name} ({details.get('gender', 'Unknown')})\n\n"
-        for key, value in details.items():
-            if key not in ["gender", "owned", "ownership_type", "genetic_info", "clone_count"]:
-                info_text += f"{key.capitalize()}: {value}\n"
-
-        label = tk.Label(left_frame, text=info_text, justify="left", padx=10, pady=10,
-                         bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12))
-        label.pack(fill='x', expand=False)
-
-        # Editable Fields in left_frame
-        edit_frame = tk.Frame(left_frame, bg=BACKGROUND_COLOR)
-        edit_frame.pack(pady=10, padx=20, fill='x')
-
-        # Strain Name
-        tk.Label(edit_frame, text="Strain Name:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12)).grid(row=0, column=0, sticky='e')
-        self.edit_entry_name = tk.Entry(edit_frame, font=("Helvetica", 12))
-        self.edit_entry_name.grid(row=0, column=1, sticky='we', padx=5, pady=5)
-        self.edit_entry_name.insert(0, plant_name)
-
-        # Yield
-        tk.Label(edit_frame, text="Yield:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12)).grid(row=1, column=0, sticky='e')
-        self.edit_entry_yield = tk.Entry(edit_frame, font=("Helvetica", 12))
-        self.edit_entry_yield.grid(row=1, column=1, sticky='we', padx=5, pady=5)
-        self.edit_entry_yield.insert(0, details.get('yield', 'Unknown'))
-
-        # Lineage
-        tk.Label(edit_frame, text="Lineage:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12)).grid(row=2, column=0, sticky='e')
-        self.edit_entry_lineage = tk.Entry(edit_frame, font=("Helvetica", 12))
-        self.edit_entry_lineage.grid(row=2, column=1, sticky='we', padx=5, pady=5)
-        self.edit_entry_lineage.insert(0, details.get('lineage', 'Unknown'))
-
-        # Flowering Time
-        tk.Label(edit_frame, text="Flowering Time:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12)).grid(row=3, column=0, sticky='e')
-        self.edit_entry_flowering_time = tk.Entry(edit_frame, font=("Helvetica", 12))
-        self.edit_entry_flowering_time.grid(row=3, column=1, sticky='we', padx=5, pady=5)
-        self.edit_entry_flowering_time.insert(0, details.get('flowering_time', 'Unknown'))
-
-        # Type
-        tk.Label(edit_frame, text="Type:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12)).grid(row=4, column=0, sticky='e')
-        self.edit_entry_type = tk.Entry(edit_frame, font=("Helvetica", 12))
-        self.edit_entry_type.grid(row=4, column=1, sticky='we', padx=5, pady=5)
-        self.edit_entry_type.insert(0, details.get('type', 'Unknown'))
-
-        # Gender
-        tk.Label(edit_frame, text="Gender:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12)).grid(row=5, column=0, sticky='e')
-        self.edit_gender_var = tk.StringVar(value=details.get("gender", "Unknown"))
-        gender_options = ["Female", "Male", "Unknown"]
-        self.edit_gender_menu = tk.OptionMenu(edit_frame, self.edit_gender_var, *gender_options)
-        self.edit_gender_menu.config(bg="white", fg="black", font=("Helvetica", 12))
-        self.edit_gender_menu.grid(row=5, column=1, sticky='w', padx=5, pady=5)
-
-        # Owned
-        tk.Label(edit_frame, text="Owned:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12)).grid(row=6, column=0, sticky='e')
-        self.edit_owned_var = tk.BooleanVar(value=details.get("owned", True))
-        self.edit_checkbox_owned = tk.Checkbutton(edit_frame, variable=self.edit_owned_var, bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12))
-        self.edit_checkbox_owned.grid(row=6, column=1, sticky='w', padx=5, pady=5)
-
-        # Ownership Type
-        tk.Label(edit_frame, text="Ownership Type:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12)).grid(row=7, column=0, sticky='e')
-        self.edit_ownership_type_var = tk.StringVar(value=details.get("ownership_type", "None"))
-        ownership_type_options = ["None", "Clone", "Seed Start"]
-        self.edit_ownership_type_menu = tk.OptionMenu(edit_frame, self.edit_ownership_type_var, *ownership_type_options)
-        self.edit_ownership_type_menu.config(bg="white", fg="black", font=("Helvetica", 12))
-        self.edit_ownership_type_menu.grid(row=7, column=1, sticky='w', padx=5, pady=5)
-
-        # Notes
-        tk.Label(edit_frame, text="Notes:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12)).grid(row=8, column=0, sticky='e')
-        self.edit_entry_notes = tk.Entry(edit_frame, font=("Helvetica", 12))
-        self.edit_entry_notes.grid(row=8, column=1, sticky='we', padx=5, pady=5)
-        self.edit_entry_notes.insert(0, details.get('notes', ''))
-
-        # Genetic Information Button
-        btn_genetic_info = tk.Button(left_frame, text="Genetic Information", command=lambda: self.open_genetic_info_window(plant_name),
-                                     bg="white", fg="black", font=("Helvetica", 14, "bold"),
-                                     activebackground="lightgrey", activeforeground="black")
-        btn_genetic_info.pack(pady=10)
-
-        # Configure grid weights
-        for i in range(2):
-            edit_frame.columnconfigure(i, weight=1)
-
-        # Save Changes and Delete Buttons in left_frame
-        btn_frame = tk.Frame(left_frame, bg=BACKGROUND_COLOR)
-        btn_frame.pack(pady=20)
+        # Reuse a pooled details window instead of building a new Toplevel
+        self.detail_views.show(plant_name)
+        logging.debug(f"Details for plant '{plant_name}' displayed successfully.")
 
-        # Save Changes Button (Styled White with Black Text)
-        btn_save = tk.Button(btn_frame, text="Save Changes", command=lambda: self.update_plant_details(plant_name, details_window),
-                             bg="white", fg="black", font=("Helvetica", 14, "bold"),
-                             activebackground="lightgrey", activeforeground="black")
-        btn_save.pack(side='left', padx=20)
-
-        # Delete Button (Styled White with Black Text)
-        btn_delete = tk.Button(btn_frame, text="Delete", command=lambda: self.delete_plant(plant_name, details_window),
-                               bg="white", fg="black", font=("Helvetica", 14, "bold"),
-                               activebackground="lightgrey", activeforeground="black")
-        btn_delete.pack(side='right', padx=20)
-
-        # Now, in the right_frame, display clones
-        # Find clones of this mother
-        clones = [name for name, d in self.plant_genetics.items() if d.get('lineage') == plant_name and d.get('ownership_type') == 'Clone']
-
-        if clones:
-            tk.Label(right_frame, text="Clones:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 14, "bold")).pack(pady=10)
-            # Use a scrollable frame if there are many clones
-            clones_frame = ScrollableFrame(right_frame)
-            clones_frame.pack(fill='both', expand=True)
-            row = 0
-            column = 0
-            columns = 3  # Number of columns in grid
-            for clone_name in clones:
-                btn_clone = tk.Button(clones_frame.scrollable_frame, text=clone_name, command=lambda c=clone_name: self.show_clone_grow_log(c),
-                                      bg="white", fg="black", font=("Helvetica", 12),
-                                      activebackground="lightgrey", activeforeground="black")
-                btn_clone.grid(row=row, column=column, padx=5, pady=5)
-                column += 1
-                if column >= columns:
-                    column = 0
-                    row += 1
-        else:
-            tk.Label(right_frame, text="No clones found.", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12)).pack(pady=10)
+    def get_clones(self, plant_name):
+        """
+        Returns the names of the clones taken from `plant_name`.
+        """
+        return self.clone_registry.clones_of(plant_name)
 
-        logging.debug(f"Details for plant '{plant_name}' displayed successfully.")
+    def is_living_plant(self, name):
+        """Owned and not logged as harvested; used to count living cuts."""
+        details = self.plant_genetics.get(name)
+        if not details or not details.get('owned', True):
+            return False
+        timeline = self.stage_timelines.timeline(name)
+        return timeline is None or timeline.stage not in HARVESTED_STAGES
 
-    def show_clone_grow_log(self, clone_name):
-        logging.debug(f"Showing Grow Log for clone '{clone_name}'...")
-        # Implement the method to show clone's grow log
-        # This can involve opening a new window similar to GrowLogApp
-        clone_log_window = Toplevel(self.root)
-        clone_log_window.title(f"Grow Log for {clone_name}")
-        clone_log_window.geometry("600x600")
-        clone_log_window.configure(bg=BACKGROUND_COLOR)
-
-        clone_log_app = GrowLogApp(clone_log_window, self.plant_genetics, self)
-        clone_log_app.display_log_entries_for_clone(clone_name)
-        logging.debug(f"Grow Log for clone '{clone_name}' displayed successfully.")
-
-    def display_lineage_tree(self):
+    def display_lineage_tree(self, plant_name=None):
         logging.debug("Displaying lineage tree...")
-        plant_name = self.plant_options_lineage.get()
+        if plant_name is None:
+            plant_name = self.plant_options_lineage.get()
         if plant_name not in self.plant_genetics:
             messagebox.showerror("Error", "Please select a valid strain.")
             logging.error("Invalid strain selected for lineage tree.")
             return
 
+        # Deferred so sessions that never open the lineage tab don't pay for this import
+        import graphviz
+
         dot = graphviz.Digraph(comment=plant_name)
         visited = set()
+        roles = set()
 
         def add_to_tree(name):
             if name in visited:
@@ -900,26 +981,9 @@ class CannabisGeneticsApp:
             gender = current_plant.get("gender", "Unknown")
             label = f"{name}\n({gender})"
 
-            # Determine node color
-            is_parent = name in self.parent_strains
-            is_owned = current_plant.get('owned', True)
-            ownership_type = current_plant.get('ownership_type', 'None')
-
-            if is_parent and is_owned:
-                node_color = self.legend_colors.get("Owned & Parent Strain", "#32CD32")
-            elif is_parent and not is_owned:
-                node_color = self.legend_colors.get("Parent Strain", "#FFD700")
-            elif not is_parent and is_owned:
-                if ownership_type == "Clone":
-                    node_color = self.legend_colors.get("Clone Strain", "#0000ff")
-                elif ownership_type == "Seed Start":
-                    node_color = self.legend_colors.get("Seed Start Strain", "#8000ff")
-                else:
-                    node_color = self.legend_colors.get("Owned Strain", "#0000ff")
-            else:
-                node_color = self.legend_colors.get("Not Owned Strain", "#A9A9A9")
-
-            dot.node(name, label, style='filled', fillcolor=node_color)
+            role = self.roles.role(name)
+            roles.add(role)
+            dot.node(name, label, style='filled', fillcolor=self.role_color(role))
 
             lineage = current_plant.get("lineage", "Unknown")
             if lineage != "Unknown":
@@ -929,38 +993,57 @@ class CannabisGeneticsApp:
                     dot.edge(parent, name)
 
         add_to_tree(plant_name)
+        self.lineage_shown = (plant_name, roles)
+
+        # Renders are cached by DOT source, which includes the colors, so a
+        # color change naturally misses the cache
+        source = dot.source
+        if self.lineage_render_token is not None:
+            self.lineage_render_token.cancel()
+        if source in self.lineage_png_cache:
+            logging.debug("Lineage tree served from cache.")
+            self.lineage_png_cache.move_to_end(source)
+            self.show_lineage_image(self.lineage_png_cache[source])
+            return
 
-        try:
-            dot.render("lineage_tree", format="png", cleanup=True)
-            img = Image.open("lineage_tree.png")
-            img_width, img_height = img.size
-            max_width = 1200
-            max_height = 1200
-
-            # Resize image if it's too large
-            if img_width > max_width or img_height > max_height:
-                ratio = min(max_width / img_width, max_height / img_height)
-                img = img.resize((int(img_width * ratio), int(img_height * ratio)), Image.LANCZOS)
-
-            img = ImageTk.PhotoImage(img)
-
-            # Clear previous image
-            for widget in self.tree_inner_frame.winfo_children():
-                widget.destroy()
-
-            # Display new image
-            self.image_label = tk.Label(self.tree_inner_frame, image=img, bg=BACKGROUND_COLOR)
-            self.image_label.image = img  # Keep a reference
-            self.image_label.pack()
-
-            # Update scrollregion
-            self.tree_canvas.update_idletasks()
-            self.tree_canvas.configure(scrollregion=self.tree_canvas.bbox("all"))
-            logging.debug("Lineage tree displayed successfully.")
-        except graphviz.backend.ExecutableNotFound:
+        # Render in a worker process; a newer request supersedes one still running
+        self.lineage_render_token = self.executor.submit_cpu(
+            render_lineage_png, source,
+            on_done=lambda png: self.on_lineage_rendered(source, png),
+            on_error=self.on_lineage_render_error)
+
+    def on_lineage_rendered(self, source, png):
+        self.lineage_png_cache[source] = png
+        while len(self.lineage_png_cache) > LINEAGE_CACHE_SIZE:
+            self.lineage_png_cache.popitem(last=False)
+        self.show_lineage_image(png)
+
+    def show_lineage_image(self, png):
+        from PIL import Image, ImageTk
+
+        img = ImageTk.PhotoImage(Image.open(io.BytesIO(png)))
+
+        # Clear previous image
+        for widget in self.tree_inner_frame.winfo_children():
+            widget.destroy()
+
+        # Display new image
+        self.image_label = tk.Label(self.tree_inner_frame, image=img, bg=BACKGROUND_COLOR)
+        self.image_label.image = img  # Keep a reference
+        self.image_label.pack()
+
+        # Update scrollregion
+        self.tree_canvas.update_idletasks()
+        self.tree_canvas.configure(scrollregion=self.tree_canvas.bbox("all"))
+        logging.debug("Lineage tree displayed successfully.")
+
+    def on_lineage_render_error(self, e):
+        import graphviz
+
+        if isinstance(e, graphviz.backend.ExecutableNotFound):
             messagebox.showerror("Graphviz Not Found", "Graphviz executable not found. Please install Graphviz and ensure it's added to your system's PATH.")
             logging.error("Graphviz executable not found.")
-        except Exception as e:
+        else:
             messagebox.showerror("Error", f"Failed to generate lineage tree.\n{e}")
             logging.error(f"Failed to generate lineage tree: {e}")
 
@@ -972,7 +1055,7 @@ class CannabisGeneticsApp:
         genetic_info_window.geometry("600x400")
         genetic_info_window.configure(bg=BACKGROUND_COLOR)
 
-        genetic_info = self.plant_genetics[plant_name].get('genetic_info', {})
+        genetic_info = self.plant_genetics[plant_name].get('genetic_info', EMPTY_TRAITS)
 
         info_text = f"Genetic Information for {plant_name}:\n\n"
         for key, value in genetic_info.items():
@@ -982,18 +1065,19 @@ class CannabisGeneticsApp:
                  bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12)).pack(fill='both', expand=True)
         logging.debug(f"Genetic information window for '{plant_name}' opened.")
 
-    def update_plant_details(self, plant_name, window):
+    def update_plant_details(self, plant_name, view):
         logging.debug(f"Updating details for plant '{plant_name}'...")
-        # Retrieve updated details from the edit fields
-        updated_name = self.edit_entry_name.get().strip()
-        updated_lineage = self.edit_entry_lineage.get().strip()
-        updated_yield = self.edit_entry_yield.get().strip()
-        updated_flowering_time = self.edit_entry_flowering_time.get().strip()
-        updated_type = self.edit_entry_type.get().strip()
-        updated_gender = self.edit_gender_var.get()
-        updated_owned = self.edit_owned_var.get()
-        updated_ownership_type = self.edit_ownership_type_var.get()
-        updated_notes = self.edit_entry_notes.get().strip()
+        # Retrieve updated details from the view's edit fields
+        values = view.get_values()
+        updated_name = values["name"]
+        updated_lineage = values["lineage"]
+        updated_yield = values["yield"]
+        updated_flowering_time = values["flowering_time"]
+        updated_type = values["type"]
+        updated_gender = values["gender"]
+        updated_owned = values["owned"]
+        updated_ownership_type = values["ownership_type"]
+        updated_notes = values["notes"]
 
         # Validate inputs
         if not updated_name:
@@ -1014,38 +1098,27 @@ class CannabisGeneticsApp:
         })
 
         self.save_genetics_data()
-        self.display_genetics_buttons()
-        self.update_dropdown_options()
-        self.update_genetic_traits_tree()
+        self.events.publish(STRAIN_UPDATED, plant_name)
 
         messagebox.showinfo("Success", f"Details for '{plant_name}' have been updated.")
         logging.debug(f"Details for plant '{plant_name}' updated successfully.")
-        window.destroy()
+        view.close()
 
-    def delete_plant(self, plant_name, window):
+    def delete_plant(self, plant_name, view):
         logging.debug(f"Attempting to delete plant '{plant_name}'...")
         if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete the plant '{plant_name}'?"):
             del self.plant_genetics[plant_name]
             self.save_genetics_data()
-            self.display_genetics_buttons()
-            self.update_dropdown_options()
-            self.update_genetic_traits_tree()
+            self.events.publish(STRAIN_DELETED, plant_name)
+            self.detail_views.forget(plant_name)
             messagebox.showinfo("Deleted", f"Plant '{plant_name}' has been deleted.")
             logging.debug(f"Plant '{plant_name}' deleted successfully.")
-            window.destroy()
 
     def show_clone_grow_log(self, clone_name):
         logging.debug(f"Showing Grow Log for clone '{clone_name}'...")
-        # Implement the method to show clone's grow log
-        # This can involve opening a new window similar to GrowLogApp
-        clone_log_window = Toplevel(self.root)
-        clone_log_window.title(f"Grow Log for {clone_name}")
-        clone_log_window.geometry("600x600")
-        clone_log_window.configure(bg=BACKGROUND_COLOR)
-
-        clone_log_app = GrowLogApp(clone_log_window, self.plant_genetics, self)
-        clone_log_app.display_log_entries_for_clone(clone_name)
-        logging.debug(f"Grow Log for clone '{clone_name}' displayed successfully.")
+        # The clone's entries from the one shared log, so edits reach every view
+        self.ensure_tab(self.grow_log_tab)
+        self.grow_log_app.show_strain_log(clone_name)
 
     def main(self):
         self.root.mainloop()
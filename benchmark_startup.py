@@ -0,0 +1,81 @@
+# benchmark_startup.py
+"""
+Startup benchmark for the Cannabis Genetics Tracker.
+
+Each sample runs in a fresh interpreter and times importing the app module,
+building the main window and the first paint. The run fails (exit code 1) when
+the median exceeds STARTUP_BUDGET_SECONDS or when a heavy module that should
+be imported lazily was loaded during startup.
+
+    python benchmark_startup.py                  # the PyInstaller entry point
+    python benchmark_startup.py --app app        # the modular app (main.py)
+    python benchmark_startup.py --runs 7 --budget 1.0
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+from constants import STARTUP_BUDGET_SECONDS
+
+# Modules that must not be imported until the feature using them is opened
+DEFERRED_MODULES = ["graphviz", "PIL.ImageTk", "tkcalendar", "numpy"]
+
+SAMPLE_SCRIPT = '''
+import json, sys, time
+start = time.perf_counter()
+import tkinter as tk
+import {module} as app_module
+root = tk.Tk()
+app = app_module.CannabisGeneticsApp(root)
+root.update_idletasks()
+root.update()
+elapsed = time.perf_counter() - start
+loaded = [name for name in {deferred!r} if name in sys.modules]
+root.destroy()
+print(json.dumps({{"seconds": elapsed, "loaded": loaded}}))
+'''
+
+
+def run_sample(module):
+    script = SAMPLE_SCRIPT.format(module=module, deferred=DEFERRED_MODULES)
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure application startup time against the budget.")
+    parser.add_argument("--app", default="cannabis_genetics_tracker",
+                        help="Module that defines CannabisGeneticsApp (default: cannabis_genetics_tracker)")
+    parser.add_argument("--runs", type=int, default=5, help="Number of fresh-process samples")
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET_SECONDS,
+                        help="Allowed median startup time in seconds")
+    args = parser.parse_args()
+
+    try:
+        samples = [run_sample(args.app) for _ in range(args.runs)]
+    except subprocess.CalledProcessError as e:
+        print(f"ERROR: startup sample failed:\n{e.stderr.strip()}")
+        return 2
+    times = [sample["seconds"] for sample in samples]
+    median = statistics.median(times)
+    eager = sorted({name for sample in samples for name in sample["loaded"]})
+
+    print(f"{args.app}: median {median:.3f}s, best {min(times):.3f}s, worst {max(times):.3f}s "
+          f"over {args.runs} runs (budget {args.budget:.3f}s)")
+
+    failed = False
+    if median > args.budget:
+        print(f"FAIL: startup exceeds the budget by {median - args.budget:.3f}s")
+        failed = True
+    if eager:
+        print(f"FAIL: deferred modules imported during startup: {', '.join(eager)}")
+        failed = True
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
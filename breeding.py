@@ -0,0 +1,272 @@
+# breeding.py
+"""
+Predicted offspring trait distributions for a planned cross. Each parent's
+genetic value per trait is estimated from its own recorded traits and its
+ancestry in the lineage graph, weighted by the trait's heritability (the
+infinitesimal model). Progeny are then simulated in bulk with NumPy: the
+midparent value, plus Mendelian sampling (smaller for inbred parents),
+plus environmental noise. The parents' shared ancestry is reported as the
+offspring's expected inbreeding. A fixed seed makes every run
+reproducible. Imported on first use, like the trait store.
+"""
+import warnings
+import numpy as np
+from traits import TRAIT_SCHEMA, TRAIT_COLUMNS, CATEGORICAL, TERPENE
+
+DEFAULT_PROGENY = 5000
+DEFAULT_SEED = 1234
+
+# Generations of ancestry used when estimating a plant's genetic value
+MAX_ANCESTRY_DEPTH = 4
+
+# Narrow-sense heritability per trait, from published cannabis and general
+# crop estimates: cannabinoid and terpene content and flowering time are
+# largely genetic, yield much less so
+DEFAULT_HERITABILITY = {
+    "thc": 0.6,
+    "cbd": 0.8,
+    "yield_gm2": 0.3,
+    "stretch": 0.5,
+    "flowering_days": 0.7,
+}
+TERPENE_HERITABILITY = 0.6
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+BREEDING_COLUMNS = tuple(column.name for column in TRAIT_SCHEMA if column.kind != CATEGORICAL)
+
+
+def heritability_of(column):
+    if column in DEFAULT_HERITABILITY:
+        return DEFAULT_HERITABILITY[column]
+    return TERPENE_HERITABILITY if TRAIT_COLUMNS[column].kind == TERPENE else 0.5
+
+
+class Pedigree:
+    """
+    Parents, generation depth and coancestry over the lineage graph. Clones
+    are the same plant as their keeper, so names are mapped through
+    `keeper_of` first. A single-parent lineage is read as a selfing. Only the
+    first two parents of a lineage are used. Results are memoized for one
+    planning run, since the lineage data can change between runs.
+    """
+
+    def __init__(self, lineage_of, keeper_of=None):
+        self.lineage_of = lineage_of
+        self.keeper_of = keeper_of or (lambda name: name)
+        self.depths = {}
+        self.coancestries = {}
+
+    def parents(self, name):
+        parents = [self.keeper_of(parent) for parent in self.lineage_of(self.keeper_of(name))[:2]]
+        if len(parents) == 1:
+            parents.append(parents[0])
+        return tuple(parent for parent in parents if parent != name)
+
+    def depth(self, name, visiting=None):
+        """0 for founders, else one more than the deepest known parent."""
+        name = self.keeper_of(name)
+        if name in self.depths:
+            return self.depths[name]
+        visiting = visiting or set()
+        if name in visiting:
+            return 0  # A loop in hand-entered lineages
+        visiting.add(name)
+        parents = self.parents(name)
+        depth = 1 + max(self.depth(parent, visiting) for parent in parents) if parents else 0
+        visiting.discard(name)
+        self.depths[name] = depth
+        return depth
+
+    def inbreeding(self, name):
+        parents = self.parents(name)
+        if len(parents) < 2:
+            return 0.0
+        return self.coancestry(parents[0], parents[1])
+
+    def coancestry(self, first, second, steps=0):
+        """
+        Probability that alleles drawn from each plant are identical by
+        descent (the tabular method: always expand the younger plant). The
+        offspring of the two is inbred by this much.
+        """
+        first, second = self.keeper_of(first), self.keeper_of(second)
+        key = (first, second) if first <= second else (second, first)
+        if key in self.coancestries:
+            return self.coancestries[key]
+        if steps > 4 * MAX_ANCESTRY_DEPTH:
+            return 0.0
+        if first == second:
+            value = 0.5 * (1 + self.inbreeding(first))
+        else:
+            if self.depth(first) < self.depth(second):
+                first, second = second, first
+            parents = self.parents(first)
+            if not parents:
+                value = 0.0  # Both founders as far as the records go: unrelated
+            else:
+                parents = parents if len(parents) == 2 else parents + (None,)
+                value = 0.5 * sum(self.coancestry(parent, second, steps + 1)
+                                  for parent in parents if parent is not None)
+        self.coancestries[key] = value
+        return value
+
+
+class TraitDistribution:
+    """Predicted offspring distribution of one trait."""
+
+    __slots__ = ("trait", "heritability", "parent_values", "midparent", "mean", "std", "percentiles")
+
+    def __init__(self, trait, heritability, parent_values, midparent, mean, std, percentiles):
+        self.trait = trait
+        self.heritability = heritability
+        self.parent_values = parent_values  # Recorded values of the two parents (NaN when unknown)
+        self.midparent = midparent          # Average of the parents' estimated genetic values
+        self.mean = mean
+        self.std = std
+        self.percentiles = percentiles      # {5: value, 25: ..., 95: ...}
+
+    def __repr__(self):
+        return f"TraitDistribution({self.trait!r}, mean={self.mean:.2f}, std={self.std:.2f})"
+
+
+class CrossPrediction:
+    """The result of simulating one cross: per-trait distributions and the raw progeny."""
+
+    def __init__(self, first, second, traits, samples, distributions, inbreeding, seed):
+        self.first = first
+        self.second = second
+        self.traits = traits              # Column names, one per sample column
+        self.samples = samples            # progeny x traits array
+        self.distributions = distributions
+        self.inbreeding = inbreeding      # Expected inbreeding of the offspring (parents' coancestry)
+        self.seed = seed
+
+    def distribution(self, trait):
+        for distribution in self.distributions:
+            if distribution.trait == trait:
+                return distribution
+        return None
+
+    def probability(self, trait, low=None, high=None):
+        """Share of simulated progeny with `trait` in [low, high]."""
+        values = self.samples[:, self.traits.index(trait)]
+        inside = np.ones(len(values), dtype=bool)
+        if low is not None:
+            inside &= values >= low
+        if high is not None:
+            inside &= values <= high
+        return float(inside.mean()) if len(values) else 0.0
+
+
+class BreedingPlanner:
+    """
+    Simulates crosses from the trait store and the lineage graph.
+    `lineage_of(name)` returns the parents named in a strain's lineage (the
+    apps pass RoleIndex.lineages, the data behind the lineage tree), and
+    `keeper_of(name)` maps a clone to the plant it was cut from.
+    """
+
+    def __init__(self, store, lineage_of, keeper_of=None, columns=BREEDING_COLUMNS):
+        self.store = store
+        self.lineage_of = lineage_of
+        self.keeper_of = keeper_of
+        self.columns = tuple(columns)
+        self.positions = [store.numeric_position[column] for column in self.columns]
+
+    def population(self):
+        """Mean and phenotypic standard deviation of each trait over every recorded strain."""
+        used = len(self.store.names)
+        values = self.store.numbers[:used][self.store.live[:used]][:, self.positions]
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            mean = np.nanmean(values, axis=0) if len(values) else np.full(len(self.columns), np.nan)
+            std = np.nanstd(values, axis=0) if len(values) else np.full(len(self.columns), np.nan)
+        return mean, std
+
+    def recorded(self, name):
+        """A strain's recorded traits as an array in column order, NaN where unknown."""
+        row = self.store.rows.get(name)
+        if row is None and self.keeper_of is not None:
+            row = self.store.rows.get(self.keeper_of(name))
+        if row is None:
+            return np.full(len(self.columns), np.nan)
+        return self.store.numbers[row, self.positions].copy()
+
+    def genetic_values(self, name, pedigree, mean, heritability, memo, depth=0):
+        """
+        Estimated genetic value per trait: the plant's own record regressed
+        toward its parents' average by (1 - h2), or the parents' average when
+        there is no record. NaN when neither the plant nor its ancestry
+        within MAX_ANCESTRY_DEPTH says anything about a trait.
+        """
+        name = pedigree.keeper_of(name)
+        if name in memo:
+            return memo[name]
+        memo[name] = np.full(len(self.columns), np.nan)  # Guards against lineage loops
+        parent_average = np.full(len(self.columns), np.nan)
+        if depth < MAX_ANCESTRY_DEPTH:
+            parent_values = [self.genetic_values(parent, pedigree, mean, heritability, memo, depth + 1)
+                             for parent in pedigree.parents(name)]
+            if parent_values:
+                stacked = np.vstack(parent_values)
+                # An unknown parent contributes the population mean
+                stacked = np.where(np.isnan(stacked), mean, stacked)
+                parent_average = stacked.mean(axis=0)
+                parent_average[np.all(np.isnan(np.vstack(parent_values)), axis=0)] = np.nan
+        own = self.recorded(name)
+        prior = np.where(np.isnan(parent_average), mean, parent_average)
+        value = np.where(np.isnan(own), parent_average, prior + heritability * (own - prior))
+        memo[name] = value
+        return value
+
+    def simulate(self, first, second, progeny=DEFAULT_PROGENY, seed=DEFAULT_SEED, heritability=None):
+        """
+        Simulates `progeny` offspring of `first` x `second` and returns a
+        CrossPrediction. `heritability` overrides DEFAULT_HERITABILITY per
+        trait. Traits with nothing recorded for either parent or their
+        ancestry are left out.
+        """
+        heritability = np.array([(heritability or {}).get(column, heritability_of(column))
+                                 for column in self.columns])
+        mean, phenotypic_std = self.population()
+        pedigree = Pedigree(self.lineage_of, self.keeper_of)
+        memo = {}
+        first_values = self.genetic_values(first, pedigree, mean, heritability, memo)
+        second_values = self.genetic_values(second, pedigree, mean, heritability, memo)
+
+        known = ~(np.isnan(first_values) & np.isnan(second_values)) & ~np.isnan(phenotypic_std)
+        # A parent with nothing known for a trait counts as an average plant
+        midparent = (np.where(np.isnan(first_values), mean, first_values)
+                     + np.where(np.isnan(second_values), mean, second_values)) / 2
+
+        # Variance components: additive h2 * Vp, environmental (1 - h2) * Vp.
+        # Mendelian sampling carries half the additive variance, reduced by
+        # the parents' own inbreeding.
+        parent_inbreeding = (pedigree.inbreeding(first) + pedigree.inbreeding(second)) / 2
+        offspring_inbreeding = pedigree.coancestry(first, second)
+        phenotypic_variance = np.nan_to_num(phenotypic_std) ** 2
+        mendelian_std = np.sqrt(0.5 * heritability * phenotypic_variance * (1 - parent_inbreeding))
+        environment_std = np.sqrt((1 - heritability) * phenotypic_variance)
+
+        columns = [column for column, keep in zip(self.columns, known) if keep]
+        rng = np.random.default_rng(seed)
+        count = int(known.sum())
+        samples = (midparent[known]
+                   + rng.standard_normal((progeny, count)) * mendelian_std[known]
+                   + rng.standard_normal((progeny, count)) * environment_std[known])
+        np.maximum(samples, 0, out=samples)  # Percentages, days and grams can't go negative
+
+        first_recorded, second_recorded = self.recorded(first), self.recorded(second)
+        spreads = np.percentile(samples, PERCENTILES, axis=0) if progeny else np.zeros((len(PERCENTILES), count))
+        distributions = []
+        for position, column in enumerate(columns):
+            index = self.columns.index(column)
+            distributions.append(TraitDistribution(
+                column, float(heritability[index]),
+                (float(first_recorded[index]), float(second_recorded[index])),
+                float(midparent[index]),
+                float(samples[:, position].mean()) if progeny else float(midparent[index]),
+                float(samples[:, position].std()) if progeny else 0.0,
+                {percentile: float(spreads[i, position]) for i, percentile in enumerate(PERCENTILES)}))
+        return CrossPrediction(first, second, columns, samples, distributions, offspring_inbreeding, seed)
@@ -0,0 +1,130 @@
+# breeding_view.py
+import tkinter as tk
+from tkinter import ttk, messagebox, Toplevel
+from components import StrainPicker
+from traits import TRAIT_COLUMNS, LOCI
+
+GENERATIONS = ("F1", "F2", "F3", "F4", "BC1", "BC2", "BC3")
+BACKCROSS_PARENTS = ("Parent 1", "Parent 2")
+
+
+def format_value(value):
+    return "" if value != value else f"{value:.2f}"  # NaN -> blank
+
+
+class BreedingPlannerWindow:
+    """
+    Pick two plants and see the predicted trait distribution of their
+    offspring, from the app's BreedingPlanner (see breeding.py). The same
+    seed always gives the same prediction. Below it, the genotype ratios at
+    the loci both plants were typed at, for the chosen generation (see
+    punnett.py).
+    """
+
+    COLUMNS = ('Trait', 'Parent 1', 'Parent 2', 'Midparent', 'Mean', 'Std Dev', '5%', 'Median', '95%', 'h²')
+    GENOTYPE_COLUMNS = ('Locus', 'Genotype', 'Phenotype', 'Share')
+
+    def __init__(self, parent, app, first=None, second=None, background="white", foreground="black"):
+        from breeding import DEFAULT_PROGENY, DEFAULT_SEED
+
+        self.app = app
+
+        self.top = Toplevel(parent)
+        self.top.title("Breeding Planner")
+        self.top.geometry("1000x700")
+        self.top.configure(bg=background)
+
+        controls = tk.Frame(self.top, bg=background)
+        controls.pack(fill='x', padx=10, pady=5)
+
+        tk.Label(controls, text="Parent 1:", bg=background, fg=foreground).grid(row=0, column=0, sticky='e')
+        self.first_var = tk.StringVar(value=first or "")
+        StrainPicker(controls, app.strain_index, textvariable=self.first_var, width=30).grid(row=0, column=1, padx=5)
+        tk.Label(controls, text="Parent 2:", bg=background, fg=foreground).grid(row=1, column=0, sticky='e')
+        self.second_var = tk.StringVar(value=second or "")
+        StrainPicker(controls, app.strain_index, textvariable=self.second_var, width=30).grid(row=1, column=1, padx=5)
+
+        tk.Label(controls, text="Progeny:", bg=background, fg=foreground).grid(row=0, column=2, sticky='e')
+        self.progeny_var = tk.IntVar(value=DEFAULT_PROGENY)
+        tk.Spinbox(controls, from_=100, to=100000, increment=1000, textvariable=self.progeny_var,
+                   width=8).grid(row=0, column=3, padx=5)
+        tk.Label(controls, text="Seed:", bg=background, fg=foreground).grid(row=1, column=2, sticky='e')
+        self.seed_var = tk.IntVar(value=DEFAULT_SEED)
+        tk.Entry(controls, textvariable=self.seed_var, width=10).grid(row=1, column=3, padx=5)
+
+        tk.Label(controls, text="Generation:", bg=background, fg=foreground).grid(row=0, column=4, sticky='e')
+        self.generation_var = tk.StringVar(value=GENERATIONS[0])
+        ttk.Combobox(controls, textvariable=self.generation_var, values=GENERATIONS, state='readonly',
+                     width=6).grid(row=0, column=5, padx=5)
+        tk.Label(controls, text="Backcross to:", bg=background, fg=foreground).grid(row=1, column=4, sticky='e')
+        self.recurrent_var = tk.StringVar(value=BACKCROSS_PARENTS[0])
+        ttk.Combobox(controls, textvariable=self.recurrent_var, values=BACKCROSS_PARENTS, state='readonly',
+                     width=9).grid(row=1, column=5, padx=5)
+
+        tk.Button(controls, text="Simulate Cross", command=self.simulate, bg="white", fg="black",
+                  font=("Helvetica", 12, "bold")).grid(row=0, column=6, rowspan=2, padx=10)
+
+        self.summary_label = tk.Label(self.top, text="", bg=background, fg=foreground, justify='left')
+        self.summary_label.pack(fill='x', padx=10)
+
+        self.tree = ttk.Treeview(self.top, columns=self.COLUMNS, show='headings')
+        for col in self.COLUMNS:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=90 if col != 'Trait' else 140)
+        self.tree.pack(fill='both', expand=True, padx=10, pady=10)
+
+        self.genotype_tree = ttk.Treeview(self.top, columns=self.GENOTYPE_COLUMNS, show='headings', height=8)
+        for col in self.GENOTYPE_COLUMNS:
+            self.genotype_tree.heading(col, text=col)
+            self.genotype_tree.column(col, width=200 if col == 'Phenotype' else 120)
+        self.genotype_tree.pack(fill='x', padx=10, pady=(0, 10))
+
+    def simulate(self):
+        first, second = self.first_var.get().strip(), self.second_var.get().strip()
+        for name in (first, second):
+            if name not in self.app.plant_genetics:
+                messagebox.showwarning("Unknown Strain", f"Please pick two existing strains ('{name}' not found).",
+                                       parent=self.top)
+                return
+        try:
+            progeny = int(self.progeny_var.get())
+            seed = int(self.seed_var.get())
+        except (tk.TclError, ValueError):
+            messagebox.showwarning("Invalid Input", "Progeny and seed must be whole numbers.", parent=self.top)
+            return
+        if progeny < 1:
+            messagebox.showwarning("Invalid Input", "Simulate at least one offspring.", parent=self.top)
+            return
+
+        prediction = self.app.get_breeding_planner().simulate(first, second, progeny, seed)
+
+        self.tree.delete(*self.tree.get_children())
+        for distribution in prediction.distributions:
+            self.tree.insert('', 'end', values=(
+                TRAIT_COLUMNS[distribution.trait].label,
+                format_value(distribution.parent_values[0]), format_value(distribution.parent_values[1]),
+                format_value(distribution.midparent), format_value(distribution.mean), format_value(distribution.std),
+                format_value(distribution.percentiles[5]), format_value(distribution.percentiles[50]),
+                format_value(distribution.percentiles[95]), f"{distribution.heritability:.2f}"))
+
+        generation = self.generation_var.get()
+        recurrent = first if self.recurrent_var.get() == BACKCROSS_PARENTS[0] else second
+        projection = self.app.get_genotype_projector().project(first, second, generation, recurrent)
+        self.genotype_tree.delete(*self.genotype_tree.get_children())
+        for locus in projection.loci:
+            label = LOCI[locus].label if locus in LOCI else locus
+            for genotype, share, phenotype in projection.ratios(locus):
+                self.genotype_tree.insert('', 'end', values=(label, "/".join(genotype), phenotype or "", f"{share:.1%}"))
+
+        if prediction.distributions:
+            summary = (f"{first} x {second}: {progeny} simulated offspring, seed {seed}. "
+                       f"Expected inbreeding {prediction.inbreeding:.1%}.")
+        else:
+            summary = ("Nothing to predict: neither parent nor their ancestry has numeric traits recorded. "
+                       "Add THC, terpene or other values under Genetic Information.")
+        if projection.loci:
+            summary += f"\nGenotype ratios for the {generation}" + (
+                f" backcrossed to {recurrent}." if generation.startswith("BC") else ".")
+        else:
+            summary += "\nNo locus is typed in both parents; add genotypes as \"Locus: <name>\" = \"A/a\"."
+        self.summary_label.config(text=summary)
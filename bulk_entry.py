@@ -0,0 +1,180 @@
+# bulk_entry.py
+import tkinter as tk
+from tkinter import ttk, messagebox, Toplevel
+from datetime import date
+from log_index import parse_log_date
+
+ANY_STAGE = "Any Stage"
+
+
+class BulkLogDialog:
+    """
+    Logs one activity for many plants at once. Plants are picked with the
+    search query language (see query.py), narrowed by their current stage
+    from the app's stage timelines, and fine-tuned by hand in the list.
+    `on_apply(entries)` receives every new entry in one call so the caller
+    can index them and write the log once.
+    """
+
+    def __init__(self, parent, app, activities, statuses, on_apply, stages=None,
+                 default_status=None, background="white", foreground="black"):
+        self.app = app
+        self.on_apply = on_apply
+        self.stages = stages
+        self.names = []
+
+        self.top = Toplevel(parent)
+        self.top.title("Bulk Log Entry")
+        self.top.geometry("500x750")
+        self.top.configure(bg=background)
+
+        def label(text):
+            tk.Label(self.top, text=text, bg=background, fg=foreground,
+                     font=("Helvetica", 12)).pack(pady=(8, 2))
+
+        # Plant selection
+        label("Plants matching (e.g. owned and clone, or a name):")
+        select_frame = tk.Frame(self.top, bg=background)
+        select_frame.pack(fill='x', padx=10)
+        self.query_var = tk.StringVar()
+        query_entry = tk.Entry(select_frame, textvariable=self.query_var, font=("Helvetica", 12))
+        query_entry.pack(side='left', fill='x', expand=True)
+        query_entry.bind('<Return>', lambda e: self.find_plants())
+
+        self.stage_filter_var = tk.StringVar(value=ANY_STAGE)
+        ttk.Combobox(select_frame, textvariable=self.stage_filter_var, width=12,
+                     values=[ANY_STAGE, "Clone", "Vegetation", "Flowering", "Harvested"]).pack(side='left', padx=5)
+        tk.Button(select_frame, text="Find", command=self.find_plants, bg="white", fg="black").pack(side='left')
+
+        list_frame = tk.Frame(self.top, bg=background)
+        list_frame.pack(fill='both', expand=True, padx=10, pady=5)
+        self.plant_list = tk.Listbox(list_frame, selectmode='extended', height=10, exportselection=False)
+        scrollbar = ttk.Scrollbar(list_frame, orient='vertical', command=self.plant_list.yview)
+        self.plant_list.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side='right', fill='y')
+        self.plant_list.pack(side='left', fill='both', expand=True)
+        self.plant_list.bind('<<ListboxSelect>>', lambda e: self.update_count())
+
+        count_frame = tk.Frame(self.top, bg=background)
+        count_frame.pack(fill='x', padx=10)
+        self.count_label = tk.Label(count_frame, text="", bg=background, fg=foreground)
+        self.count_label.pack(side='left')
+        tk.Button(count_frame, text="Select None", bg="white", fg="black",
+                  command=lambda: self.select_all(False)).pack(side='right')
+        tk.Button(count_frame, text="Select All", bg="white", fg="black",
+                  command=lambda: self.select_all(True)).pack(side='right', padx=5)
+
+        # What to log
+        label("Date (YYYY-MM-DD):")
+        self.date_entry = tk.Entry(self.top, font=("Helvetica", 12))
+        self.date_entry.insert(0, date.today().strftime('%Y-%m-%d'))
+        self.date_entry.pack()
+
+        label("Activity:")
+        self.activity_var = tk.StringVar(value=activities[0])
+        ttk.Combobox(self.top, textvariable=self.activity_var, values=activities).pack()
+
+        if stages:
+            label("Stage:")
+            self.stage_var = tk.StringVar(value="")
+            ttk.Combobox(self.top, textvariable=self.stage_var, values=stages).pack()
+            tk.Label(self.top, text="Leave empty to keep each plant's current stage",
+                     bg=background, fg=foreground, font=("Helvetica", 9)).pack()
+
+        label("Status:")
+        self.status_var = tk.StringVar(value=statuses[0] if default_status is None else default_status)
+        ttk.Combobox(self.top, textvariable=self.status_var, values=statuses).pack()
+        tk.Label(self.top, text="Leave empty to keep each plant's last status",
+                 bg=background, fg=foreground, font=("Helvetica", 9)).pack()
+
+        label("Notes:")
+        self.notes_text = tk.Text(self.top, height=3)
+        self.notes_text.pack(padx=10, fill='x')
+
+        tk.Button(self.top, text="Log for Selected Plants", command=self.apply,
+                  bg="white", fg="black", font=("Helvetica", 12, "bold")).pack(pady=10)
+
+        self.find_plants()
+
+    def find_plants(self):
+        """
+        Fills the list with the owned plants matching the query and stage.
+        Only living ones start selected, unless a stage was picked: library
+        parents the user doesn't grow are never offered, and harvested
+        plants are logged only when asked for.
+        """
+        names = self.app.match_search_query(self.query_var.get().strip())
+        plant_genetics = self.app.plant_genetics
+        names = [name for name in names if plant_genetics.get(name, {}).get('owned', True)]
+        stage = self.stage_filter_var.get()
+        if stage and stage != ANY_STAGE:
+            runs = self.app.stage_timelines.refresh()
+            names = [name for name in names if name in runs and runs[name].stage == stage]
+        self.names = sorted(names, key=lambda x: x.lower())
+        self.plant_list.delete(0, tk.END)
+        if self.names:
+            self.plant_list.insert(tk.END, *self.names)
+        if stage and stage != ANY_STAGE:
+            self.select_all(True)
+        else:
+            self.plant_list.selection_clear(0, tk.END)
+            for position, name in enumerate(self.names):
+                if self.app.is_living_plant(name):
+                    self.plant_list.selection_set(position)
+            self.update_count()
+
+    def select_all(self, selected):
+        if selected:
+            self.plant_list.selection_set(0, tk.END)
+        else:
+            self.plant_list.selection_clear(0, tk.END)
+        self.update_count()
+
+    def update_count(self):
+        self.count_label.config(text=f"{len(self.plant_list.curselection())} of {len(self.names)} plants selected")
+
+    def apply(self):
+        log_date = self.date_entry.get().strip()
+        try:
+            parse_log_date(log_date)
+        except ValueError:
+            messagebox.showwarning("Invalid Date", "Please enter the date in YYYY-MM-DD format.", parent=self.top)
+            return
+
+        activity = self.activity_var.get().strip()
+        if not activity:
+            messagebox.showwarning("Incomplete Data", "Please select an activity type.", parent=self.top)
+            return
+
+        selected = [self.names[position] for position in self.plant_list.curselection()]
+        if not selected:
+            messagebox.showwarning("No Plants", "Please select at least one plant.", parent=self.top)
+            return
+
+        notes = self.notes_text.get("1.0", "end-1c").strip()
+        status = self.status_var.get().strip()
+        stage = self.stage_var.get().strip() if self.stages else ""
+
+        log_index = self.app.get_grow_log_index()
+        entries = []
+        for name in selected:
+            latest = log_index.latest(name)
+            entry = {
+                "date": log_date,
+                "strain": name,
+                "activity_type": activity,
+                "notes": notes,
+                "status": status or (latest.get('status', '') if latest else '')
+            }
+            if self.stages:
+                if not stage:
+                    # Keep the plant where it is; new plants start as clones
+                    timeline = self.app.stage_timelines.timeline(name)
+                    entry["stage"] = timeline.stage if timeline else self.stages[0]
+                else:
+                    entry["stage"] = stage
+            entries.append(entry)
+
+        self.on_apply(entries)
+        self.top.destroy()
+        messagebox.showinfo("Success", f"Logged '{activity}' for {len(entries)} plants.")
@@ -1,11 +1,31 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, colorchooser, Toplevel
+import io
 import json
-import os
-from datetime import datetime, timedelta
-import graphviz
-from PIL import Image, ImageTk
+from collections import OrderedDict
+import multiprocessing
+from datetime import date, datetime, timedelta
 from grow_log_manager import GrowLogManager
+from grow_log_store import GrowLogStore
+from components import VirtualGrid, StrainPicker, BusyIndicator
+from strain_index import StrainNameIndex
+from roles import RoleIndex
+from detail_view import DetailViewPool
+from executor import BackgroundExecutor, write_json_text
+from lineage_render import render_lineage_png
+from events import (EventBus, STRAIN_EVENTS, LOG_EVENTS, STRAIN_ADDED, STRAIN_UPDATED, STRAIN_RENAMED,
+                    STRAIN_DELETED, STRAINS_RESET, LOG_ENTRY_ADDED, LOG_ENTRY_UPDATED, LOG_ENTRY_DELETED)
+from query import compile_query, strains_with_log_matches, QueryError, TRAIT_FIELDS
+from timeline import StageTimelineEngine, HARVESTED_STAGES
+from traits import TraitRangeCache, TRAIT_SCHEMA, KNOWN_LOCI, invalid_trait_values, invalid_genotype_values
+from clones import clone_suffix, allocate_clone_names, migrate_clone_records, CloneRegistry, CLONE_FIELDS
+from trait_map import TraitMapPool, EMPTY_TRAITS
+from dashboard import StageDashboard
+from pheno_hunt import PhenoHuntEngine
+from similarity_view import SimilarStrainsWindow
+from breeding_view import BreedingPlannerWindow
+from cross_view import CrossRecommenderWindow
+from log_index import parse_log_date
 
 # Constants for file paths
 DATA_FILE = 'plant_genetics.json'
@@ -22,6 +42,9 @@ DEFAULT_COLORS = {
     "Not Owned Strain": "#A9A9A9"
 }
 
+# Number of rendered lineage trees kept in memory
+LINEAGE_CACHE_SIZE = 16
+
 # Constants for styling
 BACKGROUND_COLOR = "white"
 TEXT_COLOR = "black"
@@ -92,20 +115,18 @@ class CloneEntryDialog:
         self.clone_date = datetime.now().strftime('%Y-%m-%d')
         mother_name = self.mother_plant.get()
         self.medium = self.medium.get()
-        self.clone_id = f"{mother_name}-{self.get_next_clone_id()}"
+        self.clone_id = None
         self.result = True
         
-        # Call a new function in the main app to create and log the clone
+        # Call a new function in the main app to create and log the clone; the
+        # app allocates the name, so clones taken in the same minute can't collide
         parent_app = self.top.master.nametowidget(self.top.master.winfo_parent())
         if hasattr(parent_app, 'app_instance'):
-            parent_app.app_instance.create_clone_in_plants(mother_name, self.clone_id, self.medium, self.clone_date)
+            created = parent_app.app_instance.create_clones(mother_name, 1, self.medium, self.clone_date)
+            self.clone_id = created[0] if created else None
         
         self.top.destroy()
 
-    def get_next_clone_id(self):
-        # Implementation of clone ID generation
-        return datetime.now().strftime('%Y%m%d-%H%M')
-
 class CannabisGeneticsApp:
     def __init__(self, root):
         self.root = root
@@ -113,15 +134,74 @@ class CannabisGeneticsApp:
         self.root.geometry("1400x1100")  # Increased size for better visibility
         self.root.configure(bg=BACKGROUND_COLOR)  # Set main background to white
 
+        # Background work (saves, rendering) runs off the main loop
+        self.busy_indicator = BusyIndicator(self.root)
+        self.busy_indicator.pack(side='bottom', fill='x')
+        self.executor = BackgroundExecutor(self.root, busy_callback=self.busy_indicator.set_busy)
+        self.lineage_render_token = None
+        self.lineage_png_cache = OrderedDict()  # DOT source -> PNG bytes, most recent last
+        self.lineage_shown = None  # (plant name, roles drawn) for the tree on screen
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
         # Load or initialize configuration
         self.legend_colors = self.load_config()
+        self.applied_colors = dict(self.legend_colors)  # Colors the live widgets currently show
 
         # Load genetics data
         self.plant_genetics = self.load_genetics_data()
 
+        # Clones share their mother's read-only genetic_info until one of them is edited
+        self.trait_maps = TraitMapPool()
+        self.trait_maps.share_all(self.plant_genetics)
+
+        # Classify every strain once; kept current incrementally as strains change
+        self.roles = RoleIndex(lambda: self.plant_genetics)
+
+        # Mother -> clones, from each clone's 'mother' field (inferred once for older records)
+        migrate_clone_records(self.plant_genetics)
+        self.clone_registry = CloneRegistry(lambda: self.plant_genetics)
+
         # Determine parent strains
         self.parent_strains = self.get_parent_strains()
 
+        # Name indexes behind the type-ahead strain pickers
+        self.strain_index = StrainNameIndex(lambda: self.plant_genetics.keys())
+        self.parent_index = StrainNameIndex(lambda: self.parent_strains)
+
+        # Plant detail windows are built once and recycled
+        self.detail_views = DetailViewPool(self, self.root)
+
+        # Model changes are published here and applied to the views once per idle cycle
+        self.events = EventBus(self.root)
+        self.grid_view = "owned"  # Which builder last filled the strain grid: "owned" or "search"
+
+        # Flowering time and yield parsed into numeric ranges, reparsed only after edits
+        self.trait_ranges = TraitRangeCache(lambda: self.plant_genetics)
+
+        # Typed genetic_info traits in NumPy columns, built the first time a query needs them
+        self.trait_store = None
+        self.similarity_engines = {}  # (column set, metric) -> similarity.SimilarityEngine
+        self.breeding_planner = None
+        self.cross_recommender = None
+        self.genotype_projector = None
+
+        # Models and indexes subscribe before any view, so views never read them a batch behind
+        self.events.subscribe(self.apply_strain_models, STRAIN_EVENTS)
+
+        # The grow log and its index, loaded the first time anything reads the log
+        self.grow_log_store = None
+
+        # Stage, days in stage and harvest window for every plant, cached per strain
+        self.stage_timelines = StageTimelineEngine(self.get_grow_log_index, self.trait_ranges.flowering_days)
+        self.events.subscribe(self.stage_timelines.apply, LOG_EVENTS + (STRAINS_RESET,))
+
+        # Seed batches of each pheno hunt and their rankings, built the first time they are shown
+        self.pheno_hunts = None
+        self.events.subscribe(self.apply_pheno_hunts, STRAIN_EVENTS + LOG_EVENTS)
+
+        # Views last
+        self.events.subscribe(self.on_strains_changed, STRAIN_EVENTS)
+
         # Create Notebook
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill='both', expand=True)
@@ -138,11 +218,45 @@ class CannabisGeneticsApp:
         self.grow_log_tab = tk.Frame(self.notebook, bg=BACKGROUND_COLOR)
         self.notebook.add(self.grow_log_tab, text="Grow Log")
 
-        # Initialize each tab in the correct order
-        self.initialize_grow_log_tab()      # Initialize Grow Log first
-        self.initialize_genetics_tab()      # Then Genetics
-        self.initialize_lineage_tab()
-        self.initialize_settings_tab()
+        # Dashboard Tab
+        self.dashboard_tab = tk.Frame(self.notebook, bg=BACKGROUND_COLOR)
+        self.notebook.add(self.dashboard_tab, text="Dashboard")
+
+        # Settings Tab
+        self.settings_tab = tk.Frame(self.notebook, bg=BACKGROUND_COLOR)
+        self.notebook.add(self.settings_tab, text="Settings")
+
+        # Tabs are built the first time they are shown
+        self.tab_builders = {
+            str(self.genetics_tab): self.initialize_genetics_tab,
+            str(self.lineage_tab): self.initialize_lineage_tab,
+            str(self.grow_log_tab): self.initialize_grow_log_tab,
+            str(self.dashboard_tab): self.initialize_dashboard_tab,
+            str(self.settings_tab): self.initialize_settings_tab,
+        }
+        self.built_tabs = set()
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+        self.on_tab_changed()
+
+    def on_tab_changed(self, event=None):
+        """
+        Builds the selected tab on first display.
+        """
+        self.ensure_tab(self.notebook.select())
+
+    def ensure_tab(self, tab):
+        """
+        Builds a tab if it has not been built yet. Used by code that needs
+        another tab's widgets or data before the user has opened it.
+        """
+        tab = str(tab)
+        if tab in self.built_tabs or tab not in self.tab_builders:
+            return
+        self.built_tabs.add(tab)
+        self.tab_builders[tab]()
+
+    def is_tab_built(self, tab):
+        return str(tab) in self.built_tabs
 
     def load_config(self):
         try:
@@ -172,23 +286,22 @@ class CannabisGeneticsApp:
             return {}
 
     def save_genetics_data(self):
-        try:
-            with open(DATA_FILE, 'w') as file:
-                json.dump(self.plant_genetics, file, indent=4)
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to save plant_genetics.json: {e}")
+        # Serialize now so later edits can't race the write, then write in the background
+        text = json.dumps(self.plant_genetics, indent=4)
+        self.executor.submit_write(write_json_text, DATA_FILE, text,
+                                   on_error=lambda e: messagebox.showerror("Error", f"Failed to save plant_genetics.json: {e}"))
+
+    def on_close(self):
+        # Flush pending saves before the window goes away
+        self.executor.shutdown()
+        self.root.destroy()
 
     def get_parent_strains(self):
         """
-        Collect all parent strain names from the lineage fields.
+        Collect all parent strain names from the lineage fields; the role
+        index keeps these as reference counts.
         """
-        parents = set()
-        for details in self.plant_genetics.values():
-            lineage = details.get('lineage', '')
-            if lineage and lineage != "Unknown":
-                parent_list = [parent.strip() for parent in lineage.split(' x ')]
-                parents.update(parent_list)
-        return parents
+        return self.roles.parent_names()
 
     def initialize_grow_log_tab(self):
         """
@@ -198,9 +311,15 @@ class CannabisGeneticsApp:
             self.grow_log_tab,
             self.plant_genetics,
             self,
-            GROW_LOG_FILE
+            self.get_grow_log_store()
         )
 
+    def initialize_dashboard_tab(self):
+        """
+        Creates the Dashboard tab: every active plant's stage and harvest window.
+        """
+        self.stage_dashboard = StageDashboard(self.dashboard_tab, self, BACKGROUND_COLOR, TEXT_COLOR)
+
     def initialize_genetics_tab(self):
         # Top Frame with Genetics Button
         top_frame = tk.Frame(self.genetics_tab, bg=BACKGROUND_COLOR)
@@ -262,15 +381,18 @@ class CannabisGeneticsApp:
 
         tk.Label(parent_selector_frame, text="Select Parent Strain:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 14, "bold")).pack(side="left")
         self.parent_strain_var = tk.StringVar()
-        parent_strain_options = ["All Parents"] + sorted(self.parent_strains, key=lambda x: x.lower())
-        self.parent_strain_dropdown = tk.OptionMenu(parent_selector_frame, self.parent_strain_var, *parent_strain_options, command=self.update_search_results)
-        self.parent_strain_dropdown.config(bg="white", fg="black", font=("Helvetica", 14))
+        self.parent_strain_dropdown = StrainPicker(parent_selector_frame, self.parent_index,
+                                                   textvariable=self.parent_strain_var,
+                                                   command=self.update_search_results,
+                                                   extra_options=["All Parents"], font=("Helvetica", 14))
         self.parent_strain_dropdown.pack(side="left", padx=10)
         self.parent_strain_var.set("All Parents")
 
-        # Genetics Buttons Frame with ScrollableFrame
-        self.genetics_scrollable_frame = ScrollableFrame(self.genetics_tab)
-        self.genetics_scrollable_frame.pack(pady=10, padx=20, fill='both', expand=True)
+        # Genetics Buttons Grid, only the buttons in view exist and are recycled on scroll
+        self.genetics_grid = VirtualGrid(self.genetics_tab, columns=5,
+                                         make_cell=self.make_strain_button,
+                                         bind_cell=self.bind_strain_button)
+        self.genetics_grid.pack(pady=10, padx=20, fill='both', expand=True)
 
         # Legend for Color Coding
         self.legend_frame = tk.Frame(self.genetics_tab, bg=BACKGROUND_COLOR)
@@ -294,14 +416,12 @@ class CannabisGeneticsApp:
         tk.Label(selection_frame, text="Select Strain:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12)).pack(side="left")
         
         if self.plant_genetics:
-            options = sorted(self.plant_genetics.keys(), key=lambda x: x.lower())
+            options = self.strain_index.search('', limit=1)
             self.plant_options = tk.StringVar(value=options[0])  # Initialize with the first option
-            self.dropdown = tk.OptionMenu(selection_frame, self.plant_options, *options)
         else:
             self.plant_options = tk.StringVar(value="No Strains Available")
-            self.dropdown = tk.OptionMenu(selection_frame, self.plant_options, "No Strains Available")
-        
-        self.dropdown.config(bg="white", fg="black", font=("Helvetica", 12))
+        self.dropdown = StrainPicker(selection_frame, self.strain_index, textvariable=self.plant_options,
+                                     font=("Helvetica", 12))
         self.dropdown.pack(side="left", padx=10)
 
         self.btn_lineage = tk.Button(selection_frame, text="Show Lineage Tree", command=self.display_lineage_tree,
@@ -309,6 +429,15 @@ class CannabisGeneticsApp:
                                      activebackground="lightgrey", activeforeground="black")
         self.btn_lineage.pack(side="left", padx=10)
 
+        tk.Button(selection_frame, text="Plan Cross",
+                  command=lambda: self.show_breeding_planner(self.plant_options.get()),
+                  bg="white", fg="black", font=("Helvetica", 14, "bold"),
+                  activebackground="lightgrey", activeforeground="black").pack(side="left", padx=10)
+
+        tk.Button(selection_frame, text="Recommend Crosses", command=self.show_cross_recommender,
+                  bg="white", fg="black", font=("Helvetica", 14, "bold"),
+                  activebackground="lightgrey", activeforeground="black").pack(side="left", padx=10)
+
         # Create a Canvas with Scrollbars for the lineage tree image
         self.tree_canvas = tk.Canvas(self.lineage_tab, bg=BACKGROUND_COLOR)
         self.v_scrollbar_tree = tk.Scrollbar(self.lineage_tab, orient="vertical", command=self.tree_canvas.yview)
@@ -330,10 +459,6 @@ class CannabisGeneticsApp:
         )
 
     def initialize_settings_tab(self):
-        # Settings Tab
-        self.settings_tab = tk.Frame(self.notebook, bg=BACKGROUND_COLOR)
-        self.notebook.add(self.settings_tab, text="Settings")
-
         # Title
         tk.Label(self.settings_tab, text="Settings", bg=BACKGROUND_COLOR, fg=TEXT_COLOR,
                  font=("Helvetica", 16, "bold")).pack(pady=10)
@@ -360,11 +485,14 @@ class CannabisGeneticsApp:
 
         tk.Label(self.legend_frame, text="Legend:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 14, "bold")).pack(side="left", padx=(0, 20))
 
+        # Swatches are kept by role so color changes can be applied in place
+        self.legend_swatches = {}
         for legend_item, color in self.legend_colors.items():
             legend = tk.Frame(self.legend_frame, bg=color, width=25, height=25)
             legend.pack(side="left", padx=5)
             legend.pack_propagate(False)
             tk.Label(self.legend_frame, text=legend_item, bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12)).pack(side="left", padx=(0, 20))
+            self.legend_swatches[legend_item] = legend
 
     def customize_colors(self):
         """
@@ -438,13 +566,44 @@ class CannabisGeneticsApp:
         window.destroy()
         messagebox.showinfo("Colors Saved", "Legend colors have been updated successfully.")
 
+    def role_color(self, role):
+        """Returns the legend color for a strain role (a legend key)."""
+        return self.legend_colors.get(role, DEFAULT_COLORS.get(role, "#A9A9A9"))
+
     def update_legend_colors(self):
         """
-        Updates the legend frames with the current legend colors.
+        Applies legend color changes in place: only the swatches, visible strain
+        buttons and lineage tree whose role changed color are touched, and the
+        grid keeps whatever it was showing (including an active search).
         """
-        self.create_legend()
-        # Refresh the genetics buttons to apply color changes if necessary
-        self.display_genetics_buttons()
+        changed = {role for role in set(self.legend_colors) | set(self.applied_colors)
+                   if self.legend_colors.get(role) != self.applied_colors.get(role)}
+        self.applied_colors = dict(self.legend_colors)
+        if not changed:
+            return
+
+        if self.is_tab_built(self.genetics_tab):
+            if set(self.legend_swatches) != set(self.legend_colors):
+                self.create_legend()
+            else:
+                for role in changed:
+                    self.legend_swatches[role].configure(bg=self.role_color(role))
+            self.recolor_strain_grid(changed)
+
+        # Re-render the lineage tree on screen only if it draws a changed role
+        if self.lineage_shown and changed & self.lineage_shown[1]:
+            self.display_lineage_tree(self.lineage_shown[0])
+
+    def recolor_strain_grid(self, roles):
+        """Reconfigures the visible strain buttons of `roles`; off-screen cells pick the color up when rebound."""
+        by_role = {}
+        for cell, (plant_name, role) in self.genetics_grid.visible_cells():
+            by_role.setdefault(role, []).append(cell)
+        for role in roles:
+            color = self.role_color(role)
+            for cell in by_role.get(role, ()):
+                cell.configure(bg=color, activebackground=color)
+                cell.bound_color = color
 
     def delete_all_data(self):
         """
@@ -459,10 +618,7 @@ class CannabisGeneticsApp:
 
             # Save the empty data to the JSON file
             self.save_genetics_data()
-
-            # Update the UI
-            self.display_genetics_buttons()
-            self.update_dropdown_options()
+            self.events.publish(STRAINS_RESET)
 
             messagebox.showinfo("Data Deleted", "All strain data has been deleted. You can start adding new strains.")
 
@@ -529,218 +685,71 @@ class CannabisGeneticsApp:
                                  activebackground="lightgrey", activeforeground="black")
         self.btn_add.grid(row=6, column=0, columnspan=4, pady=15)
 
+    def make_strain_button(self, parent):
+        """
+        Creates one pooled strain button for the genetics grid. The command reads
+        the plant name bound to the button, so rebinding never allocates a new callback.
+        """
+        btn = tk.Button(parent, width=20, fg=BACKGROUND_COLOR, font=("Helvetica", 12, "bold"),
+                        activeforeground=BACKGROUND_COLOR)
+        btn.bound_item = None
+        btn.bound_color = None
+        btn.configure(command=lambda b=btn: self.show_plant_details(b.bound_item[0]))
+        return btn
+
+    def bind_strain_button(self, btn, item):
+        """Points a pooled strain button at a (plant_name, role) item."""
+        plant_name, role = item
+        color = self.role_color(role)
+        if btn.bound_item == item and btn.bound_color == color:
+            return
+        btn.configure(text=plant_name, bg=color, activebackground=color)
+        btn.bound_item = item
+        btn.bound_color = color
+
     def display_genetics_buttons(self):
-        # Clear existing buttons
-        for widget in self.genetics_scrollable_frame.scrollable_frame.winfo_children():
-            widget.destroy()
+        self.grid_view = "owned"
 
         # Filter strains to only those that are owned
         owned_strains = [name for name, details in self.plant_genetics.items() if details.get('owned', True)]
         sorted_plants = sorted(owned_strains, key=lambda x: x.lower())
 
-        # Arrange buttons in grid
-        columns = 5  # Number of columns in grid
-        row = 0
-        column = 0
+        # Build the backing list for the grid
+        items = []
         for plant_name in sorted_plants:
-            ownership_type = self.plant_genetics[plant_name].get('ownership_type', 'None')
-            is_parent = plant_name in self.parent_strains
-            is_owned = self.plant_genetics[plant_name].get('owned', True)
-
-            # Determine role and color using legend_colors
-            if is_parent and is_owned:
-                color = self.legend_colors.get("Owned & Parent Strain", "#32CD32")
-            elif not is_parent and is_owned:
-                # Assign color based on ownership type
-                if ownership_type == "Seed Start":
-                    color = self.legend_colors.get("Seed Start Strain", "#00FFFF")
-                elif ownership_type == "Clone":
-                    color = self.legend_colors.get("Clone Strain", "#FF69B4")
-                else:
-                    color = self.legend_colors.get("Owned Strain", "#1E90FF")
-            else:
-                # Skip strains that are not owned
-                continue  # We already filtered for owned strains, but this is extra safety
-
-            # Create Button (Retain Color Coding)
-            btn = tk.Button(self.genetics_scrollable_frame.scrollable_frame, text=plant_name, width=20,
-                            command=lambda p=plant_name: self.show_plant_details(p),
-                            bg=color, fg=BACKGROUND_COLOR, font=("Helvetica", 12, "bold"),
-                            activebackground=color, activeforeground=BACKGROUND_COLOR)
-            btn.grid(row=row, column=column, padx=5, pady=5, sticky='nsew')
-            column += 1
-            if column >= columns:
-                column = 0
-                row += 1
-
-        # Make buttons expand equally
-        for i in range(columns):
-            self.genetics_scrollable_frame.scrollable_frame.columnconfigure(i, weight=1)
+            # The role (and so the color) comes from the shared classification cache
+            items.append((plant_name, self.roles.role(plant_name)))
+
+        self.genetics_grid.set_items(items)
 
     def show_plant_details(self, plant_name):
         if (plant_name not in self.plant_genetics):
             messagebox.showerror("Error", "Plant not found.")
             return
 
-        details = self.plant_genetics[plant_name]
+        # Reuse a pooled details window instead of building a new Toplevel
+        self.detail_views.show(plant_name)
 
-        # Create a new Toplevel window (popup)
-        details_window = Toplevel(self.root)
-        details_window.title(f"{plant_name} Details")
-        details_window.geometry("800x600")
-        details_window.configure(bg=BACKGROUND_COLOR)
-
-        # Create main frame
-        main_frame = tk.Frame(details_window, bg=BACKGROUND_COLOR)
-        main_frame.pack(fill='both', expand=True)
-
-        # Left frame for mother's details
-        left_frame = tk.Frame(main_frame, bg=BACKGROUND_COLOR)
-        left_frame.pack(side='left', fill='both', expand=True)
-
-        # Right frame for clones
-        right_frame = tk.Frame(main_frame, bg=BACKGROUND_COLOR)
-        right_frame.pack(side='left', fill='both', expand=True)
-
-        # Display plant details in the left frame
-        info_text = f"{plant_name} ({details.get('gender', 'Unknown')})\n\n"
-        for key, value in details.items():
-            if key not in ["gender", "owned", "ownership_type", "genetic_info", "clone_count"]:
-                info_text += f"{key.capitalize()}: {value}\n"
-
-        label = tk.Label(left_frame, text=info_text, justify="left", padx=10, pady=10,
-                         bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12))
-        label.pack(fill='x', expand=False)
-
-        # Editable Fields in left_frame
-        edit_frame = tk.Frame(left_frame, bg=BACKGROUND_COLOR)
-        edit_frame.pack(pady=10, padx=20, fill='x')
-
-        # Strain Name
-        tk.Label(edit_frame, text="Strain Name:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12)).grid(row=0, column=0, sticky='e')
-        self.edit_entry_name = tk.Entry(edit_frame, font=("Helvetica", 12))
-        self.edit_entry_name.grid(row=0, column=1, sticky='we', padx=5, pady=5)
-        self.edit_entry_name.insert(0, plant_name)
-
-        # Yield
-        tk.Label(edit_frame, text="Yield:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12)).grid(row=1, column=0, sticky='e')
-        self.edit_entry_yield = tk.Entry(edit_frame, font=("Helvetica", 12))
-        self.edit_entry_yield.grid(row=1, column=1, sticky='we', padx=5, pady=5)
-        self.edit_entry_yield.insert(0, details.get('yield', 'Unknown'))
-
-        # Lineage
-        tk.Label(edit_frame, text="Lineage:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12)).grid(row=2, column=0, sticky='e')
-        self.edit_entry_lineage = tk.Entry(edit_frame, font=("Helvetica", 12))
-        self.edit_entry_lineage.grid(row=2, column=1, sticky='we', padx=5, pady=5)
-        self.edit_entry_lineage.insert(0, details.get('lineage', 'Unknown'))
-
-        # Flowering Time
-        tk.Label(edit_frame, text="Flowering Time:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12)).grid(row=3, column=0, sticky='e')
-        self.edit_entry_flowering_time = tk.Entry(edit_frame, font=("Helvetica", 12))
-        self.edit_entry_flowering_time.grid(row=3, column=1, sticky='we', padx=5, pady=5)
-        self.edit_entry_flowering_time.insert(0, details.get('flowering_time', 'Unknown'))
-
-        # Type
-        tk.Label(edit_frame, text="Type:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12)).grid(row=4, column=0, sticky='e')
-        self.edit_entry_type = tk.Entry(edit_frame, font=("Helvetica", 12))
-        self.edit_entry_type.grid(row=4, column=1, sticky='we', padx=5, pady=5)
-        self.edit_entry_type.insert(0, details.get('type', 'Unknown'))
-
-        # Gender
-        tk.Label(edit_frame, text="Gender:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12)).grid(row=5, column=0, sticky='e')
-        self.edit_gender_var = tk.StringVar(value=details.get("gender", "Unknown"))
-        gender_options = ["Female", "Male", "Unknown"]
-        self.edit_gender_menu = tk.OptionMenu(edit_frame, self.edit_gender_var, *gender_options)
-        self.edit_gender_menu.config(bg="white", fg="black", font=("Helvetica", 12))
-        self.edit_gender_menu.grid(row=5, column=1, sticky='w', padx=5, pady=5)
-
-        # Owned
-        tk.Label(edit_frame, text="Owned:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12)).grid(row=6, column=0, sticky='e')
-        self.edit_owned_var = tk.BooleanVar(value=details.get("owned", True))
-        self.edit_checkbox_owned = tk.Checkbutton(edit_frame, variable=self.edit_owned_var, bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12))
-        self.edit_checkbox_owned.grid(row=6, column=1, sticky='w', padx=5, pady=5)
-
-        # Ownership Type
-        tk.Label(edit_frame, text="Ownership Type:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12)).grid(row=7, column=0, sticky='e')
-        self.edit_ownership_type_var = tk.StringVar(value=details.get("ownership_type", "None"))
-        ownership_type_options = ["None", "Clone", "Seed Start"]
-        self.edit_ownership_type_menu = tk.OptionMenu(edit_frame, self.edit_ownership_type_var, *ownership_type_options)
-        self.edit_ownership_type_menu.config(bg="white", fg="black", font=("Helvetica", 12))
-        self.edit_ownership_type_menu.grid(row=7, column=1, sticky='w', padx=5, pady=5)
-
-        # Notes
-        tk.Label(edit_frame, text="Notes:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12)).grid(row=8, column=0, sticky='e')
-        self.edit_entry_notes = tk.Entry(edit_frame, font=("Helvetica", 12))
-        self.edit_entry_notes.grid(row=8, column=1, sticky='we', padx=5, pady=5)
-        self.edit_entry_notes.insert(0, details.get('notes', ''))
-
-        # Create a button frame that will always be visible
-        button_frame = tk.Frame(left_frame, bg=BACKGROUND_COLOR)
-        button_frame.pack(side='bottom', fill='x', pady=10)
-
-        # Add Clone Button (only if plant is owned and female)
-        if self.plant_genetics[plant_name].get('owned', True) and self.plant_genetics[plant_name].get('gender', '') == 'Female':
-            btn_clone = tk.Button(button_frame, text="Create Clone", 
-                                command=lambda: self.create_clone_dialog(plant_name),
-                                bg="white", fg="black", font=("Helvetica", 14, "bold"),
-                                activebackground="lightgrey", activeforeground="black")
-            btn_clone.pack(side='left', padx=5)
+    def get_clones(self, plant_name):
+        """
+        Returns the names of the clones taken from `plant_name`.
+        """
+        return self.clone_registry.clones_of(plant_name)
 
-        # Genetic Information Button (moved to button frame)
-        btn_genetic_info = tk.Button(button_frame, text="Genetic Information", 
-                                   command=lambda: self.open_genetic_info_window(plant_name),
-                                   bg="white", fg="black", font=("Helvetica", 14, "bold"),
-                                   activebackground="lightgrey", activeforeground="black")
-        btn_genetic_info.pack(side='left', padx=5)
-
-        # Save Changes Button
-        btn_save = tk.Button(button_frame, text="Save Changes", 
-                           command=lambda: self.update_plant_details(plant_name, details_window),
-                           bg="white", fg="black", font=("Helvetica", 14, "bold"),
-                           activebackground="lightgrey", activeforeground="black")
-        btn_save.pack(side='left', padx=5)
-
-        # Delete Button
-        btn_delete = tk.Button(button_frame, text="Delete", 
-                             command=lambda: self.delete_plant(plant_name, details_window),
-                             bg="white", fg="black", font=("Helvetica", 14, "bold"),
-                             activebackground="lightgrey", activeforeground="black")
-        btn_delete.pack(side='left', padx=5)
-
-        # Configure grid weights
-        for i in range(2):
-            edit_frame.columnconfigure(i, weight=1)
-
-        # Now, in the right_frame, display clones
-        # Find clones of this mother
-        clones = [name for name, d in self.plant_genetics.items() if d.get('lineage') == plant_name and d.get('ownership_type') == 'Clone']
-
-        if clones:
-            tk.Label(right_frame, text="Clones:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 14, "bold")).pack(pady=10)
-            # Use a scrollable frame if there are many clones
-            clones_frame = ScrollableFrame(right_frame)
-            clones_frame.pack(fill='both', expand=True)
-            row = 0
-            column = 0
-            columns = 3  # Number of columns in grid
-            for clone_name in clones:
-                btn_clone = tk.Button(clones_frame.scrollable_frame, text=clone_name, command=lambda c=clone_name: self.show_clone_grow_log(c),
-                                      bg="white", fg="black", font=("Helvetica", 12),
-                                      activebackground="lightgrey", activeforeground="black")
-                btn_clone.grid(row=row, column=column, padx=5, pady=5)
-                column += 1
-                if column >= columns:
-                    column = 0
-                    row += 1
-        else:
-            tk.Label(right_frame, text="No clones found.", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12)).pack(pady=10)
+    def is_living_plant(self, name):
+        """Owned and not logged as harvested; used to count living cuts."""
+        details = self.plant_genetics.get(name)
+        if not details or not details.get('owned', True):
+            return False
+        timeline = self.stage_timelines.timeline(name)
+        return timeline is None or timeline.stage not in HARVESTED_STAGES
 
     def create_clone_dialog(self, mother_name):
         """Handle clone creation for a specific mother plant"""
         # Create clone dialog
         dialog = tk.Toplevel(self.root)
         dialog.title(f"Create Clone from {mother_name}")
-        dialog.geometry("400x300")
+        dialog.geometry("400x360")
         dialog.configure(bg=BACKGROUND_COLOR)
 
         # Growing Medium Selection
@@ -751,6 +760,12 @@ class CannabisGeneticsApp:
                                  values=["Rockwool", "Soil", "Coco", "DWC", "Aeroponic"])
         medium_menu.pack(pady=5)
 
+        # Number of cuts taken
+        tk.Label(dialog, text="Number of Cuts:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR,
+                font=("Helvetica", 12)).pack(pady=5)
+        count_var = tk.StringVar(value="1")
+        tk.Spinbox(dialog, from_=1, to=500, textvariable=count_var, width=6).pack(pady=5)
+
         # Notes
         tk.Label(dialog, text="Notes:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR,
                 font=("Helvetica", 12)).pack(pady=5)
@@ -761,21 +776,22 @@ class CannabisGeneticsApp:
             medium = medium_var.get()
             notes = notes_text.get("1.0", "end-1c").strip()
             clone_date = datetime.now().strftime('%Y-%m-%d')
-            
-            # Generate clone name
-            clone_count = self.plant_genetics[mother_name].get('clone_count', 0) + 1
-            clone_suffix = self.get_clone_suffix(clone_count)
-            clone_name = f"{mother_name} Clone {clone_suffix}"
+            try:
+                count = int(count_var.get())
+            except ValueError:
+                count = 0
+            if count < 1:
+                messagebox.showwarning("Invalid Count", "Please enter how many cuts to create.")
+                return
 
-            # Create the clone
-            self.create_clone_in_plants(mother_name, clone_name, medium, clone_date)
-            
-            # Add notes if provided
-            if notes:
-                self.plant_genetics[clone_name]['notes'] = notes
-                self.save_genetics_data()
+            # Create all the clones in one go
+            clone_names = self.create_clones(mother_name, count, medium, clone_date, notes)
 
-            messagebox.showinfo("Success", f"Clone '{clone_name}' created successfully!")
+            if len(clone_names) == 1:
+                messagebox.showinfo("Success", f"Clone '{clone_names[0]}' created successfully!")
+            elif clone_names:
+                messagebox.showinfo("Success", f"{len(clone_names)} clones created: "
+                                               f"'{clone_names[0]}' to '{clone_names[-1]}'.")
             dialog.destroy()
 
         # Save Button
@@ -783,21 +799,122 @@ class CannabisGeneticsApp:
                  bg="white", fg="black", font=("Helvetica", 14, "bold"),
                  activebackground="lightgrey", activeforeground="black").pack(pady=20)
 
+    def get_grow_log_store(self):
+        """
+        The shared grow log (see grow_log_store.py), loaded on first use. The
+        Grow Log tab and every other reader or writer use this one copy, and
+        no tab has to be built to reach it.
+        """
+        if self.grow_log_store is None:
+            self.grow_log_store = GrowLogStore(GROW_LOG_FILE, self.executor)
+            if self.grow_log_store.error:
+                messagebox.showerror("Error", self.grow_log_store.error)
+            if self.grow_log_store.problems:
+                messagebox.showwarning(
+                    "Grow Log",
+                    f"{len(self.grow_log_store.problems)} grow log row(s) could not be read and were set aside; "
+                    "they are kept in the file but not shown:\n" + "\n".join(self.grow_log_store.problems[:10]))
+        return self.grow_log_store
+
+    def get_grow_log(self):
+        """The in-memory grow log entries."""
+        return self.get_grow_log_store().entries
+
+    def get_grow_log_index(self):
+        """The per-strain, date-sorted index over the shared grow log."""
+        return self.get_grow_log_store().index
+
+    def get_pheno_hunts(self):
+        """The PhenoHuntEngine (see pheno_hunt.py), built on first use."""
+        if self.pheno_hunts is None:
+            self.pheno_hunts = PhenoHuntEngine(lambda: self.plant_genetics, self.get_grow_log_index,
+                                               self.clone_registry.keeper_of, self.clone_registry.descendants)
+        return self.pheno_hunts
+
+    def apply_pheno_hunts(self, batch):
+        if self.pheno_hunts is not None:
+            self.pheno_hunts.apply(batch)
+
+    def get_trait_store(self):
+        """The columnar trait store (see trait_store.py), building it on first use so NumPy loads only then."""
+        if self.trait_store is None:
+            from trait_store import TraitStore
+            self.trait_store = TraitStore(lambda: self.plant_genetics)
+        return self.trait_store
+
+    def apply_strain_models(self, batch):
+        """Brings every strain model and index up to date with one batch of strain events."""
+        self.roles.apply(batch)
+        self.clone_registry.apply(batch)
+        self.trait_ranges.apply(batch)
+        if self.trait_store is not None:
+            self.trait_store.apply(batch)
+        for engine in self.similarity_engines.values():
+            engine.apply(batch)
+        if self.genotype_projector is not None:
+            self.genotype_projector.apply(batch)
+
+    def get_similarity_engine(self, column_set="traits", metric="cosine"):
+        """
+        The kNN engine comparing strains by all numeric traits ("traits") or
+        terpenes only ("terpenes"), one per column set and metric, kept for reuse.
+        """
+        key = (column_set, metric)
+        if key not in self.similarity_engines:
+            from similarity import SimilarityEngine, TRAIT_VECTOR_COLUMNS, TERPENE_COLUMNS
+            columns = TERPENE_COLUMNS if column_set == "terpenes" else TRAIT_VECTOR_COLUMNS
+            self.similarity_engines[key] = SimilarityEngine(self.get_trait_store(), columns, metric)
+        return self.similarity_engines[key]
+
+    def show_similar_strains(self, plant_name):
+        SimilarStrainsWindow(self.root, self, plant_name, BACKGROUND_COLOR, TEXT_COLOR)
+
+    def get_breeding_planner(self):
+        """Offspring simulation over the trait store and the lineage graph, built on first use."""
+        if self.breeding_planner is None:
+            from breeding import BreedingPlanner
+            self.breeding_planner = BreedingPlanner(self.get_trait_store(),
+                                                    lambda name: self.roles.lineages.get(name, []),
+                                                    self.clone_registry.keeper_of)
+        return self.breeding_planner
+
+    def get_genotype_projector(self):
+        """Genotype ratios at tracked loci for any cross, cached per parent pair."""
+        if self.genotype_projector is None:
+            from punnett import PunnettProjector
+            self.genotype_projector = PunnettProjector(lambda: self.plant_genetics)
+        return self.genotype_projector
+
+    def show_breeding_planner(self, plant_name=None, second=None):
+        BreedingPlannerWindow(self.root, self, plant_name, second, BACKGROUND_COLOR, TEXT_COLOR)
+
+    def get_cross_recommender(self):
+        """All-pairs cross ranking over the owned females and the males, built on first use."""
+        if self.cross_recommender is None:
+            from crosses import CrossRecommender
+            self.cross_recommender = CrossRecommender(self.get_trait_store(), lambda: self.plant_genetics,
+                                                      lambda name: self.roles.lineages.get(name, []),
+                                                      self.clone_registry.keeper_of)
+        return self.cross_recommender
+
+    def show_cross_recommender(self):
+        CrossRecommenderWindow(self.root, self, BACKGROUND_COLOR, TEXT_COLOR)
+
+    def save_grow_log(self, kind, *strains):
+        """Saves the shared grow log and publishes the change for each strain."""
+        self.get_grow_log_store().save(
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to save grow log: {e}"))
+        for strain in strains:
+            self.events.publish(kind, strain)
+
     def show_clone_grow_log(self, clone_name):
-        # Load grow log data
-        if os.path.exists(GROW_LOG_FILE):
-            try:
-                with open(GROW_LOG_FILE, 'r') as file:
-                    grow_log = json.load(file)
-            except json.JSONDecodeError:
-                messagebox.showerror("Error", "Failed to decode grow_log.json.")
-                return
-        else:
+        grow_log = self.get_grow_log()
+        if not grow_log:
             messagebox.showinfo("No Grow Log", "No grow log entries found.")
             return
 
-        # Filter entries for the selected clone
-        clone_entries = [entry for entry in grow_log if entry.get('strain') == clone_name]
+        # The clone's entries, already sorted by date
+        clone_entries = self.get_grow_log_index().entries_for(clone_name)
 
         # Create a new window to display the entries
         grow_log_window = Toplevel(self.root)
@@ -909,7 +1026,7 @@ class CannabisGeneticsApp:
     def save_edit_clone_log_entry(self, entry, date, activity, notes, status, window, parent_window):
         # Validate date format
         try:
-            datetime.strptime(date, '%Y-%m-%d')
+            parse_log_date(date)
         except ValueError:
             messagebox.showwarning("Invalid Date", "Please enter the date in YYYY-MM-DD format.")
             return
@@ -923,10 +1040,10 @@ class CannabisGeneticsApp:
         entry['activity_type'] = activity
         entry['notes'] = notes
         entry['status'] = status
+        self.get_grow_log_store().update(entry)
 
         # Save grow log data
-        with open(GROW_LOG_FILE, 'w') as file:
-            json.dump(self.grow_log_app.grow_log, file, indent=4)
+        self.save_grow_log(LOG_ENTRY_UPDATED, entry.get('strain'))
 
         messagebox.showinfo("Success", "Grow log entry updated successfully!")
         window.destroy()
@@ -938,8 +1055,8 @@ class CannabisGeneticsApp:
     def delete_clone_log_entry(self, entry, window, parent_window):
         if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this log entry?"):
             # Remove entry from grow log
-            self.grow_log_app.grow_log.remove(entry)
-            self.grow_log_app.save_grow_log_data()
+            self.get_grow_log_store().delete(entry)
+            self.save_grow_log(LOG_ENTRY_DELETED, entry.get('strain'))
 
             messagebox.showinfo("Deleted", "Grow log entry has been deleted.")
             window.destroy()
@@ -1000,7 +1117,7 @@ class CannabisGeneticsApp:
     def save_log_entry_for_clone(self, date, activity, strain, notes, status, window, parent_window):
         # Validate date format
         try:
-            datetime.strptime(date, '%Y-%m-%d')
+            parse_log_date(date)
         except ValueError:
             messagebox.showwarning("Invalid Date", "Please enter the date in YYYY-MM-DD format.")
             return
@@ -1013,19 +1130,8 @@ class CannabisGeneticsApp:
             messagebox.showwarning("Invalid Strain", "Please select a valid strain.")
             return
 
-        # Load grow log data
-        if os.path.exists(GROW_LOG_FILE):
-            try:
-                with open(GROW_LOG_FILE, 'r') as file:
-                    grow_log = json.load(file)
-            except json.JSONDecodeError:
-                messagebox.showerror("Error", "Failed to decode grow_log.json.")
-                return
-        else:
-            grow_log = []
-
         # Add new log entry
-        grow_log.append({
+        self.get_grow_log_store().add({
             "date": date,
             "activity_type": activity,
             "strain": strain,
@@ -1034,8 +1140,7 @@ class CannabisGeneticsApp:
         })
 
         # Save grow log data
-        with open(GROW_LOG_FILE, 'w') as file:
-            json.dump(grow_log, file, indent=4)
+        self.save_grow_log(LOG_ENTRY_ADDED, strain)
 
         messagebox.showinfo("Success", "Grow log entry added successfully!")
         window.destroy()
@@ -1044,19 +1149,20 @@ class CannabisGeneticsApp:
         parent_window.destroy()
         self.show_clone_grow_log(strain)
 
-    def update_plant_details(self, plant_name, window):
+    def update_plant_details(self, plant_name, view):
         """
-        Updates the plant details based on the edited fields.
+        Updates the plant details based on the edited fields of a details view.
         """
-        new_name = self.edit_entry_name.get().strip()
-        lineage = self.edit_entry_lineage.get().strip()
-        gender = self.edit_gender_var.get()
-        yield_info = self.edit_entry_yield.get().strip()
-        flowering_time = self.edit_entry_flowering_time.get().strip()
-        plant_type = self.edit_entry_type.get().strip()
-        notes = self.edit_entry_notes.get().strip()
-        owned = self.edit_owned_var.get()
-        ownership_type = self.edit_ownership_type_var.get()
+        values = view.get_values()
+        new_name = values["name"]
+        lineage = values["lineage"]
+        gender = values["gender"]
+        yield_info = values["yield"]
+        flowering_time = values["flowering_time"]
+        plant_type = values["type"]
+        notes = values["notes"]
+        owned = values["owned"]
+        ownership_type = values["ownership_type"]
 
         if not new_name:
             messagebox.showwarning("Incomplete Data", "Please enter the strain name.")
@@ -1078,35 +1184,38 @@ class CannabisGeneticsApp:
             "owned": owned,
             "ownership_type": ownership_type if owned else "None",
             "clone_count": self.plant_genetics[plant_name].get('clone_count', 0),
-            "genetic_info": self.plant_genetics[plant_name].get('genetic_info', {})
+            "genetic_info": self.plant_genetics[plant_name].get('genetic_info', EMPTY_TRAITS),
+            **{field: self.plant_genetics[plant_name][field]
+               for field in CLONE_FIELDS if field in self.plant_genetics[plant_name]}
         }
 
         # If the name has changed, remove the old entry
         if new_name != plant_name:
             del self.plant_genetics[plant_name]
+            self.events.publish(STRAIN_RENAMED, new_name, plant_name)
             # Update any clones that have this plant as their mother
             for strain, details in self.plant_genetics.items():
                 if details.get('lineage') == plant_name:
                     self.plant_genetics[strain]['lineage'] = new_name
-
-        # Update parent strains after modification
-        self.parent_strains = self.get_parent_strains()
+                    self.events.publish(STRAIN_UPDATED, strain)
+            for strain in self.clone_registry.clones_of(plant_name):
+                if strain in self.plant_genetics:
+                    self.plant_genetics[strain]['mother'] = new_name
+                    self.events.publish(STRAIN_UPDATED, strain)
+        else:
+            self.events.publish(STRAIN_UPDATED, new_name)
 
         self.save_genetics_data()
-        self.display_genetics_buttons()
-        self.update_dropdown_options()
-        self.update_genetic_traits_tree()
+        self.detail_views.rename(plant_name, new_name)
         messagebox.showinfo("Success", f"'{new_name}' has been updated successfully!")
-        window.destroy()
+        view.close()
 
-    def delete_plant(self, plant_name, window):
+    def delete_plant(self, plant_name, view):
         if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete '{plant_name}'?"):
             del self.plant_genetics[plant_name]
             self.save_genetics_data()
-            self.display_genetics_buttons()
-            self.update_dropdown_options()
-            self.update_genetic_traits_tree()
-            window.destroy()
+            self.events.publish(STRAIN_DELETED, plant_name)
+            self.detail_views.forget(plant_name)
             messagebox.showinfo("Deleted", f"'{plant_name}' has been deleted.")
 
     def add_or_update_plant(self):
@@ -1124,6 +1233,10 @@ class CannabisGeneticsApp:
             messagebox.showwarning("Incomplete Data", "Please enter the strain name.")
             return
 
+        # Clone records keep their mother and cut date through edits
+        clone_fields = {field: self.plant_genetics[name][field]
+                        for field in CLONE_FIELDS if field in self.plant_genetics.get(name, {})}
+
         # Handle Clone Naming
         if (ownership_type == "Clone"):
             # Extract mother plant from lineage
@@ -1140,17 +1253,13 @@ class CannabisGeneticsApp:
                 messagebox.showwarning("Unknown Mother Plant", f"The mother plant '{mother_plant}' does not exist.")
                 return
 
-            # Generate clone name
-            clone_count = self.plant_genetics[mother_plant].get('clone_count', 0) + 1
-            clone_suffix = self.get_clone_suffix(clone_count)
-            clone_name = f"{mother_plant} Clone {clone_suffix}"
-
-            if clone_name in self.plant_genetics:
-                messagebox.showwarning("Duplicate Clone", f"The clone name '{clone_name}' already exists.")
-                return
+            # Generate a clone name that isn't taken yet
+            (clone_name,), clone_count = allocate_clone_names(self.plant_genetics, mother_plant, 1)
+            clone_fields = {"mother": mother_plant, "cut_date": date.today().strftime('%Y-%m-%d')}
 
             # Update clone count
             self.plant_genetics[mother_plant]['clone_count'] = clone_count
+            self.events.publish(STRAIN_UPDATED, mother_plant)
 
             name = clone_name  # Override the entered name with the auto-generated clone name
 
@@ -1171,8 +1280,9 @@ class CannabisGeneticsApp:
                             "owned": False,
                             "ownership_type": "None",
                             "clone_count": 0,
-                            "genetic_info": {}
+                            "genetic_info": EMPTY_TRAITS
                         }
+                        self.events.publish(STRAIN_ADDED, parent)
                     else:
                         return
 
@@ -1180,6 +1290,7 @@ class CannabisGeneticsApp:
         if name in self.plant_genetics and name != name:
             del self.plant_genetics[name]
 
+        self.events.publish(STRAIN_UPDATED if name in self.plant_genetics else STRAIN_ADDED, name)
         self.plant_genetics[name] = {
             "lineage": lineage if lineage else "Unknown",
             "yield": yield_info or "Unknown",
@@ -1190,16 +1301,11 @@ class CannabisGeneticsApp:
             "owned": owned,
             "ownership_type": ownership_type if owned else "None",
             "clone_count": self.plant_genetics.get(name, {}).get('clone_count', 0),
-            "genetic_info": self.plant_genetics.get(name, {}).get('genetic_info', {})
+            "genetic_info": self.plant_genetics.get(name, {}).get('genetic_info', EMPTY_TRAITS),
+            **clone_fields
         }
 
-        # Update parent strains after adding new plant
-        self.parent_strains = self.get_parent_strains()
-
         self.save_genetics_data()
-        self.display_genetics_buttons()
-        self.update_dropdown_options()
-        self.update_genetic_traits_tree()
         messagebox.showinfo("Success", f"'{name}' has been added/updated!")
 
         # Clear input fields
@@ -1208,16 +1314,9 @@ class CannabisGeneticsApp:
     def get_clone_suffix(self, clone_count):
         """
         Generates a clone suffix based on the clone count.
-        For example: 1 -> A, 2 -> B, ..., 26 -> Z, 27 -> A1, 28 -> B1, etc.
+        For example: 1 -> A, 2 -> B, ..., 26 -> Z, 27 -> AA, 28 -> AB, etc.
         """
-        import string
-        if clone_count <= 26:
-            return string.ascii_uppercase[clone_count - 1]
-        else:
-            # For counts beyond 26, append numbers
-            first_part = string.ascii_uppercase[(clone_count - 1) // 26 - 1]
-            second_part = string.ascii_uppercase[(clone_count - 1) % 26]
-            return f"{first_part}{second_part}"
+        return clone_suffix(clone_count)
 
     def clear_entry_fields(self):
         self.entry_name.delete(0, tk.END)
@@ -1232,41 +1331,62 @@ class CannabisGeneticsApp:
 
     def update_dropdown_options(self):
         """
-        Updates dropdown options across all relevant components.
+        Updates dropdown options across all relevant components. The strain
+        pickers query their name indexes lazily, so this only invalidates the
+        indexes and resets selections that no longer exist.
         """
-        # Update options in the Lineage Tree tab
-        menu = self.dropdown["menu"]
-        menu.delete(0, "end")
-        for strain in sorted(self.plant_genetics.keys(), key=lambda x: x.lower()):
-            menu.add_command(label=strain, command=lambda value=strain: self.plant_options.set(value))
-        self.plant_options.set("Select Strain")  # Reset selection
-
-        # Update options in Grow Log strain selection
-        if hasattr(self.grow_log_app, 'strain_var'):
-            strain_options = ["Select Strain"] + sorted(self.plant_genetics.keys(), key=lambda x: x.lower())
-            menu = self.grow_log_app.strain_dropdown["menu"]
-            menu.delete(0, "end")
-            for strain in strain_options:
-                menu.add_command(label=strain, command=lambda value=strain: self.grow_log_app.strain_var.set(value))
-            self.grow_log_app.strain_var.set("Select Strain")
-
-        # Update options in the Genetics tab parent strain dropdown
-        if hasattr(self, 'parent_strain_dropdown'):
-            parent_strain_options = ["All Parents"] + sorted(self.parent_strains, key=lambda x: x.lower())
-            menu = self.parent_strain_dropdown["menu"]
-            menu.delete(0, "end")
-            for parent in parent_strain_options:
-                menu.add_command(label=parent, command=lambda value=parent: self.parent_strain_var.set(value))
+        self.strain_index.invalidate()
+        self.parent_index.invalidate()
+
+        # Tabs that have not been built yet will read fresh data when they are;
+        # selections are only reset when the selected strain went away
+        if self.is_tab_built(self.lineage_tab) and self.plant_options.get() not in self.plant_genetics:
+            self.plant_options.set("Select Strain")
+
+        if self.is_tab_built(self.grow_log_tab):
+            self.grow_log_manager.clone_index.invalidate()
+            if self.grow_log_manager.strain_var.get() not in self.plant_genetics:
+                self.grow_log_manager.strain_var.set("Select Strain")
+
+        if self.is_tab_built(self.genetics_tab) and self.parent_strain_var.get() not in self.parent_strains:
             self.parent_strain_var.set("All Parents")
 
-    def display_lineage_tree(self):
-        plant_name = self.plant_options.get()
+    def on_strains_changed(self, batch):
+        """
+        Applies one idle cycle's worth of strain changes to the views: parent
+        strains and name indexes are refreshed once, the strain grid is rebuilt
+        in whichever mode it is showing, and only the detail windows for the
+        touched strains are re-populated.
+        """
+        # The models were brought up to date by apply_strain_models, subscribed first
+        self.parent_strains = self.get_parent_strains()
+        self.update_dropdown_options()
+        if self.is_tab_built(self.genetics_tab):
+            self.refresh_strain_grid()
+        self.update_genetic_traits_tree()
+        for name in batch.names():
+            self.detail_views.refresh(name)
+
+    def refresh_strain_grid(self):
+        """Re-runs whichever builder last filled the strain grid, keeping an active search."""
+        if self.grid_view == "search":
+            self.update_search_results()
+        else:
+            self.display_genetics_buttons()
+
+    def display_lineage_tree(self, plant_name=None):
+        if plant_name is None:
+            plant_name = self.plant_options.get()
         if plant_name not in self.plant_genetics:
             messagebox.showerror("Error", "Please select a valid strain.")
             return
 
+        # Deferred so sessions that never open the lineage tab don't pay for this import
+        import graphviz
+
         dot = graphviz.Digraph(comment=plant_name)
         visited = set()
+        roles = set()
 
         def add_to_tree(name):
             if name in visited:
@@ -1282,26 +1402,9 @@ class CannabisGeneticsApp:
             gender = current_plant.get("gender", "Unknown")
             label = f"{name}\n({gender})"
 
-            # Determine node color
-            is_parent = name in self.parent_strains
-            is_owned = current_plant.get('owned', True)
-            ownership_type = current_plant.get('ownership_type', 'None')
-
-            if is_parent and is_owned:
-                node_color = self.legend_colors.get("Owned & Parent Strain", "#32CD32")
-            elif is_parent and not is_owned:
-                node_color = self.legend_colors.get("Parent Strain", "#FFD700")
-            elif not is_parent and is_owned:
-                if ownership_type == "Clone":
-                    node_color = self.legend_colors.get("Clone Strain", "#FF69B4")
-                elif ownership_type == "Seed Start":
-                    node_color = self.legend_colors.get("Seed Start Strain", "#00FFFF")
-                else:
-                    node_color = self.legend_colors.get("Owned Strain", "#1E90FF")
-            else:
-                node_color = self.legend_colors.get("Not Owned Strain", "#A9A9A9")
-
-            dot.node(name, label, style='filled', fillcolor=node_color)
+            role = self.roles.role(name)
+            roles.add(role)
+            dot.node(name, label, style='filled', fillcolor=self.role_color(role))
 
             lineage = current_plant.get("lineage", "Unknown")
             if lineage != "Unknown":
@@ -1311,43 +1414,61 @@ class CannabisGeneticsApp:
                     dot.edge(parent, name)
 
         add_to_tree(plant_name)
+        self.lineage_shown = (plant_name, roles)
+
+        # Renders are cached by DOT source, which includes the colors, so a
+        # color change naturally misses the cache
+        source = dot.source
+        if self.lineage_render_token is not None:
+            self.lineage_render_token.cancel()
+        if source in self.lineage_png_cache:
+            self.lineage_png_cache.move_to_end(source)
+            self.show_lineage_image(self.lineage_png_cache[source])
+            return
 
-        try:
-            dot.render("lineage_tree", format="png", cleanup=True)
-            img = Image.open("lineage_tree.png")
-            img_width, img_height = img.size
-            max_width = 1200
-            max_height = 1200
-
-            # Resize image if it's too large
-            if img_width > max_width or img_height > max_height:
-                ratio = min(max_width / img_width, max_height / img_height)
-                img = img.resize((int(img_width * ratio), int(img_height * ratio)), Image.LANCZOS)
-
-            img = ImageTk.PhotoImage(img)
-
-            # Clear previous image
-            for widget in self.tree_inner_frame.winfo_children():
-                widget.destroy()
-
-            # Display new image
-            self.image_label = tk.Label(self.tree_inner_frame, image=img, bg=BACKGROUND_COLOR)
-            self.image_label.image = img  # Keep a reference
-            self.image_label.pack()
-
-            # Update scrollregion
-            self.tree_canvas.update_idletasks()
-            self.tree_canvas.configure(scrollregion=self.tree_canvas.bbox("all"))
-        except graphviz.backend.ExecutableNotFound:
+        # Render in a worker process; a newer request supersedes one still running
+        self.lineage_render_token = self.executor.submit_cpu(
+            render_lineage_png, source,
+            on_done=lambda png: self.on_lineage_rendered(source, png),
+            on_error=self.on_lineage_render_error)
+
+    def on_lineage_rendered(self, source, png):
+        self.lineage_png_cache[source] = png
+        while len(self.lineage_png_cache) > LINEAGE_CACHE_SIZE:
+            self.lineage_png_cache.popitem(last=False)
+        self.show_lineage_image(png)
+
+    def show_lineage_image(self, png):
+        from PIL import Image, ImageTk
+
+        img = ImageTk.PhotoImage(Image.open(io.BytesIO(png)))
+
+        # Clear previous image
+        for widget in self.tree_inner_frame.winfo_children():
+            widget.destroy()
+
+        # Display new image
+        self.image_label = tk.Label(self.tree_inner_frame, image=img, bg=BACKGROUND_COLOR)
+        self.image_label.image = img  # Keep a reference
+        self.image_label.pack()
+
+        # Update scrollregion
+        self.tree_canvas.update_idletasks()
+        self.tree_canvas.configure(scrollregion=self.tree_canvas.bbox("all"))
+
+    def on_lineage_render_error(self, e):
+        import graphviz
+
+        if isinstance(e, graphviz.backend.ExecutableNotFound):
             messagebox.showerror("Graphviz Not Found", "Graphviz executable not found. Please install Graphviz and ensure it's added to your system's PATH.")
-        except Exception as e:
+        else:
             messagebox.showerror("Error", f"Failed to generate lineage tree.\n{e}")
 
     def open_genetic_info_window(self, plant_name):
         """
         Opens a new window to view and edit genetic information for the selected strain.
         """
-        genetic_info = self.plant_genetics[plant_name].get('genetic_info', {})
+        genetic_info = self.plant_genetics[plant_name].get('genetic_info', EMPTY_TRAITS)
 
         genetic_window = Toplevel(self.root)
         genetic_window.title(f"{plant_name} Genetic Information")
@@ -1378,7 +1499,10 @@ class CannabisGeneticsApp:
         add_frame.grid(row=row, column=0, columnspan=2, pady=10)
 
         tk.Label(add_frame, text="New Attribute:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12)).grid(row=0, column=0, sticky='e', padx=5, pady=5)
-        self.new_genetic_key = tk.Entry(add_frame, font=("Helvetica", 12))
+        # Typed traits and known loci are suggested so their values can be queried and projected; any name is allowed
+        self.new_genetic_key = ttk.Combobox(add_frame, font=("Helvetica", 12),
+                                            values=[column.label for column in TRAIT_SCHEMA if column.name != "flowering_days"]
+                                            + [f"Locus: {locus.label}" for locus in KNOWN_LOCI])
         self.new_genetic_key.grid(row=0, column=1, sticky='we', padx=5, pady=5)
 
         tk.Label(add_frame, text="Value:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12)).grid(row=1, column=0, sticky='e', padx=5, pady=5)
@@ -1386,7 +1510,7 @@ class CannabisGeneticsApp:
         self.new_genetic_value.grid(row=1, column=1, sticky='we', padx=5, pady=5)
 
         # Add Button (Styled White with Black Text)
-        btn_add_genetic = tk.Button(genetic_window, text="Add Genetic Attribute", command=lambda: self.add_genetic_attribute(genetic_info, genetic_scrollable_frame),
+        btn_add_genetic = tk.Button(genetic_window, text="Add Genetic Attribute", command=lambda: self.add_genetic_attribute(genetic_scrollable_frame),
                                      bg="white", fg="black", font=("Helvetica", 14, "bold"),
                                      activebackground="lightgrey", activeforeground="black")
         btn_add_genetic.pack(pady=10)
@@ -1397,7 +1521,7 @@ class CannabisGeneticsApp:
                                      activebackground="lightgrey", activeforeground="black")
         btn_save_genetic.pack(pady=10)
 
-    def add_genetic_attribute(self, genetic_info, frame):
+    def add_genetic_attribute(self, frame):
         """
         Adds a new genetic attribute entry to the Genetics window.
         """
@@ -1408,14 +1532,11 @@ class CannabisGeneticsApp:
             messagebox.showwarning("Incomplete Data", "Please enter both attribute name and value.")
             return
 
-        if key in genetic_info:
+        if key in self.genetic_info_entries:
             messagebox.showwarning("Duplicate Attribute", "This attribute already exists.")
             return
 
-        # Add to genetic_info dictionary
-        genetic_info[key] = value
-
-        # Add to UI
+        # Add to UI; save_genetic_info builds the plant's new map from the entries
         row = len(self.genetic_info_entries)
         tk.Label(frame.scrollable_frame, text=f"{key}:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12)).grid(row=row, column=0, sticky='e', padx=5, pady=5)
         entry = tk.Entry(frame.scrollable_frame, font=("Helvetica", 12))
@@ -1437,10 +1558,26 @@ class CannabisGeneticsApp:
             if value:
                 genetic_info[key] = value
 
-        self.plant_genetics[plant_name]['genetic_info'] = genetic_info
-        self.save_genetics_data()
-        self.display_genetics_buttons()
-        self.update_genetic_traits_tree()
+        invalid = invalid_trait_values(genetic_info)
+        if invalid:
+            messagebox.showwarning("Invalid Value", f"Please enter a number for: {', '.join(invalid)}", parent=window)
+            return
+        invalid = invalid_genotype_values(genetic_info)
+        if invalid:
+            messagebox.showwarning("Invalid Genotype", f"Please enter two alleles (e.g. A/a) for: {', '.join(invalid)}",
+                                   parent=window)
+            return
+
+        # Diverge from the shared map only if something changed: clones still on
+        # the old version keep it unchanged, and an unchanged save keeps this
+        # plant on it too
+        current = self.trait_maps.intern(self.plant_genetics[plant_name].get('genetic_info') or {})
+        removed = [key for key in current if key not in genetic_info]
+        updated = current.with_changes(genetic_info, removed)
+        if updated is not current:
+            self.plant_genetics[plant_name]['genetic_info'] = self.trait_maps.intern(updated)
+            self.save_genetics_data()
+            self.events.publish(STRAIN_UPDATED, plant_name)
         window.destroy()
         messagebox.showinfo("Success", f"Genetic information for '{plant_name}' has been saved.")
 
@@ -1448,23 +1585,40 @@ class CannabisGeneticsApp:
         # Placeholder for future implementations if needed
         pass
 
+    def match_search_query(self, search_text):
+        """
+        Returns the strain names matching the search box. The box accepts the
+        filter query language (see query.py) as well as plain name searches;
+        a "log:" query matches strains that have matching grow log entries.
+        """
+        try:
+            plan = compile_query(search_text)
+        except QueryError:
+            # Half-typed query, fall back to a plain name search
+            search_term = search_text.lower()
+            return [name for name in self.plant_genetics if search_term in name.lower()]
+
+        if plan.target == "log":
+            strains = strains_with_log_matches(search_text, self.get_grow_log())
+            return [name for name in self.plant_genetics if name in strains]
+        indexes = None
+        if any(field in TRAIT_FIELDS for field, op, value in plan.conjuncts):
+            indexes = self.get_trait_store().query_indexes()
+        return plan.run(self.plant_genetics, indexes, parent_strains=self.parent_strains,
+                        trait_ranges=self.trait_ranges)
+
     def update_search_results(self, *args):
-        search_term = self.search_var.get().lower()
+        self.grid_view = "search"
+        search_text = self.search_var.get().strip()
         selected_parent = self.parent_strain_var.get()
         show_owned_parents = self.show_parents_var.get()
         show_nonowned_parents = self.show_nonowned_parents_var.get()
         
-        # Clear existing buttons
-        for widget in self.genetics_scrollable_frame.scrollable_frame.winfo_children():
-            widget.destroy()
-        
-        # Get all strains that match the search term
+        # Get all strains that match the search query
         filtered_strains = []
         
-        for name, details in self.plant_genetics.items():
-            if search_term and search_term not in name.lower():
-                continue
-                
+        for name in self.match_search_query(search_text):
+            details = self.plant_genetics[name]
             is_parent = name in self.parent_strains
             is_owned = details.get('owned', True)
             
@@ -1481,99 +1635,78 @@ class CannabisGeneticsApp:
             filtered_strains.append(name)
         
         # Display filtered strains
-        columns = 5
-        row = 0
-        column = 0
+        items = []
         for plant_name in sorted(filtered_strains, key=lambda x: x.lower()):
-            ownership_type = self.plant_genetics[plant_name].get('ownership_type', 'None')
-            is_parent = plant_name in self.parent_strains
-            is_owned = self.plant_genetics[plant_name].get('owned', True)
-            
-            # Determine button color
-            if is_parent and is_owned:
-                color = self.legend_colors.get("Owned & Parent Strain", "#32CD32")
-            elif is_parent and not is_owned:
-                color = self.legend_colors.get("Parent Strain", "#FFD700")
-            elif not is_parent and is_owned:
-                if ownership_type == "Seed Start":
-                    color = self.legend_colors.get("Seed Start Strain", "#00FFFF") 
-                elif ownership_type == "Clone":
-                    color = self.legend_colors.get("Clone Strain", "#FF69B4")
-                else:
-                    color = self.legend_colors.get("Owned Strain", "#1E90FF")
-            else:
-                color = self.legend_colors.get("Not Owned Strain", "#A9A9A9")
-                
-            btn = tk.Button(
-                self.genetics_scrollable_frame.scrollable_frame,
-                text=plant_name,
-                width=20,
-                command=lambda p=plant_name: self.show_plant_details(p),
-                bg=color,
-                fg=BACKGROUND_COLOR,
-                font=("Helvetica", 12, "bold"),
-                activebackground=color,
-                activeforeground=BACKGROUND_COLOR
-            )
-            btn.grid(row=row, column=column, padx=5, pady=5, sticky='nsew')
-            
-            column += 1
-            if column >= columns:
-                column = 0
-                row += 1
+            # The role (and so the color) comes from the shared classification cache
+            items.append((plant_name, self.roles.role(plant_name)))
+
+        self.genetics_grid.set_items(items)
 
     def create_clone_in_plants(self, mother_name, clone_name, medium, clone_date):
         """
-        Copies key data from the mother plant, creates a new clone entry,
-        and logs the cloning in the grow log.
+        Creates one clone under a given name; see create_clones for taking
+        several cuts at once with generated names.
+        """
+        return self.create_clones(mother_name, 1, medium, clone_date, clone_names=[clone_name])
+
+    def create_clones(self, mother_name, count, medium, clone_date, notes="", clone_names=None):
+        """
+        Takes `count` cuts from a mother plant: copies key data from the
+        mother into a new record per clone and logs each cloning, with one
+        genetics save, one grow log save and one UI refresh for the batch.
+        Names are allocated with allocate_clone_names unless given.
+        Returns the clone names.
         """
         if mother_name not in self.plant_genetics:
-            return
+            return []
 
         mother_data = self.plant_genetics[mother_name]
-        new_clone_data = {
-            "lineage": mother_data.get('lineage', 'Unknown'),  # Inherit mother's lineage
-            "yield": mother_data.get('yield', 'Unknown'),
-            "flowering_time": mother_data.get('flowering_time', 'Unknown'),
-            "type": mother_data.get('type', 'Unknown'),
-            "gender": mother_data.get('gender', 'Unknown'),
-            "owned": True,
-            "ownership_type": "Clone",
-            "genetic_info": mother_data.get('genetic_info', {}),  # Also inherit genetic info
-            "notes": f"Cloned from {mother_name} on {clone_date}, Medium: {medium}"
-        }
-        
+        if clone_names is None:
+            clone_names, clone_count = allocate_clone_names(self.plant_genetics, mother_name, count)
+        else:
+            clone_count = mother_data.get('clone_count', 0) + len(clone_names)
+
+        log_entries = []
+        for clone_name in clone_names:
+            self.plant_genetics[clone_name] = {
+                "lineage": mother_data.get('lineage', 'Unknown'),  # Inherit mother's lineage
+                "yield": mother_data.get('yield', 'Unknown'),
+                "flowering_time": mother_data.get('flowering_time', 'Unknown'),
+                "type": mother_data.get('type', 'Unknown'),
+                "gender": mother_data.get('gender', 'Unknown'),
+                "owned": True,
+                "ownership_type": "Clone",
+                # The mother's read-only map itself, shared until either plant's traits are edited
+                "genetic_info": self.trait_maps.intern(mother_data.get('genetic_info') or {}),
+                "notes": notes or f"Cloned from {mother_name} on {clone_date}, Medium: {medium}",
+                # The registry finds clones by these, not by lineage, which is the mother's
+                "mother": mother_name,
+                "cut_date": clone_date
+            }
+            log_entries.append({
+                "date": clone_date,
+                "activity_type": "Cloned",
+                "strain": clone_name,
+                "stage": "Clone",
+                "notes": f"Clone created from {mother_name}, Medium: {medium}",
+                "status": "Clone"
+            })
+
         # Update clone count on mother plant
-        mother_data['clone_count'] = mother_data.get('clone_count', 0) + 1
-        
-        # Save the new clone data
-        self.plant_genetics[clone_name] = new_clone_data
+        mother_data['clone_count'] = clone_count
+
+        # One save for all the new records
         self.save_genetics_data()
 
-        # Add a log entry for the cloning
-        if os.path.exists(GROW_LOG_FILE):
-            try:
-                with open(GROW_LOG_FILE, 'r') as file:
-                    grow_log = json.load(file)
-            except json.JSONDecodeError:
-                grow_log = []
-        else:
-            grow_log = []
-            
-        grow_log.append({
-            "date": clone_date,
-            "activity_type": "Cloned",
-            "strain": clone_name,
-            "notes": f"Clone created from {mother_name}, Medium: {medium}",
-            "status": "Clone"
-        })
-        
-        with open(GROW_LOG_FILE, 'w') as file:
-            json.dump(grow_log, file, indent=2)
+        # Log every cut with a single grow log write
+        self.get_grow_log_store().add_many(log_entries)
+        self.save_grow_log(LOG_ENTRY_ADDED, *clone_names)
 
-        # Refresh UI
-        self.update_search_results()
-        self.update_dropdown_options()
+        # Refresh UI once, on the next idle cycle
+        self.events.publish(STRAIN_UPDATED, mother_name)
+        for clone_name in clone_names:
+            self.events.publish(STRAIN_ADDED, clone_name)
+        return clone_names
 
     @staticmethod
     def main():
@@ -1582,4 +1715,5 @@ class CannabisGeneticsApp:
         root.mainloop()
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Needed for the process pool in the PyInstaller build
     CannabisGeneticsApp.main()
\ No newline at end of file
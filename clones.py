@@ -0,0 +1,234 @@
+# clones.py
+import re
+import string
+from log_index import parse_log_date
+from events import STRAIN_ADDED, STRAIN_UPDATED, STRAIN_RENAMED, STRAIN_DELETED, STRAINS_RESET
+
+
+def clone_suffix(clone_count):
+    """
+    Letter suffix for the n-th clone of a mother, counting like spreadsheet
+    columns: 1 -> A, ..., 26 -> Z, 27 -> AA, 28 -> AB, ..., 702 -> ZZ, 703 -> AAA.
+    """
+    letters = []
+    while clone_count > 0:
+        clone_count, remainder = divmod(clone_count - 1, 26)
+        letters.append(string.ascii_uppercase[remainder])
+    return "".join(reversed(letters))
+
+
+def allocate_clone_names(plant_genetics, mother_name, count):
+    """
+    Reserves `count` unused clone names for `mother_name`, continuing from its
+    clone_count and skipping any name already taken (e.g. a plant added by
+    hand), so every name is unique however many cuts are taken at once.
+    Returns (names, new clone_count); the caller stores the count on the mother.
+    """
+    clone_count = plant_genetics[mother_name].get('clone_count', 0)
+    names = []
+    while len(names) < count:
+        clone_count += 1
+        name = f"{mother_name} Clone {clone_suffix(clone_count)}"
+        if name not in plant_genetics:
+            names.append(name)
+    return names, clone_count
+
+
+# Record fields that tie a clone to its mother
+CLONE_FIELDS = ("mother", "cut_date")
+
+# Notes written by create_clones: "Cloned from <mother> on <date>, Medium: <medium>"
+CLONED_FROM_PATTERN = re.compile(r"Cloned from (.+) on (\d{4}-\d{2}-\d{2})")
+
+
+def infer_mother(name, details, plant_genetics):
+    """
+    Works out (mother, cut date) for a clone record saved before clones
+    carried a 'mother' field: from a lineage naming the mother (the add form),
+    the "Cloned from" note, or a "<mother> Clone <suffix>" name. Either part
+    may be None.
+    """
+    if details.get('ownership_type') != 'Clone':
+        return None, None
+    lineage = details.get('lineage', '')
+    if lineage != name and lineage in plant_genetics:
+        return lineage, None
+    match = CLONED_FROM_PATTERN.match(details.get('notes', ''))
+    if match and match.group(1) in plant_genetics:
+        return match.group(1), match.group(2)
+    base, separator, suffix = name.rpartition(" Clone ")
+    if separator and suffix.isalpha() and base in plant_genetics:
+        return base, None
+    return None, None
+
+
+def migrate_clone_records(plant_genetics):
+    """Adds 'mother' (and 'cut_date' when known) to older clone records. Returns the names updated."""
+    updated = []
+    for name, details in plant_genetics.items():
+        if details.get('mother'):
+            continue
+        mother, cut_date = infer_mother(name, details, plant_genetics)
+        if mother is None:
+            continue
+        details['mother'] = mother
+        if cut_date and not details.get('cut_date'):
+            details['cut_date'] = cut_date
+        updated.append(name)
+    return updated
+
+
+class MotherRotation:
+    """One mother's row in the rotation report."""
+
+    __slots__ = ("mother", "living_cuts", "total_cuts", "last_cut", "days_since_cut", "generations")
+
+    def __init__(self, mother, living_cuts, total_cuts, last_cut, days_since_cut, generations):
+        self.mother = mother
+        self.living_cuts = living_cuts
+        self.total_cuts = total_cuts
+        self.last_cut = last_cut              # Day ordinal of the most recent cut, or None
+        self.days_since_cut = days_since_cut  # None when no cut date is known
+        self.generations = generations        # Deepest clone generation below this mother
+
+
+class CloneRegistry:
+    """
+    Mother -> clones, read from each clone record's 'mother' field and kept
+    current from strain events. Answers "which cuts came off this keeper"
+    in time proportional to the clones involved instead of scanning every
+    record, and tracks clone generations (a clone of a clone is generation 2;
+    keepers are generation 0). `source` is a callable returning the plant
+    genetics dict.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.rebuild()
+
+    def rebuild(self):
+        self.children = {}  # mother -> {clone name: None}, in the order cuts were registered
+        self.mothers = {}   # clone name -> mother
+        for name, details in self.source().items():
+            if details.get('mother'):
+                self.link(name, details['mother'])
+
+    def link(self, name, mother):
+        self.mothers[name] = mother
+        self.children.setdefault(mother, {})[name] = None
+
+    def unlink(self, name):
+        mother = self.mothers.pop(name, None)
+        if mother is None:
+            return
+        siblings = self.children.get(mother)
+        if siblings is not None:
+            siblings.pop(name, None)
+            if not siblings:
+                del self.children[mother]
+
+    def update(self, names):
+        """Re-reads the 'mother' field of added, edited or deleted records."""
+        plant_genetics = self.source()
+        for name in names:
+            self.unlink(name)
+            details = plant_genetics.get(name)
+            if details and details.get('mother'):
+                self.link(name, details['mother'])
+
+    def rename(self, old_name, new_name):
+        """Moves a renamed plant's own link; its clones' records are updated through update()."""
+        self.unlink(old_name)
+        children = self.children.pop(old_name, None)
+        if children:
+            self.children[new_name] = children
+            for child in children:
+                self.mothers[child] = new_name
+
+    def apply(self, batch):
+        """Brings the registry up to date with an events.ChangeBatch."""
+        if batch.has(STRAINS_RESET):
+            self.rebuild()
+            return
+        for event in batch:
+            if event.kind == STRAIN_RENAMED:
+                self.rename(event.old_name, event.name)
+        self.update(batch.names(STRAIN_ADDED, STRAIN_UPDATED, STRAIN_RENAMED, STRAIN_DELETED))
+
+    def clones_of(self, mother):
+        """Direct cuts taken from `mother`."""
+        return list(self.children.get(mother, ()))
+
+    def mother_of(self, name):
+        return self.mothers.get(name)
+
+    def keeper_of(self, name):
+        """The original mother at the top of `name`'s clone chain (itself if it isn't a clone)."""
+        seen = {name}
+        while name in self.mothers and self.mothers[name] not in seen:
+            name = self.mothers[name]
+            seen.add(name)
+        return name
+
+    def generation(self, name):
+        """0 for plants that aren't registered clones, 1 for a cut of one, 2 for a cut of a cut..."""
+        generation = 0
+        seen = {name}
+        while name in self.mothers and self.mothers[name] not in seen:
+            name = self.mothers[name]
+            seen.add(name)
+            generation += 1
+        return generation
+
+    def descendants(self, mother):
+        """Every clone below `mother`, cuts of cuts included, as (name, generation below mother)."""
+        found = []
+        seen = {mother}
+        frontier = [(mother, 0)]
+        while frontier:
+            parent, depth = frontier.pop()
+            for child in self.children.get(parent, ()):
+                if child not in seen:
+                    seen.add(child)
+                    found.append((child, depth + 1))
+                    frontier.append((child, depth + 1))
+        return found
+
+    def living_cuts(self, mother, is_alive, include_descendants=True):
+        """Names of the cuts from `mother` for which is_alive(name) holds."""
+        if include_descendants:
+            names = [name for name, depth in self.descendants(mother)]
+        else:
+            names = self.clones_of(mother)
+        return [name for name in names if is_alive(name)]
+
+    def rotation_report(self, is_alive, today):
+        """
+        A MotherRotation per plant that has had cuts taken, mothers rested
+        longest (or never dated) first, so it is clear which keepers are due.
+        `today` is a day ordinal.
+        """
+        plant_genetics = self.source()
+        rows = []
+        for mother in self.children:
+            if mother in self.mothers:
+                continue  # Cuts of cuts are counted under their keeper
+            descendants = self.descendants(mother)
+            last_cut = None
+            for name, depth in descendants:
+                cut_date = plant_genetics.get(name, {}).get('cut_date')
+                try:
+                    cut_day = parse_log_date(cut_date)[0]
+                except ValueError:
+                    continue
+                if last_cut is None or cut_day > last_cut:
+                    last_cut = cut_day
+            rows.append(MotherRotation(
+                mother,
+                sum(1 for name, depth in descendants if is_alive(name)),
+                len(descendants),
+                last_cut,
+                None if last_cut is None else today - last_cut,
+                max((depth for name, depth in descendants), default=0)))
+        rows.sort(key=lambda row: (row.days_since_cut is not None, -(row.days_since_cut or 0), row.mother))
+        return rows
@@ -24,3 +24,303 @@ class ScrollableFrame(ttk.Frame):
 
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
+
+class VirtualGrid(ttk.Frame):
+    """
+    A scrollable grid that only creates widgets for the rows in view (plus a
+    small buffer) and recycles them as the user scrolls. The caller supplies
+    make_cell(parent) to build one cell widget and bind_cell(widget, item) to
+    point a cell at an item; changing what is shown is just set_items().
+    """
+
+    def __init__(self, container, columns=5, row_height=42, buffer_rows=2,
+                 make_cell=None, bind_cell=None):
+        super().__init__(container)
+        self.columns = columns
+        self.row_height = row_height
+        self.buffer_rows = buffer_rows
+        self.make_cell = make_cell
+        self.bind_cell = bind_cell
+
+        self.items = []
+        self.cells = []
+        self.bound = []  # (cell, item) pairs currently placed
+        self.offset = 0  # Pixels scrolled from the top
+
+        self.viewport = tk.Frame(self, bg=BACKGROUND_COLOR)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+
+        self.viewport.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.viewport.bind("<Configure>", lambda e: self.refresh())
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.viewport.bind(sequence, self.on_mousewheel)
+
+    def set_items(self, items):
+        """Replace the backing list and redraw only the visible cells."""
+        self.items = list(items)
+        self.offset = min(self.offset, self.max_offset())
+        self.refresh()
+
+    def row_count(self):
+        return (len(self.items) + self.columns - 1) // self.columns
+
+    def max_offset(self):
+        content_height = self.row_count() * self.row_height
+        return max(0, content_height - self.viewport.winfo_height())
+
+    def ensure_pool(self, size):
+        """Grow the widget pool to `size` cells; cells are never destroyed."""
+        while len(self.cells) < size:
+            cell = self.make_cell(self.viewport)
+            for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+                cell.bind(sequence, self.on_mousewheel)
+            self.cells.append(cell)
+
+    def refresh(self):
+        height = max(self.viewport.winfo_height(), self.row_height)
+        visible_rows = height // self.row_height + 1
+        first_row = max(0, self.offset // self.row_height - self.buffer_rows)
+        last_row = min(self.row_count(), self.offset // self.row_height + visible_rows + self.buffer_rows)
+
+        self.ensure_pool((visible_rows + 2 * self.buffer_rows) * self.columns)
+
+        slot = 0
+        self.bound = []
+        for row in range(first_row, last_row):
+            y = row * self.row_height - self.offset
+            for column in range(self.columns):
+                index = row * self.columns + column
+                if index >= len(self.items):
+                    break
+                cell = self.cells[slot]
+                self.bind_cell(cell, self.items[index])
+                self.bound.append((cell, self.items[index]))
+                cell.place(relx=column / self.columns, y=y, relwidth=1 / self.columns,
+                           height=self.row_height - 6)
+                slot += 1
+
+        # Park unused cells off-screen without destroying them
+        for cell in self.cells[slot:]:
+            cell.place_forget()
+
+        self.update_scrollbar()
+
+    def visible_cells(self):
+        """Returns (cell, item) for every cell currently bound to an item."""
+        return list(self.bound)
+
+    def update_scrollbar(self):
+        content_height = self.row_count() * self.row_height
+        if content_height <= 0:
+            self.scrollbar.set(0, 1)
+            return
+        height = self.viewport.winfo_height()
+        self.scrollbar.set(self.offset / content_height,
+                           min(1.0, (self.offset + height) / content_height))
+
+    def scroll_to(self, offset):
+        offset = int(max(0, min(offset, self.max_offset())))
+        if offset != self.offset:
+            self.offset = offset
+            self.refresh()
+
+    def yview(self, *args):
+        """Scrollbar command: handles 'moveto' and 'scroll' like Canvas.yview."""
+        if not args:
+            return
+        if args[0] == "moveto":
+            self.scroll_to(float(args[1]) * self.row_count() * self.row_height)
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            step = self.viewport.winfo_height() if args[2] == "pages" else self.row_height
+            self.scroll_to(self.offset + amount * step)
+
+    def on_mousewheel(self, event):
+        if event.num == 4 or getattr(event, 'delta', 0) > 0:
+            self.yview("scroll", -1, "units")
+        else:
+            self.yview("scroll", 1, "units")
+
+class PagedTreeview(ttk.Frame):
+    """
+    A Treeview backed by a plain list of rows. Rows are inserted one page at a
+    time as the user scrolls towards either end of what is loaded, and at most
+    `max_pages` pages are kept: pages falling out of that window are deleted,
+    so a long history only ever costs a few pages of Tk items however far the
+    user scrolls.
+    """
+
+    def __init__(self, container, columns, row_values, page_size=100, max_pages=5, on_activate=None):
+        super().__init__(container)
+        self.row_values = row_values
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.on_activate = on_activate
+
+        self.rows = []
+        self.first = 0   # Index of the first loaded row, always at a page boundary
+        self.loaded = 0  # One past the last loaded row
+        self.loading = False
+
+        self.tree = ttk.Treeview(self, columns=columns, show='headings')
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=150)
+
+        self.scrollbar = ttk.Scrollbar(self, orient='vertical', command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.on_scroll)
+
+        self.scrollbar.pack(side='right', fill='y')
+        self.tree.pack(side='left', fill='both', expand=True)
+
+        if on_activate:
+            self.tree.bind('<Double-1>', self.on_double_click)
+
+    def set_rows(self, rows):
+        """Replace the backing rows and materialize only the first page."""
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
+        self.rows = rows
+        self.first = 0
+        self.loaded = 0
+        self.load_next_page()
+
+    def top_row(self):
+        """Index in `rows` of the row at the top of the view."""
+        return self.first + int(round(self.tree.yview()[0] * (self.loaded - self.first)))
+
+    def restore_view(self, top):
+        """Scroll back to row `top` after rows were added or deleted above it."""
+        if self.loaded > self.first:
+            self.tree.yview_moveto((top - self.first) / (self.loaded - self.first))
+
+    def unload(self, start, end):
+        self.tree.delete(*[str(index) for index in range(start, end)])
+
+    def load_next_page(self):
+        self.loading = False
+        end = min(self.loaded + self.page_size, len(self.rows))
+        for index in range(self.loaded, end):
+            self.tree.insert('', 'end', iid=str(index), values=self.row_values(self.rows[index]))
+        self.loaded = end
+        if self.loaded - self.first > self.max_pages * self.page_size:
+            top = self.top_row()
+            self.unload(self.first, self.first + self.page_size)
+            self.first += self.page_size
+            self.restore_view(top)
+
+    def load_previous_page(self):
+        self.loading = False
+        if self.first == 0:
+            return
+        top = self.top_row()
+        start = self.first - self.page_size
+        for position, index in enumerate(range(start, self.first)):
+            self.tree.insert('', position, iid=str(index), values=self.row_values(self.rows[index]))
+        self.first = start
+        if self.loaded - self.first > self.max_pages * self.page_size:
+            # Drop the last page, which may be a short one at the end of the rows
+            end = (self.loaded - 1) // self.page_size * self.page_size
+            self.unload(end, self.loaded)
+            self.loaded = end
+        self.restore_view(top)
+
+    def on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if self.loading:
+            return
+        # Fetch a page once the user is close to either end of what is loaded
+        if float(last) > 0.9 and self.loaded < len(self.rows):
+            self.loading = True
+            self.after_idle(self.load_next_page)
+        elif float(first) < 0.1 and self.first > 0:
+            self.loading = True
+            self.after_idle(self.load_previous_page)
+
+    def row_for(self, iid):
+        return self.rows[int(iid)]
+
+    def selected_row(self):
+        selection = self.tree.selection()
+        if not selection:
+            return None
+        return self.row_for(selection[0])
+
+    def on_double_click(self, event):
+        row = self.selected_row()
+        if row is not None:
+            self.on_activate(row)
+
+class StrainPicker(ttk.Combobox):
+    """
+    A type-ahead strain selector. The drop-down list is filled lazily from a
+    StrainNameIndex with the top matches for whatever has been typed, so the
+    widget holds at most `max_results` entries however large the collection
+    is, and nothing needs rebuilding when strains are added or removed.
+    `extra_options` (e.g. "All Parents") are always offered first.
+    """
+
+    NAVIGATION_KEYS = {"Up", "Down", "Left", "Right", "Return", "Escape", "Tab", "Home", "End"}
+
+    def __init__(self, container, name_index, textvariable=None, command=None,
+                 max_results=25, extra_options=(), **kwargs):
+        super().__init__(container, textvariable=textvariable, postcommand=self.populate, **kwargs)
+        self.name_index = name_index
+        self.command = command
+        self.max_results = max_results
+        self.extra_options = list(extra_options)
+
+        self.bind('<KeyRelease>', self.on_key_release)
+        self.bind('<<ComboboxSelected>>', self.on_selected)
+        self.bind('<Return>', self.on_return)
+
+    def populate(self):
+        text = self.get()
+        if text in self.extra_options or text in self.name_index:
+            text = ''  # Show the full top of the list when a value is already chosen
+        options = [option for option in self.extra_options if text.lower() in option.lower()]
+        options += self.name_index.search(text, self.max_results)
+        self.configure(values=options)
+
+    def on_key_release(self, event):
+        if event.keysym not in self.NAVIGATION_KEYS:
+            self.populate()
+
+    def on_selected(self, event=None):
+        if self.command:
+            self.command(self.get())
+
+    def on_return(self, event=None):
+        text = self.get()
+        if text not in self.extra_options:
+            match = self.name_index.best_match(text)
+            if match is None:
+                return
+            self.set(match)
+        self.on_selected()
+
+class BusyIndicator(tk.Frame):
+    """
+    A slim status bar with an indeterminate progress bar that runs while
+    background work is pending. Pass set_busy as a BackgroundExecutor's
+    busy_callback.
+    """
+    def __init__(self, container, text="Working..."):
+        super().__init__(container, bg=BACKGROUND_COLOR)
+        self.text = text
+        self.label = tk.Label(self, text="", bg=BACKGROUND_COLOR, fg="black", font=("Helvetica", 10))
+        self.label.pack(side='left', padx=5)
+        self.progress = ttk.Progressbar(self, mode='indeterminate', length=120)
+
+    def set_busy(self, busy):
+        if busy:
+            self.label.configure(text=self.text)
+            self.progress.pack(side='right', padx=5, pady=2)
+            self.progress.start(15)
+        else:
+            self.progress.stop()
+            self.progress.pack_forget()
+            self.label.configure(text="")
@@ -20,3 +20,9 @@ BACKGROUND_COLOR = "white"
 TEXT_COLOR = "black"
 BUTTON_FG_COLOR = "black"
 BUTTON_BG_COLOR = "white"
+
+# Startup Budget (seconds from import to first paint), enforced by benchmark_startup.py
+STARTUP_BUDGET_SECONDS = 1.5
+
+# Number of rendered lineage trees kept in memory
+LINEAGE_CACHE_SIZE = 16
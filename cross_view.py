@@ -0,0 +1,179 @@
+# cross_view.py
+import tkinter as tk
+from tkinter import ttk, messagebox, Toplevel
+from traits import TRAIT_SCHEMA, CATEGORICAL
+
+GOAL_CHOICES = ("Maximize", "Minimize", "Target")
+GOAL_ROWS = 3
+NO_TRAIT = ""
+
+# Trait label -> column name for the numeric traits a goal can be set on
+GOAL_TRAITS = {column.label: column.name for column in TRAIT_SCHEMA if column.kind != CATEGORICAL}
+TRAIT_LABELS = {name: label for label, name in GOAL_TRAITS.items()}
+
+
+class CrossRecommenderWindow:
+    """
+    Ranks every cross between the owned females and the males for a set of
+    trait goals, using the app's CrossRecommender (see crosses.py). Blocks of
+    females are scored on the app's process pool, so the window stays
+    responsive; double-clicking a cross opens it in the breeding planner.
+    """
+
+    def __init__(self, parent, app, background="white", foreground="black"):
+        from crosses import DEFAULT_TOP_K, DEFAULT_INBREEDING_PENALTY
+
+        self.app = app
+        self.tokens = []
+        self.results = []
+
+        self.top = Toplevel(parent)
+        self.top.title("Recommend Crosses")
+        self.top.geometry("900x600")
+        self.top.configure(bg=background)
+        self.top.protocol("WM_DELETE_WINDOW", self.close)
+
+        goals_frame = tk.Frame(self.top, bg=background)
+        goals_frame.pack(fill='x', padx=10, pady=5)
+        for col, heading in enumerate(("Trait", "Goal", "Target", "Weight")):
+            tk.Label(goals_frame, text=heading, bg=background, fg=foreground,
+                     font=("Helvetica", 11, "bold")).grid(row=0, column=col, padx=5)
+        self.goal_rows = []
+        for row in range(1, GOAL_ROWS + 1):
+            trait_var = tk.StringVar(value="THC %" if row == 1 else NO_TRAIT)
+            goal_var = tk.StringVar(value=GOAL_CHOICES[0])
+            target_var = tk.StringVar()
+            weight_var = tk.StringVar(value="1")
+            ttk.Combobox(goals_frame, textvariable=trait_var, values=[NO_TRAIT] + list(GOAL_TRAITS),
+                         state='readonly', width=18).grid(row=row, column=0, padx=5, pady=2)
+            ttk.Combobox(goals_frame, textvariable=goal_var, values=GOAL_CHOICES,
+                         state='readonly', width=10).grid(row=row, column=1, padx=5, pady=2)
+            tk.Entry(goals_frame, textvariable=target_var, width=8).grid(row=row, column=2, padx=5, pady=2)
+            tk.Entry(goals_frame, textvariable=weight_var, width=6).grid(row=row, column=3, padx=5, pady=2)
+            self.goal_rows.append((trait_var, goal_var, target_var, weight_var))
+
+        options = tk.Frame(self.top, bg=background)
+        options.pack(fill='x', padx=10, pady=5)
+        tk.Label(options, text="Inbreeding penalty:", bg=background, fg=foreground).pack(side='left')
+        self.penalty_var = tk.StringVar(value=str(DEFAULT_INBREEDING_PENALTY))
+        tk.Entry(options, textvariable=self.penalty_var, width=6).pack(side='left', padx=5)
+        tk.Label(options, text="Show top:", bg=background, fg=foreground).pack(side='left')
+        self.count_var = tk.IntVar(value=DEFAULT_TOP_K)
+        tk.Spinbox(options, from_=1, to=500, textvariable=self.count_var, width=5).pack(side='left', padx=5)
+        self.owned_males_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(options, text="Owned males only", variable=self.owned_males_var,
+                       bg=background, fg=foreground).pack(side='left', padx=5)
+        tk.Button(options, text="Find Crosses", command=self.run, bg="white", fg="black",
+                  font=("Helvetica", 12, "bold")).pack(side='left', padx=10)
+
+        self.status_label = tk.Label(self.top, text="", bg=background, fg=foreground, anchor='w')
+        self.status_label.pack(fill='x', padx=10)
+
+        columns = ('Female', 'Male', 'Score', 'Inbreeding', 'Expected Offspring')
+        self.tree = ttk.Treeview(self.top, columns=columns, show='headings')
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=300 if col == 'Expected Offspring' else 130)
+        self.tree.pack(fill='both', expand=True, padx=10, pady=10)
+        self.tree.bind('<Double-1>', self.on_activate)
+
+    def read_objective(self):
+        from crosses import CrossObjective, MAXIMIZE, MINIMIZE
+
+        goals, weights = {}, {}
+        for trait_var, goal_var, target_var, weight_var in self.goal_rows:
+            if trait_var.get() == NO_TRAIT:
+                continue
+            trait = GOAL_TRAITS[trait_var.get()]
+            try:
+                weights[trait] = float(weight_var.get())
+                if goal_var.get() == "Target":
+                    goals[trait] = float(target_var.get())
+                else:
+                    goals[trait] = MAXIMIZE if goal_var.get() == "Maximize" else MINIMIZE
+            except ValueError:
+                raise ValueError(f"Please enter numbers for the {trait_var.get()} target and weight.")
+        if not goals:
+            raise ValueError("Please choose at least one trait goal.")
+        try:
+            penalty = float(self.penalty_var.get())
+        except ValueError:
+            raise ValueError("The inbreeding penalty must be a number.")
+        return CrossObjective(goals, weights, penalty)
+
+    def run(self):
+        from crosses import CrossRanking, score_block
+
+        try:
+            objective = self.read_objective()
+            k = max(1, int(self.count_var.get()))
+        except (ValueError, tk.TclError) as e:
+            messagebox.showwarning("Invalid Objective", str(e), parent=self.top)
+            return
+
+        recommender = self.app.get_cross_recommender()
+        females, males = recommender.candidates(self.owned_males_var.get(), self.app.is_living_plant)
+        if not females or not males:
+            messagebox.showinfo("No Candidates", "Crosses need at least one owned, living female and one male.",
+                                parent=self.top)
+            return
+        problem, context = recommender.prepare(objective, females, males)
+        ranking = CrossRanking(problem, k)
+        total = len(females) * len(males)
+
+        self.cancel()
+        self.status_label.config(text=f"Scoring up to {total:,} crosses...")
+
+        def finish():
+            self.results = recommender.describe(context, objective, ranking.best)
+            self.show_results()
+            self.status_label.config(text=f"{len(females)} females x {len(males)} males: "
+                                          f"scored {ranking.scored:,} of {total:,} crosses, the rest were pruned.")
+
+        def on_first(result):
+            ranking.add(result)
+            blocks = ranking.remaining_blocks()
+            if not blocks:
+                finish()
+                return
+            pending = [len(blocks)]
+
+            def on_block(result):
+                ranking.add(result)
+                pending[0] -= 1
+                if pending[0] == 0:
+                    finish()
+
+            self.tokens = [self.app.executor.submit_cpu(score_block, problem, start, end, k, ranking.threshold,
+                                                        on_done=on_block, on_error=self.on_error)
+                           for start, end in blocks]
+
+        self.tokens = [self.app.executor.submit_cpu(score_block, problem, *ranking.first_block(), k,
+                                                    on_done=on_first, on_error=self.on_error)]
+
+    def show_results(self):
+        self.tree.delete(*self.tree.get_children())
+        for index, cross in enumerate(self.results):
+            expected = ", ".join(f"{TRAIT_LABELS[trait]} {value:.1f}" for trait, value in cross.predicted.items())
+            self.tree.insert('', 'end', iid=str(index), values=(
+                cross.female, cross.male, f"{cross.score:.3f}", f"{cross.coancestry:.1%}", expected))
+
+    def on_error(self, e):
+        self.cancel()
+        self.status_label.config(text="")
+        messagebox.showerror("Error", f"Failed to score crosses.\n{e}", parent=self.top)
+
+    def on_activate(self, event=None):
+        selection = self.tree.selection()
+        if selection:
+            cross = self.results[int(selection[0])]
+            self.app.show_breeding_planner(cross.female, cross.male)
+
+    def cancel(self):
+        for token in self.tokens:
+            token.cancel()
+        self.tokens = []
+
+    def close(self):
+        self.cancel()
+        self.top.destroy()
@@ -0,0 +1,342 @@
+# crosses.py
+"""
+Ranks every possible cross between the owned females and the males against
+a trait objective and returns the best K. A cross scores the weighted,
+standardized traits its offspring are expected to have (the midparent of the
+parents' estimated genetic values, see breeding.py) minus a penalty for
+inbreeding. Inbreeding for a whole block of pairs comes from one matrix
+product over the pedigree (A = T D T'). Blocks of females are scored in a
+process pool, and pairs whose upper bound can't reach the current top K are
+never scored. Imported on first use, like the trait store.
+"""
+import heapq
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from breeding import BreedingPlanner, Pedigree, heritability_of
+
+MAXIMIZE = "max"
+MINIMIZE = "min"
+
+DEFAULT_TOP_K = 25
+DEFAULT_INBREEDING_PENALTY = 4.0  # Score lost per unit of coancestry: full siblings (0.25) cost one SD
+
+# Females per scoring step inside a block, and per block sent to a worker
+FEMALE_BATCH = 64
+FEMALES_PER_BLOCK = 256
+
+# Below this many pairs a process pool costs more than it saves
+PARALLEL_MIN_PAIRS = 20000
+
+
+class CrossObjective:
+    """
+    What a good cross looks like. `goals` maps trait columns to MAXIMIZE,
+    MINIMIZE or a target value; `weights` scales each goal (default 1).
+    Traits are compared in population standard deviations, so weights are
+    comparable across units.
+    """
+
+    def __init__(self, goals, weights=None, inbreeding_penalty=DEFAULT_INBREEDING_PENALTY):
+        if not goals:
+            raise ValueError("A cross objective needs at least one trait goal")
+        self.goals = dict(goals)
+        self.weights = {trait: (weights or {}).get(trait, 1.0) for trait in self.goals}
+        self.inbreeding_penalty = inbreeding_penalty
+
+    def __repr__(self):
+        return f"CrossObjective({self.goals!r}, penalty={self.inbreeding_penalty})"
+
+
+class CrossRecommendation:
+    """One ranked cross."""
+
+    __slots__ = ("female", "male", "score", "coancestry", "predicted")
+
+    def __init__(self, female, male, score, coancestry, predicted):
+        self.female = female
+        self.male = male
+        self.score = score
+        self.coancestry = coancestry  # Expected inbreeding of the offspring
+        self.predicted = predicted    # {trait: expected offspring value}
+
+    def __repr__(self):
+        return f"CrossRecommendation({self.female!r} x {self.male!r}, score={self.score:.3f})"
+
+
+def relationship_factors(first, second, pedigree):
+    """
+    Henderson's decomposition of the additive relationship matrix, A = T D T'.
+    Returns the T rows of the `first` and `second` plants and D, restricted
+    to the ancestors both groups share (no other column can add to a
+    first x second coancestry, and dropping them keeps the arrays small).
+    The coancestry of two plants is then (T_i * D) . T_j / 2, so a block of
+    pairs is one matrix product.
+    """
+    order = []
+    seen = set()
+
+    def visit(name, path):
+        if name in seen or name in path:
+            return  # Already placed, or a loop in hand-entered lineages
+        path.add(name)
+        for parent in pedigree.parents(name):
+            visit(parent, path)
+        path.discard(name)
+        seen.add(name)
+        order.append(name)  # Parents always come before their offspring
+
+    for name in first + second:
+        visit(pedigree.keeper_of(name), set())
+
+    position = {name: index for index, name in enumerate(order)}
+    contributions = {}  # name -> {ancestor position: expected share of genes}
+    inbreeding = {}
+    within_family = np.ones(len(order))
+    for index, name in enumerate(order):
+        parents = [parent for parent in pedigree.parents(name) if parent in position]
+        row = {index: 1.0}
+        if len(parents) == 2:
+            for parent in parents:
+                for ancestor, share in contributions[parent].items():
+                    row[ancestor] = row.get(ancestor, 0.0) + 0.5 * share
+            within_family[index] = 0.5 - 0.25 * (inbreeding[parents[0]] + inbreeding[parents[1]])
+        contributions[name] = row
+        inbreeding[name] = sum(share * share * within_family[ancestor] for ancestor, share in row.items()) - 1.0
+
+    first_rows = [contributions[pedigree.keeper_of(name)] for name in first]
+    second_rows = [contributions[pedigree.keeper_of(name)] for name in second]
+    shared = sorted(set().union(*first_rows) & set().union(*second_rows)) if first_rows and second_rows else []
+    column = {ancestor: i for i, ancestor in enumerate(shared)}
+
+    def dense(rows):
+        factors = np.zeros((len(rows), len(shared)))
+        for i, row in enumerate(rows):
+            for ancestor, share in row.items():
+                if ancestor in column:
+                    factors[i, column[ancestor]] = share
+        return factors
+
+    return dense(first_rows), dense(second_rows), within_family[shared]
+
+
+def score_pairs(problem, female_rows, male_count):
+    """Exact scores (and coancestries) of `female_rows` crossed with the first `male_count` males."""
+    linear = (problem["female_linear"][female_rows][:, None] + problem["male_linear"][None, :male_count]) / 2
+    coancestry = (problem["female_factors"][female_rows] * problem["within_family"]) @ problem["male_factors"][:male_count].T / 2
+    score = linear - problem["inbreeding_penalty"] * coancestry
+    if problem["target_weights"].size:
+        midparent = (problem["female_targets"][female_rows][:, None, :] + problem["male_targets"][None, :male_count, :]) / 2
+        score -= np.abs(midparent - problem["targets"]) @ problem["target_weights"]
+    return score, coancestry
+
+
+def score_block(problem, female_start, female_end, k, threshold=-np.inf):
+    """
+    Top-k crosses for females [female_start, female_end) of a prepared
+    problem, as [(score, female index, male index, coancestry)], best first,
+    plus the number of pairs actually scored. Females and males arrive sorted
+    by their separable score, whose pair average bounds every cross from
+    above (target and inbreeding terms can only lower it), so whole ranges
+    of pairs are skipped once they can't beat the k-th best. Module-level so
+    it can run in a worker process.
+    """
+    female_linear = problem["female_linear"]
+    male_linear = problem["male_linear"]
+    best = []  # Min-heap of (score, female, male, coancestry)
+    scored = 0
+    for start in range(female_start, female_end, FEMALE_BATCH):
+        rows = np.arange(start, min(start + FEMALE_BATCH, female_end))
+        if len(best) == k:
+            threshold = max(threshold, best[0][0])
+        if not len(male_linear) or (female_linear[rows[0]] + male_linear[0]) / 2 < threshold:
+            break  # Females are sorted: no later batch can do better
+        # Males worth scoring for each female: those with a pair bound >= threshold
+        limits = np.searchsorted(-male_linear, -(2 * threshold - female_linear[rows]), side="right")
+        male_count = int(limits.max())
+        if male_count == 0:
+            continue
+        score, coancestry = score_pairs(problem, rows, male_count)
+        score[np.arange(male_count)[None, :] >= limits[:, None]] = -np.inf
+        scored += int(limits.sum())
+        # Only this batch's own top k can enter the overall top k
+        flat = score.ravel()
+        take = min(k, flat.size)
+        for position in np.argpartition(-flat, take - 1)[:take]:
+            value = flat[position]
+            if not np.isfinite(value):
+                continue
+            female, male = divmod(int(position), male_count)
+            entry = (float(value), int(rows[female]), male, float(coancestry[female, male]))
+            if len(best) < k:
+                heapq.heappush(best, entry)
+            elif entry > best[0]:
+                heapq.heapreplace(best, entry)
+    return sorted(best, reverse=True), scored
+
+
+class CrossRecommender:
+    """
+    Builds cross-ranking problems from the apps' data: owned females and
+    males by `gender` and `owned`, genetic values from a BreedingPlanner,
+    and the pedigree from the lineage graph. Clones of one keeper are the
+    same genotype, so each keeper is considered once.
+    """
+
+    def __init__(self, store, plant_genetics, lineage_of, keeper_of=None):
+        self.plant_genetics = plant_genetics  # Callable returning the plant genetics dict
+        self.planner = BreedingPlanner(store, lineage_of, keeper_of)
+        self.keeper_of = keeper_of or (lambda name: name)
+
+    def candidates(self, owned_males_only=False, is_alive=None):
+        """(females, males): one name per genotype, owned females and (owned) males."""
+        females, males = {}, {}
+        for name, details in self.plant_genetics().items():
+            gender = details.get('gender')
+            owned = details.get('owned', True)
+            if gender == 'Female' and owned:
+                pool = females
+            elif gender == 'Male' and (owned or not owned_males_only):
+                pool = males
+            else:
+                continue
+            if is_alive is not None and owned and not is_alive(name):
+                continue
+            keeper = self.keeper_of(name)
+            # Prefer the keeper's own name when it qualifies, else its first clone
+            if keeper not in pool or name == keeper:
+                pool[keeper] = name
+        return list(females.values()), list(males.values())
+
+    def prepare(self, objective, females, males):
+        """
+        The plain-array problem score_block works on (picklable, so it can
+        go to worker processes), with females and males sorted by their
+        separable score.
+        """
+        columns = self.planner.columns
+        for trait in objective.goals:
+            if trait not in columns:
+                raise ValueError(f"Unknown trait {trait!r}")
+        heritability = np.array([heritability_of(column) for column in columns])
+        mean, std = self.planner.population()
+        mean = np.nan_to_num(mean)
+        std = np.where(np.isnan(std) | (std == 0), 1.0, std)
+        pedigree = Pedigree(self.planner.lineage_of, self.keeper_of)
+        memo = {}
+
+        def standardized(names):
+            values = np.array([self.planner.genetic_values(name, pedigree, mean, heritability, memo)
+                               for name in names]).reshape(len(names), len(columns))
+            # Nothing known about a trait: assume an average plant
+            return np.where(np.isnan(values), 0.0, (values - mean) / std)
+
+        female_z, male_z = standardized(females), standardized(males)
+
+        direction = np.zeros(len(columns))
+        target_columns, targets, target_weights = [], [], []
+        for trait, goal in objective.goals.items():
+            index = columns.index(trait)
+            weight = objective.weights[trait]
+            if goal == MAXIMIZE:
+                direction[index] += weight
+            elif goal == MINIMIZE:
+                direction[index] -= weight
+            else:
+                target_columns.append(index)
+                targets.append((float(goal) - mean[index]) / std[index])
+                target_weights.append(weight)
+
+        female_linear, male_linear = female_z @ direction, male_z @ direction
+        female_order = np.argsort(-female_linear, kind="stable")
+        male_order = np.argsort(-male_linear, kind="stable")
+        females = [females[i] for i in female_order]
+        males = [males[i] for i in male_order]
+        female_factors, male_factors, within_family = relationship_factors(females, males, pedigree)
+
+        problem = {
+            "female_linear": female_linear[female_order],
+            "male_linear": male_linear[male_order],
+            "female_targets": female_z[female_order][:, target_columns],
+            "male_targets": male_z[male_order][:, target_columns],
+            "targets": np.array(targets),
+            "target_weights": np.array(target_weights),
+            "female_factors": female_factors,
+            "male_factors": male_factors,
+            "within_family": within_family,
+            "inbreeding_penalty": objective.inbreeding_penalty,
+        }
+        context = {"females": females, "males": males, "mean": mean, "std": std,
+                   "female_z": female_z[female_order], "male_z": male_z[male_order], "columns": columns}
+        return problem, context
+
+    def describe(self, context, objective, entries):
+        """CrossRecommendations from score_block entries."""
+        columns = context["columns"]
+        recommendations = []
+        for score, female, male, coancestry in entries:
+            midparent = (context["female_z"][female] + context["male_z"][male]) / 2 * context["std"] + context["mean"]
+            predicted = {trait: float(midparent[columns.index(trait)]) for trait in objective.goals}
+            recommendations.append(CrossRecommendation(context["females"][female], context["males"][male],
+                                                       score, coancestry, predicted))
+        return recommendations
+
+    def recommend(self, objective, k=DEFAULT_TOP_K, owned_males_only=False, is_alive=None, workers=None):
+        """
+        The top `k` crosses for `objective`, best first, with the number of
+        pairs scored and the number possible. What is left after the first
+        block's pruning is scored in a process pool when it is large enough.
+        """
+        females, males = self.candidates(owned_males_only, is_alive)
+        if not females or not males:
+            return [], 0, 0
+        problem, context = self.prepare(objective, females, males)
+        ranking = CrossRanking(problem, k)
+        ranking.add(score_block(problem, *ranking.first_block(), k))
+        blocks = ranking.remaining_blocks()
+        if ranking.remaining_pairs(blocks) >= PARALLEL_MIN_PAIRS and len(blocks) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(score_block, problem, start, end, k, ranking.threshold)
+                           for start, end in blocks]
+                for future in futures:
+                    ranking.add(future.result())
+        else:
+            for start, end in blocks:
+                ranking.add(score_block(problem, start, end, k, ranking.threshold))
+        return self.describe(context, objective, ranking.best), ranking.scored, len(females) * len(males)
+
+
+class CrossRanking:
+    """
+    Runs a prepared problem through score_block in two rounds: the block of
+    best-looking females alone, to set the bar, then every other block whose
+    bound can still beat it. Blocks can be scored anywhere (in process, a
+    ProcessPoolExecutor, the apps' BackgroundExecutor) and added in any order.
+    """
+
+    def __init__(self, problem, k):
+        self.problem = problem
+        self.k = k
+        self.best = []
+        self.scored = 0
+        self.threshold = -np.inf
+        count = len(problem["female_linear"])
+        self.blocks = [(start, min(start + FEMALES_PER_BLOCK, count)) for start in range(0, count, FEMALES_PER_BLOCK)]
+
+    def first_block(self):
+        return self.blocks[0]
+
+    def add(self, result):
+        best, scored = result
+        self.best = heapq.nlargest(self.k, self.best + best)
+        self.scored += scored
+        if len(self.best) == self.k:
+            self.threshold = max(self.threshold, self.best[-1][0])
+
+    def remaining_blocks(self):
+        """Blocks after the first whose best pair bound reaches the current k-th score."""
+        female_linear, male_linear = self.problem["female_linear"], self.problem["male_linear"]
+        return [(start, end) for start, end in self.blocks[1:]
+                if (female_linear[start] + male_linear[0]) / 2 >= self.threshold]
+
+    def remaining_pairs(self, blocks):
+        return sum(end - start for start, end in blocks) * len(self.problem["male_linear"])
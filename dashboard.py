@@ -0,0 +1,115 @@
+# dashboard.py
+import tkinter as tk
+from tkinter import Toplevel
+from datetime import date
+from components import PagedTreeview
+from pheno_hunt import HUNT_METRICS
+from events import LOG_EVENTS, STRAIN_EVENTS
+
+
+def format_day(ordinal):
+    return date.fromordinal(ordinal).strftime('%Y-%m-%d')
+
+
+def format_harvest_window(window):
+    """"2025-03-01" for a single day, "2025-03-01 to 2025-03-08" for a range."""
+    if window is None:
+        return ""
+    start, end = window
+    if start == end:
+        return start.strftime('%Y-%m-%d')
+    return f"{start.strftime('%Y-%m-%d')} to {end.strftime('%Y-%m-%d')}"
+
+
+class StageDashboard:
+    """
+    Room overview: every active plant's current stage, how long it has been
+    in it and when it should be ready, from the app's StageTimelineEngine.
+    Double-clicking a row opens the plant's details.
+    """
+
+    COLUMNS = ('Strain', 'Stage', 'Stage Since', 'Days in Stage', 'Harvest Window', 'Last Entry')
+
+    def __init__(self, parent, app, background="white", foreground="black"):
+        self.parent = parent
+        self.app = app
+        self.background = background
+
+        top_frame = tk.Frame(parent, bg=background)
+        top_frame.pack(fill='x', padx=10, pady=5)
+
+        self.summary_label = tk.Label(top_frame, text="", bg=background, fg=foreground,
+                                      font=("Helvetica", 12, "bold"))
+        self.summary_label.pack(side='left')
+
+        tk.Button(top_frame, text="Refresh", command=self.refresh,
+                  bg="white", fg="black").pack(side='right', padx=5)
+        tk.Button(top_frame, text="Mother Rotation", command=self.show_rotation_report,
+                  bg="white", fg="black").pack(side='right', padx=5)
+        tk.Button(top_frame, text="Pheno Hunts", command=self.show_pheno_hunt_report,
+                  bg="white", fg="black").pack(side='right', padx=5)
+
+        self.show_harvested = tk.BooleanVar(value=False)
+        tk.Checkbutton(top_frame, text="Show harvested", variable=self.show_harvested,
+                       command=self.refresh, bg=background, fg=foreground).pack(side='right', padx=5)
+
+        self.table = PagedTreeview(parent, self.COLUMNS, self.row_values, on_activate=self.on_activate)
+        self.table.pack(fill='both', expand=True, padx=10, pady=5)
+
+        # Logs drive the stages; strain edits change flowering times and names
+        self.app.events.subscribe(self.on_changed, LOG_EVENTS + STRAIN_EVENTS)
+        self.refresh()
+
+    def on_changed(self, batch):
+        self.refresh()
+
+    def refresh(self):
+        timelines = self.app.stage_timelines.timelines(include_harvested=self.show_harvested.get())
+        counts = {}
+        for timeline in timelines:
+            counts[timeline.stage] = counts.get(timeline.stage, 0) + 1
+        summary = ", ".join(f"{stage}: {count}" for stage, count in sorted(counts.items()))
+        self.summary_label.config(text=f"{len(timelines)} plants" + (f" ({summary})" if summary else ""))
+        self.table.set_rows(timelines)
+
+    def row_values(self, timeline):
+        return (timeline.strain, timeline.stage, format_day(timeline.stage_start),
+                timeline.days_in_stage, format_harvest_window(timeline.harvest_window()),
+                format_day(timeline.last_day))
+
+    def on_activate(self, timeline):
+        if timeline.strain in self.app.plant_genetics:
+            self.app.show_plant_details(timeline.strain)
+
+    def show_rotation_report(self):
+        """Opens the mother rotation report: cuts per keeper and how long each has rested."""
+        window = Toplevel(self.parent)
+        window.title("Mother Rotation")
+        window.geometry("800x500")
+        window.configure(bg=self.background)
+
+        columns = ('Mother', 'Living Cuts', 'Total Cuts', 'Last Cut', 'Days Since Cut', 'Generations')
+        table = PagedTreeview(window, columns, lambda row: (
+            row.mother, row.living_cuts, row.total_cuts,
+            format_day(row.last_cut) if row.last_cut is not None else "Unknown",
+            row.days_since_cut if row.days_since_cut is not None else "",
+            row.generations),
+            on_activate=lambda row: self.app.show_plant_details(row.mother) if row.mother in self.app.plant_genetics else None)
+        table.pack(fill='both', expand=True, padx=10, pady=10)
+        table.set_rows(self.app.clone_registry.rotation_report(self.app.is_living_plant, date.today().toordinal()))
+
+    def show_pheno_hunt_report(self):
+        """Opens the pheno hunt report: every seed batch's siblings ranked, keepers marked."""
+        window = Toplevel(self.parent)
+        window.title("Pheno Hunts")
+        window.geometry("1100x500")
+        window.configure(bg=self.background)
+
+        columns = ('Batch', 'Started', 'Plant', 'Rank', 'Score', 'Keeper') + tuple(metric.label for metric in HUNT_METRICS)
+        table = PagedTreeview(window, columns, lambda row: (
+            row.batch.label, format_day(row.batch.start) if row.batch.start is not None else "Unknown",
+            row.name, row.rank, f"{row.score:+.2f}", "Yes" if row.keeper else "") + tuple(
+            "" if row.values.get(metric.name) is None else f"{row.values[metric.name]:g}" for metric in HUNT_METRICS),
+            on_activate=lambda row: self.app.show_plant_details(row.name) if row.name in self.app.plant_genetics else None)
+        table.pack(fill='both', expand=True, padx=10, pady=10)
+        table.set_rows(self.app.get_pheno_hunts().report())
@@ -0,0 +1,255 @@
+# detail_view.py
+import tkinter as tk
+from tkinter import Toplevel
+from collections import OrderedDict
+from constants import BACKGROUND_COLOR, TEXT_COLOR
+
+GENDER_OPTIONS = ["Female", "Male", "Unknown"]
+OWNERSHIP_TYPE_OPTIONS = ["None", "Clone", "Seed Start"]
+
+# Keys shown as editable fields rather than in the summary text
+SUMMARY_HIDDEN_KEYS = ["gender", "owned", "ownership_type", "genetic_info", "clone_count"]
+
+
+class PlantDetailView:
+    """
+    A plant details window that is built once and re-populated from the model
+    for whichever plant it is showing. Each view owns its own edit widgets, so
+    several open detail windows never share state. Closing the window only
+    withdraws it, keeping it warm for the next plant.
+
+    The app must provide update_plant_details(plant_name, view),
+    delete_plant(plant_name, view), open_genetic_info_window(plant_name),
+    show_clone_grow_log(clone_name), get_clones(plant_name) and
+    show_similar_strains(plant_name); a create_clone_dialog(plant_name)
+    method enables the Create Clone button.
+    """
+
+    def __init__(self, app, root):
+        self.app = app
+        self.plant_name = None
+        self.clone_names = []
+
+        self.window = Toplevel(root)
+        self.window.withdraw()
+        self.window.geometry("800x600")
+        self.window.configure(bg=BACKGROUND_COLOR)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        # Create main frame
+        main_frame = tk.Frame(self.window, bg=BACKGROUND_COLOR)
+        main_frame.pack(fill='both', expand=True)
+
+        # Left frame for the plant's details
+        left_frame = tk.Frame(main_frame, bg=BACKGROUND_COLOR)
+        left_frame.pack(side='left', fill='both', expand=True, padx=10, pady=10)
+
+        # Right frame for clones
+        right_frame = tk.Frame(main_frame, bg=BACKGROUND_COLOR)
+        right_frame.pack(side='left', fill='both', expand=True, padx=10, pady=10)
+
+        # Summary text
+        self.info_label = tk.Label(left_frame, justify="left", padx=10, pady=10,
+                                   bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12))
+        self.info_label.pack(fill='x', expand=False)
+
+        # Editable Fields
+        edit_frame = tk.Frame(left_frame, bg=BACKGROUND_COLOR)
+        edit_frame.pack(pady=10, padx=20, fill='x')
+
+        self.entry_name = self.add_entry(edit_frame, 0, "Strain Name:")
+        self.entry_yield = self.add_entry(edit_frame, 1, "Yield:")
+        self.entry_lineage = self.add_entry(edit_frame, 2, "Lineage:")
+        self.entry_flowering_time = self.add_entry(edit_frame, 3, "Flowering Time:")
+        self.entry_type = self.add_entry(edit_frame, 4, "Type:")
+
+        tk.Label(edit_frame, text="Gender:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12)).grid(row=5, column=0, sticky='e')
+        self.gender_var = tk.StringVar()
+        gender_menu = tk.OptionMenu(edit_frame, self.gender_var, *GENDER_OPTIONS)
+        gender_menu.config(bg="white", fg="black", font=("Helvetica", 12))
+        gender_menu.grid(row=5, column=1, sticky='w', padx=5, pady=5)
+
+        tk.Label(edit_frame, text="Owned:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12)).grid(row=6, column=0, sticky='e')
+        self.owned_var = tk.BooleanVar()
+        tk.Checkbutton(edit_frame, variable=self.owned_var, bg=BACKGROUND_COLOR, fg=TEXT_COLOR,
+                       font=("Helvetica", 12)).grid(row=6, column=1, sticky='w', padx=5, pady=5)
+
+        tk.Label(edit_frame, text="Ownership Type:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12)).grid(row=7, column=0, sticky='e')
+        self.ownership_type_var = tk.StringVar()
+        ownership_type_menu = tk.OptionMenu(edit_frame, self.ownership_type_var, *OWNERSHIP_TYPE_OPTIONS)
+        ownership_type_menu.config(bg="white", fg="black", font=("Helvetica", 12))
+        ownership_type_menu.grid(row=7, column=1, sticky='w', padx=5, pady=5)
+
+        self.entry_notes = self.add_entry(edit_frame, 8, "Notes:")
+
+        for i in range(2):
+            edit_frame.columnconfigure(i, weight=1)
+
+        # Button frame that will always be visible
+        button_frame = tk.Frame(left_frame, bg=BACKGROUND_COLOR)
+        button_frame.pack(side='bottom', fill='x', pady=10)
+
+        # Create Clone (only shown for owned females, and only if the app supports it)
+        self.btn_clone = self.add_button(button_frame, "Create Clone",
+                                         lambda: self.app.create_clone_dialog(self.plant_name))
+        self.add_button(button_frame, "Genetic Information",
+                        lambda: self.app.open_genetic_info_window(self.plant_name))
+        self.add_button(button_frame, "Similar Strains",
+                        lambda: self.app.show_similar_strains(self.plant_name))
+        self.add_button(button_frame, "Save Changes",
+                        lambda: self.app.update_plant_details(self.plant_name, self))
+        self.add_button(button_frame, "Delete",
+                        lambda: self.app.delete_plant(self.plant_name, self))
+
+        # Clones of this plant; a listbox is re-filled instead of rebuilding buttons
+        self.clones_title = tk.Label(right_frame, bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 14, "bold"))
+        self.clones_title.pack(pady=10)
+        self.clones_listbox = tk.Listbox(right_frame, bg="white", fg="black", font=("Helvetica", 12),
+                                         activestyle='none')
+        self.clones_listbox.pack(fill='both', expand=True)
+        self.clones_listbox.bind('<Double-1>', self.on_clone_activate)
+        self.clones_listbox.bind('<Return>', self.on_clone_activate)
+
+    def add_entry(self, frame, row, label):
+        tk.Label(frame, text=label, bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12)).grid(row=row, column=0, sticky='e')
+        entry = tk.Entry(frame, font=("Helvetica", 12))
+        entry.grid(row=row, column=1, sticky='we', padx=5, pady=5)
+        return entry
+
+    def add_button(self, frame, text, command):
+        btn = tk.Button(frame, text=text, command=command,
+                        bg="white", fg="black", font=("Helvetica", 14, "bold"),
+                        activebackground="lightgrey", activeforeground="black")
+        btn.pack(side='left', padx=5)
+        return btn
+
+    @staticmethod
+    def set_entry(entry, value):
+        entry.delete(0, tk.END)
+        entry.insert(0, value)
+
+    def populate(self, plant_name):
+        """Fills every widget from the model for `plant_name`."""
+        details = self.app.plant_genetics[plant_name]
+        self.plant_name = plant_name
+        self.window.title(f"{plant_name} Details")
+
+        info_text = f"{plant_name} ({details.get('gender', 'Unknown')})\n\n"
+        for key, value in details.items():
+            if key not in SUMMARY_HIDDEN_KEYS:
+                info_text += f"{key.capitalize()}: {value}\n"
+        self.info_label.configure(text=info_text)
+
+        self.set_entry(self.entry_name, plant_name)
+        self.set_entry(self.entry_yield, details.get('yield', 'Unknown'))
+        self.set_entry(self.entry_lineage, details.get('lineage', 'Unknown'))
+        self.set_entry(self.entry_flowering_time, details.get('flowering_time', 'Unknown'))
+        self.set_entry(self.entry_type, details.get('type', 'Unknown'))
+        self.set_entry(self.entry_notes, details.get('notes', ''))
+        self.gender_var.set(details.get("gender", "Unknown"))
+        self.owned_var.set(details.get("owned", True))
+        self.ownership_type_var.set(details.get("ownership_type", "None"))
+
+        can_clone = (hasattr(self.app, 'create_clone_dialog') and details.get('owned', True)
+                     and details.get('gender', '') == 'Female')
+        if can_clone and not self.btn_clone.winfo_ismapped():
+            self.btn_clone.pack(side='left', padx=5, before=self.btn_clone.master.winfo_children()[1])
+        elif not can_clone:
+            self.btn_clone.pack_forget()
+
+        self.clone_names = self.app.get_clones(plant_name)
+        self.clones_listbox.delete(0, tk.END)
+        if self.clone_names:
+            self.clones_title.configure(text="Clones:")
+            self.clones_listbox.insert(tk.END, *self.clone_names)
+        else:
+            self.clones_title.configure(text="No clones found.")
+
+    def get_values(self):
+        """Returns the edited field values, stripped, keyed like the plant record."""
+        return {
+            "name": self.entry_name.get().strip(),
+            "lineage": self.entry_lineage.get().strip(),
+            "gender": self.gender_var.get(),
+            "yield": self.entry_yield.get().strip(),
+            "flowering_time": self.entry_flowering_time.get().strip(),
+            "type": self.entry_type.get().strip(),
+            "notes": self.entry_notes.get().strip(),
+            "owned": self.owned_var.get(),
+            "ownership_type": self.ownership_type_var.get(),
+        }
+
+    def on_clone_activate(self, event=None):
+        selection = self.clones_listbox.curselection()
+        if selection:
+            self.app.show_clone_grow_log(self.clone_names[selection[0]])
+
+    def show(self):
+        self.window.deiconify()
+        self.window.lift()
+        self.window.focus_set()
+
+    def close(self):
+        """Hides the window; the view stays in its pool for reuse."""
+        self.window.withdraw()
+
+    def is_open(self):
+        return self.window.state() != 'withdrawn'
+
+
+class DetailViewPool:
+    """
+    Keeps up to `capacity` PlantDetailViews keyed by plant name in LRU order.
+    Re-opening a recent plant re-populates its warm view; a new plant takes a
+    closed view first, then the least recently used one.
+    """
+
+    def __init__(self, app, root, capacity=4):
+        self.app = app
+        self.root = root
+        self.capacity = capacity
+        self.views = OrderedDict()  # plant name -> view, least recently used first
+        self.spare = []             # views not bound to any plant
+
+    def show(self, plant_name):
+        view = self.views.get(plant_name)
+        if view is not None:
+            self.views.move_to_end(plant_name)
+        else:
+            view = self.acquire()
+            self.views[plant_name] = view
+        view.populate(plant_name)
+        view.show()
+        return view
+
+    def acquire(self):
+        if self.spare:
+            return self.spare.pop()
+        if len(self.views) < self.capacity:
+            return PlantDetailView(self.app, self.root)
+
+        # Prefer recycling a closed window over taking over an open one
+        for name, view in self.views.items():
+            if not view.is_open():
+                return self.views.pop(name)
+        _, view = self.views.popitem(last=False)
+        return view
+
+    def forget(self, plant_name):
+        """Unbinds a plant (e.g. after delete) and keeps its view as a spare."""
+        view = self.views.pop(plant_name, None)
+        if view is not None:
+            view.close()
+            self.spare.append(view)
+
+    def rename(self, old_name, new_name):
+        view = self.views.pop(old_name, None)
+        if view is not None:
+            self.forget(new_name)
+            self.views[new_name] = view
+
+    def refresh(self, plant_name):
+        """Re-populates an open view after its plant changed elsewhere."""
+        view = self.views.get(plant_name)
+        if view is not None and view.is_open() and plant_name in self.app.plant_genetics:
+            view.populate(plant_name)
@@ -0,0 +1,111 @@
+# events.py
+
+# Change Event Types
+STRAIN_ADDED = "strain_added"
+STRAIN_UPDATED = "strain_updated"
+STRAIN_RENAMED = "strain_renamed"
+STRAIN_DELETED = "strain_deleted"
+STRAINS_RESET = "strains_reset"
+LOG_ENTRY_ADDED = "log_entry_added"
+LOG_ENTRY_UPDATED = "log_entry_updated"
+LOG_ENTRY_DELETED = "log_entry_deleted"
+
+STRAIN_EVENTS = (STRAIN_ADDED, STRAIN_UPDATED, STRAIN_RENAMED, STRAIN_DELETED, STRAINS_RESET)
+LOG_EVENTS = (LOG_ENTRY_ADDED, LOG_ENTRY_UPDATED, LOG_ENTRY_DELETED)
+
+
+class ChangeEvent:
+    """
+    One model change. `name` is the strain affected (the new name for a
+    rename), `old_name` is only set for renames.
+    """
+
+    __slots__ = ("kind", "name", "old_name")
+
+    def __init__(self, kind, name=None, old_name=None):
+        self.kind = kind
+        self.name = name
+        self.old_name = old_name
+
+    def key(self):
+        return (self.kind, self.name, self.old_name)
+
+    def __repr__(self):
+        return f"ChangeEvent({self.kind!r}, {self.name!r}, {self.old_name!r})"
+
+
+class ChangeBatch:
+    """
+    The events delivered to a subscriber for one idle cycle, with helpers for
+    working out the smallest refresh that covers them.
+    """
+
+    def __init__(self, events):
+        self.events = events
+
+    def __iter__(self):
+        return iter(self.events)
+
+    def __len__(self):
+        return len(self.events)
+
+    def has(self, *kinds):
+        return any(event.kind in kinds for event in self.events)
+
+    def names(self, *kinds):
+        """Strain names touched by events of `kinds` (all kinds if none given), old names included."""
+        touched = set()
+        for event in self.events:
+            if kinds and event.kind not in kinds:
+                continue
+            if event.name is not None:
+                touched.add(event.name)
+            if event.old_name is not None:
+                touched.add(event.old_name)
+        return touched
+
+
+class EventBus:
+    """
+    Views subscribe to the kinds of change they care about and models publish
+    changes as they happen. Delivery is deferred to the next Tk idle cycle, so a
+    burst of mutations (e.g. a rename touching several clones, or a save
+    followed by a clone) reaches each subscriber as one batch. An event that
+    repeats the previous event for the same strain is dropped; any other
+    event is kept in order, so subscribers can replay the batch.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.subscribers = []  # (callback, kinds or None for everything)
+        self.pending = []
+        self.last = {}  # strain name -> key of the latest pending event touching it
+        self.scheduled = None
+
+    def subscribe(self, callback, kinds=None):
+        """`callback(batch)` is called with a ChangeBatch of the matching events."""
+        self.subscribers.append((callback, set(kinds) if kinds else None))
+
+    def unsubscribe(self, callback):
+        self.subscribers = [(cb, kinds) for cb, kinds in self.subscribers if cb != callback]
+
+    def publish(self, kind, name=None, old_name=None):
+        event = ChangeEvent(kind, name, old_name)
+        key = event.key()
+        names = [touched for touched in (name, old_name) if touched is not None] or [None]
+        if all(self.last.get(touched) == key for touched in names):
+            return
+        for touched in names:
+            self.last[touched] = key
+        self.pending.append(event)
+        if self.scheduled is None:
+            self.scheduled = self.root.after_idle(self.flush)
+
+    def flush(self):
+        """Delivers everything published since the last flush."""
+        self.scheduled = None
+        events, self.pending, self.last = self.pending, [], {}
+        for callback, kinds in list(self.subscribers):
+            matching = events if kinds is None else [event for event in events if event.kind in kinds]
+            if matching:
+                callback(ChangeBatch(matching))
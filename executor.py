@@ -0,0 +1,132 @@
+# executor.py
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, CancelledError
+
+
+class CancelToken:
+    """
+    Marks a background task as no longer wanted. Cancelling stops a task that
+    hasn't started yet and always drops its result; long-running I/O functions
+    can also check `token.cancelled` themselves to stop early.
+    """
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.future = None
+
+    def cancel(self):
+        self.event.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    @property
+    def cancelled(self):
+        return self.event.is_set()
+
+
+class BackgroundExecutor:
+    """
+    Runs work off the Tk main loop and hands results back on it.
+
+    - submit_io(): thread pool for disk and network I/O.
+    - submit_write(): a single writer thread, so saves land on disk in order.
+    - submit_cpu(): process pool for CPU-bound work (rendering, analytics). The
+      function and its arguments must be picklable, i.e. module-level.
+
+    Workers never touch Tk. Finished tasks are put on a queue which the main
+    loop drains with root.after polling, and `on_done(result)` or
+    `on_error(exception)` run there. `busy_callback(True/False)` is called when
+    the executor goes from idle to busy and back, to drive a busy indicator.
+    """
+
+    def __init__(self, root, io_workers=4, cpu_workers=None, poll_ms=50, busy_callback=None):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.busy_callback = busy_callback
+        self.io_pool = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="io")
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="writer")
+        self.cpu_workers = cpu_workers
+        self.cpu_pool = None  # Started on first use; spawning processes isn't free
+        self.results = queue.Queue()
+        self.pending = 0
+        self.polling = None
+        self.closed = False
+
+    def submit_io(self, fn, *args, on_done=None, on_error=None, token=None):
+        return self.submit(self.io_pool, fn, args, on_done, on_error, token)
+
+    def submit_write(self, fn, *args, on_done=None, on_error=None, token=None):
+        return self.submit(self.writer, fn, args, on_done, on_error, token)
+
+    def submit_cpu(self, fn, *args, on_done=None, on_error=None, token=None):
+        if self.cpu_pool is None:
+            self.cpu_pool = ProcessPoolExecutor(max_workers=self.cpu_workers)
+        return self.submit(self.cpu_pool, fn, args, on_done, on_error, token)
+
+    def submit(self, pool, fn, args, on_done, on_error, token):
+        """Schedules `fn(*args)` on `pool` and returns the task's CancelToken."""
+        if self.closed:
+            raise RuntimeError("Executor has been shut down.")
+        token = token or CancelToken()
+        future = pool.submit(fn, *args)
+        token.future = future
+        self.set_pending(self.pending + 1)
+        # Runs on the worker thread: only hand the result over, never touch Tk here
+        future.add_done_callback(lambda f: self.results.put((f, token, on_done, on_error)))
+        self.schedule_poll()
+        return token
+
+    def schedule_poll(self):
+        if self.polling is None and not self.closed:
+            self.polling = self.root.after(self.poll_ms, self.poll)
+
+    def poll(self):
+        """Delivers finished results on the Tk thread; keeps polling while work is pending."""
+        self.polling = None
+        while True:
+            try:
+                future, token, on_done, on_error = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.set_pending(self.pending - 1)
+            if token.cancelled or future.cancelled():
+                continue
+            try:
+                result = future.result()
+            except CancelledError:
+                continue
+            except Exception as e:
+                if on_error:
+                    on_error(e)
+                continue
+            if on_done:
+                on_done(result)
+        if self.pending:
+            self.schedule_poll()
+
+    def set_pending(self, count):
+        was_busy = self.pending > 0
+        self.pending = count
+        if self.busy_callback and was_busy != (count > 0):
+            self.busy_callback(count > 0)
+
+    def shutdown(self, wait=True):
+        """
+        Stops accepting work. Queued saves are always flushed so closing the app
+        never loses data; other pending tasks are dropped.
+        """
+        self.closed = True
+        if self.polling is not None:
+            self.root.after_cancel(self.polling)
+            self.polling = None
+        self.io_pool.shutdown(wait=False, cancel_futures=True)
+        self.writer.shutdown(wait=True)
+        if self.cpu_pool is not None:
+            self.cpu_pool.shutdown(wait=wait, cancel_futures=True)
+
+
+def write_json_text(path, text):
+    """Writes pre-serialized JSON; meant for submit_write()."""
+    with open(path, 'w') as file:
+        file.write(text)
@@ -2,17 +2,20 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, Toplevel
 from datetime import datetime
-import json
-import os
-from constants import GROW_LOG_FILE, BACKGROUND_COLOR, TEXT_COLOR
-from components import ScrollableFrame
+from constants import BACKGROUND_COLOR, TEXT_COLOR
+from components import PagedTreeview, StrainPicker
+from log_index import parse_log_date
+from bulk_entry import BulkLogDialog
+from events import LOG_EVENTS, LOG_ENTRY_ADDED, LOG_ENTRY_UPDATED, LOG_ENTRY_DELETED
 
 class GrowLogApp:
-    def __init__(self, parent, plant_genetics, main_app):
+    def __init__(self, parent, plant_genetics, main_app, store):
         self.parent = parent
         self.plant_genetics = plant_genetics
         self.main_app = main_app  # Reference to the main app
-        self.grow_log = self.load_grow_log_data()
+        # The app's GrowLogStore: this tab only shows and edits it
+        self.store = store
+        self.log_index = store.index  # Per-strain entries sorted by date
 
         # Main Frame
         self.main_frame = tk.Frame(self.parent, bg=BACKGROUND_COLOR)
@@ -33,9 +36,9 @@ class GrowLogApp:
                  font=("Helvetica", 12)).pack(side="left")
 
         self.strain_var = tk.StringVar()
-        strain_options = ["Select Strain"] + sorted(self.plant_genetics.keys(), key=lambda x: x.lower())
-        self.strain_dropdown = tk.OptionMenu(self.selection_frame, self.strain_var, *strain_options, command=self.on_strain_select)
-        self.strain_dropdown.config(bg="white", fg="black", font=("Helvetica", 12))
+        self.strain_dropdown = StrainPicker(self.selection_frame, self.main_app.strain_index,
+                                            textvariable=self.strain_var, command=self.on_strain_select,
+                                            extra_options=["Select Strain"], font=("Helvetica", 12))
         self.strain_dropdown.pack(side="left", padx=10)
         self.strain_var.set("Select Strain")
 
@@ -53,13 +56,41 @@ class GrowLogApp:
                                 activebackground="lightgrey", activeforeground="black")
         btn_add_log.pack(pady=10)
 
-        # Log Entries Frame with ScrollableFrame
-        self.log_scrollable_frame = ScrollableFrame(self.right_frame)
-        self.log_scrollable_frame.pack(pady=10, padx=20, fill='both', expand=True)
+        # Bulk Entry Button: one activity for a whole room or selection
+        btn_bulk_log = tk.Button(self.right_frame, text="Bulk Entry", command=self.bulk_log_entry,
+                                 bg="white", fg="black", font=("Helvetica", 12, "bold"),
+                                 activebackground="lightgrey", activeforeground="black")
+        btn_bulk_log.pack(pady=5)
+
+        # Edit Selected Entry Button (double-clicking a row does the same)
+        btn_edit_log = tk.Button(self.right_frame, text="Edit Selected Entry", command=self.edit_selected_entry,
+                                 bg="white", fg="black", font=("Helvetica", 12, "bold"),
+                                 activebackground="lightgrey", activeforeground="black")
+        btn_edit_log.pack(pady=5)
+
+        # Log Entries, loaded a page at a time as the list is scrolled
+        self.empty_label = tk.Label(self.right_frame, text="No grow log entries yet.",
+                                    bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12))
+        self.log_list = PagedTreeview(self.right_frame,
+                                      columns=('Date', 'Activity', 'Strain', 'Notes', 'Status'),
+                                      row_values=lambda entry: (entry.get('date', ''), entry.get('activity_type', ''),
+                                                                entry.get('strain', ''), entry.get('notes', ''),
+                                                                entry.get('status', '')),
+                                      on_activate=self.on_log_entry_activate)
+        self.log_list.pack(pady=10, padx=20, fill='both', expand=True)
 
         # Display existing log entries
         self.display_log_entries()
 
+        # Refresh when entries change; clone log windows stop listening once closed
+        self.main_app.events.subscribe(self.on_log_changed, LOG_EVENTS)
+        self.main_frame.bind('<Destroy>', lambda e: e.widget is self.main_frame and self.main_app.events.unsubscribe(self.on_log_changed))
+
+    def on_log_changed(self, batch):
+        selected = self.strain_var.get()
+        if selected == "Select Strain" or selected in batch.names():
+            self.display_log_entries()
+
     def on_strain_select(self, value):
         # Clear details_frame
         for widget in self.details_frame.winfo_children():
@@ -74,21 +105,8 @@ class GrowLogApp:
         # Filter log entries based on selected strain
         self.display_log_entries()
 
-    def load_grow_log_data(self):
-        if os.path.exists(GROW_LOG_FILE):
-            try:
-                with open(GROW_LOG_FILE, 'r') as file:
-                    data = json.load(file)
-                    return data
-            except json.JSONDecodeError:
-                messagebox.showerror("Error", "Failed to decode grow_log.json. Starting with empty grow log.")
-                return []
-        else:
-            return []
-
     def save_grow_log_data(self):
-        with open(GROW_LOG_FILE, 'w') as file:
-            json.dump(self.grow_log, file, indent=4)
+        self.store.save(on_error=lambda e: messagebox.showerror("Error", f"Failed to save grow_log.json: {e}"))
 
     def add_log_entry(self):
         # Create a new Toplevel window (popup)
@@ -116,9 +134,8 @@ class GrowLogApp:
         tk.Label(entry_window, text="Strain:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR,
                  font=("Helvetica", 12)).pack(pady=5)
         strain_var = tk.StringVar()
-        strain_options = ["Select Strain"] + sorted(self.plant_genetics.keys(), key=lambda x: x.lower())
-        strain_menu = tk.OptionMenu(entry_window, strain_var, *strain_options)
-        strain_menu.config(bg="white", fg="black", font=("Helvetica", 12))
+        strain_menu = StrainPicker(entry_window, self.main_app.strain_index, textvariable=strain_var,
+                                   font=("Helvetica", 12))
         strain_menu.pack(pady=5)
         strain_var.set("Select Strain")
 
@@ -151,7 +168,7 @@ class GrowLogApp:
     def save_log_entry(self, date, activity, strain, notes, status, window):
         # Validate date format
         try:
-            datetime.strptime(date, '%Y-%m-%d')
+            parse_log_date(date)
         except ValueError:
             messagebox.showwarning("Invalid Date", "Please enter the date in YYYY-MM-DD format.")
             return
@@ -165,69 +182,99 @@ class GrowLogApp:
             return
 
         # Add new log entry
-        self.grow_log.append({
+        entry = {
             "date": date,
             "activity_type": activity,
             "strain": strain,
             "notes": notes,
             "status": status
-        })
+        }
+        self.store.add(entry)
         self.save_grow_log_data()
-        self.display_log_entries()
+        self.main_app.events.publish(LOG_ENTRY_ADDED, strain)
         messagebox.showinfo("Success", "Grow log entry added successfully!")
         window.destroy()
 
-    def display_log_entries(self):
-        # Clear existing entries
-        for widget in self.log_scrollable_frame.scrollable_frame.winfo_children():
-            widget.destroy()
+    def bulk_log_entry(self):
+        BulkLogDialog(self.parent, self.main_app,
+                      activities=["Watered", "Fed Nutrients", "Pruned", "Harvested", "Cloned", "Transplanted", "Mom", "Other"],
+                      statuses=["Seedling", "Vegetative", "Flowering", "Harvested", "Cloned", "Other"],
+                      on_apply=self.add_log_entries, default_status="",
+                      background=BACKGROUND_COLOR, foreground=TEXT_COLOR)
 
-        filtered_log = self.grow_log
+    def add_log_entries(self, entries):
+        """Adds a batch of entries: one index update, one save, one refresh."""
+        self.store.add_many(entries)
+        self.save_grow_log_data()
+        for strain in {entry['strain'] for entry in entries}:
+            self.main_app.events.publish(LOG_ENTRY_ADDED, strain)
 
+    def display_log_entries(self):
         if self.strain_var.get() != "Select Strain":
-            # Filter log entries based on selected strain
-            filtered_log = [entry for entry in self.grow_log if entry['strain'] == self.strain_var.get()]
+            # The index holds the strain's entries oldest first; show newest first
+            sorted_log = self.log_index.entries_for(self.strain_var.get())[::-1]
+        else:
+            # Display entries in reverse chronological order
+            sorted_log = sorted(self.store.entries, key=self.log_index.sort_key, reverse=True)
 
-        if not filtered_log:
-            tk.Label(self.log_scrollable_frame.scrollable_frame, text="No grow log entries yet.",
-                     bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12)).pack(pady=10)
+        if not sorted_log:
+            self.empty_label.pack(pady=10, before=self.log_list)
+        else:
+            self.empty_label.pack_forget()
+
+        self.log_list.set_rows(sorted_log)
+
+    def show_strain_log(self, strain):
+        """
+        Opens a window listing one strain's entries (a clone's, from its
+        details view), newest first, from this log and its index. Double-click
+        an entry to edit it; the list follows log changes while open.
+        """
+        window = Toplevel(self.parent)
+        window.title(f"Grow Log for {strain}")
+        window.geometry("700x500")
+        window.configure(bg=BACKGROUND_COLOR)
+
+        tk.Label(window, text=f"Grow Log for {strain}", bg=BACKGROUND_COLOR, fg=TEXT_COLOR,
+                 font=("Helvetica", 16, "bold")).pack(pady=10)
+        empty_label = tk.Label(window, text="No grow log entries for this strain.",
+                               bg=BACKGROUND_COLOR, fg=TEXT_COLOR, font=("Helvetica", 12))
+        entries = PagedTreeview(window, columns=('Date', 'Activity', 'Notes', 'Status'),
+                                row_values=lambda entry: (entry.get('date', ''), entry.get('activity_type', ''),
+                                                          entry.get('notes', ''), entry.get('status', '')),
+                                on_activate=self.on_log_entry_activate)
+        entries.pack(pady=10, padx=20, fill='both', expand=True)
+
+        def show():
+            rows = self.log_index.entries_for(strain)[::-1]
+            if rows:
+                empty_label.pack_forget()
+            else:
+                empty_label.pack(pady=10, before=entries)
+            entries.set_rows(rows)
+
+        def on_log_changed(batch):
+            if strain in batch.names():
+                show()
+
+        show()
+        self.main_app.events.subscribe(on_log_changed, LOG_EVENTS)
+        window.bind('<Destroy>', lambda e: e.widget is window and self.main_app.events.unsubscribe(on_log_changed))
+
+    def edit_selected_entry(self):
+        entry = self.log_list.selected_row()
+        if entry is None:
+            messagebox.showinfo("No Selection", "Please select a log entry to edit.")
             return
+        self.on_log_entry_activate(entry)
 
-        # Display entries in reverse chronological order
-        sorted_log = sorted(filtered_log, key=lambda x: x['date'], reverse=True)
-
-        for idx, entry in enumerate(sorted_log):
-            frame = tk.Frame(self.log_scrollable_frame.scrollable_frame, bg=BACKGROUND_COLOR, bd=1, relief="solid")
-            frame.pack(pady=5, padx=5, fill='x')
-
-            date_label = tk.Label(frame, text=f"Date: {entry['date']}", bg=BACKGROUND_COLOR, fg=TEXT_COLOR,
-                                  font=("Helvetica", 12, "bold"))
-            date_label.pack(anchor='w')
-
-            activity_label = tk.Label(frame, text=f"Activity: {entry['activity_type']}", bg=BACKGROUND_COLOR, fg=TEXT_COLOR,
-                                      font=("Helvetica", 12))
-            activity_label.pack(anchor='w')
-
-            strain_label = tk.Label(frame, text=f"Strain: {entry['strain']}", bg=BACKGROUND_COLOR, fg=TEXT_COLOR,
-                                    font=("Helvetica", 12))
-            strain_label.pack(anchor='w')
-
-            notes_label = tk.Label(frame, text=f"Notes: {entry['notes']}", bg=BACKGROUND_COLOR, fg=TEXT_COLOR,
-                                   font=("Helvetica", 12))
-            notes_label.pack(anchor='w')
-
-            status_label = tk.Label(frame, text=f"Status: {entry['status']}", bg=BACKGROUND_COLOR, fg=TEXT_COLOR,
-                                    font=("Helvetica", 12))
-            status_label.pack(anchor='w')
-
-            # Add an Edit button
-            btn_edit = tk.Button(frame, text="Edit Entry", command=lambda idx=idx: self.edit_log_entry(idx),
-                                 bg="white", fg="black", font=("Helvetica", 12, "bold"),
-                                 activebackground="lightgrey", activeforeground="black")
-            btn_edit.pack(pady=5)
+    def on_log_entry_activate(self, entry):
+        self.edit_log_entry(entry['id'])
 
-    def edit_log_entry(self, idx):
-        entry = self.grow_log[idx]
+    def edit_log_entry(self, entry_id):
+        entry = self.log_index.get(entry_id)
+        if entry is None:
+            return
 
         # Create a new Toplevel window (popup)
         edit_window = Toplevel(self.parent)
@@ -254,9 +301,8 @@ class GrowLogApp:
         tk.Label(edit_window, text="Strain:", bg=BACKGROUND_COLOR, fg=TEXT_COLOR,
                  font=("Helvetica", 12)).pack(pady=5)
         strain_var = tk.StringVar()
-        strain_options = ["Select Strain"] + sorted(self.plant_genetics.keys(), key=lambda x: x.lower())
-        strain_menu = tk.OptionMenu(edit_window, strain_var, *strain_options)
-        strain_menu.config(bg="white", fg="black", font=("Helvetica", 12))
+        strain_menu = StrainPicker(edit_window, self.main_app.strain_index, textvariable=strain_var,
+                                   font=("Helvetica", 12))
         strain_menu.pack(pady=5)
         strain_var.set(entry['strain'])
 
@@ -279,7 +325,7 @@ class GrowLogApp:
         btn_frame = tk.Frame(edit_window, bg=BACKGROUND_COLOR)
         btn_frame.pack(pady=20)
 
-        btn_save = tk.Button(btn_frame, text="Save Changes", command=lambda: self.save_edit_log_entry(idx, entry_date.get().strip(),
+        btn_save = tk.Button(btn_frame, text="Save Changes", command=lambda: self.save_edit_log_entry(entry_id, entry_date.get().strip(),
                                                                                                        activity_var.get().strip(),
                                                                                                        strain_var.get().strip(),
                                                                                                        entry_notes.get().strip(),
@@ -289,15 +335,15 @@ class GrowLogApp:
                              activebackground="lightgrey", activeforeground="black")
         btn_save.pack(side='left', padx=20)
 
-        btn_delete = tk.Button(btn_frame, text="Delete Entry", command=lambda: self.delete_log_entry(idx, edit_window),
+        btn_delete = tk.Button(btn_frame, text="Delete Entry", command=lambda: self.delete_log_entry(entry_id, edit_window),
                                bg="white", fg="black", font=("Helvetica", 12, "bold"),
                                activebackground="lightgrey", activeforeground="black")
         btn_delete.pack(side='right', padx=20)
 
-    def save_edit_log_entry(self, idx, date, activity, strain, notes, status, window):
+    def save_edit_log_entry(self, entry_id, date, activity, strain, notes, status, window):
         # Validate date format
         try:
-            datetime.strptime(date, '%Y-%m-%d')
+            parse_log_date(date)
         except ValueError:
             messagebox.showwarning("Invalid Date", "Please enter the date in YYYY-MM-DD format.")
             return
@@ -310,24 +356,38 @@ class GrowLogApp:
             messagebox.showwarning("Invalid Strain", "Please select a valid strain.")
             return
 
-        # Update log entry
-        self.grow_log[idx] = {
+        entry = self.log_index.get(entry_id)
+        if entry is None:
+            window.destroy()
+            return
+
+        # Update log entry in place; its ID stays the same
+        old_strain = entry['strain']
+        entry.update({
             "date": date,
             "activity_type": activity,
             "strain": strain,
             "notes": notes,
             "status": status
-        }
+        })
+        self.store.update(entry)
         self.save_grow_log_data()
-        self.display_log_entries()
+        self.main_app.events.publish(LOG_ENTRY_UPDATED, strain)
+        if old_strain != strain:
+            self.main_app.events.publish(LOG_ENTRY_UPDATED, old_strain)
         messagebox.showinfo("Success", "Grow log entry updated successfully!")
         window.destroy()
 
-    def delete_log_entry(self, idx, window):
+    def delete_log_entry(self, entry_id, window):
         if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this log entry?"):
-            del self.grow_log[idx]
+            removed = self.log_index.get(entry_id)
+            if removed is None:
+                window.destroy()
+                return
+            self.store.delete(removed)
+            strain = removed.get('strain')
             self.save_grow_log_data()
-            self.display_log_entries()
+            self.main_app.events.publish(LOG_ENTRY_DELETED, strain)
             messagebox.showinfo("Deleted", "Grow log entry has been deleted.")
             window.destroy()
 
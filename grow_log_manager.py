@@ -1,9 +1,13 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import json
 import os
-from datetime import datetime
-from tkcalendar import Calendar
+from datetime import date
+from query import filter_log, QueryError
+from components import StrainPicker
+from strain_index import StrainNameIndex
+from dashboard import format_harvest_window
+from bulk_entry import BulkLogDialog
+from events import LOG_EVENTS, LOG_ENTRY_ADDED, LOG_ENTRY_UPDATED, LOG_ENTRY_DELETED
 
 class CloneEditDialog:
     def __init__(self, parent, clone_data):
@@ -91,25 +95,51 @@ class CloneData:
     # Rest of the CloneData implementation...
 
 class GrowLogManager:
-    def __init__(self, parent_frame, plant_genetics, main_app, grow_log_file):
+    def __init__(self, parent_frame, plant_genetics, main_app, store):
         self.parent_frame = parent_frame
         self.plant_genetics = plant_genetics
         self.main_app = main_app
-        self.grow_log_file = grow_log_file
-        self.grow_log = self.load_grow_log()
+        # The app's GrowLogStore: this tab only shows and edits it
+        self.store = store
+
+        # Per-strain, date-sorted view of the log; kept in step by the store
+        self.log_index = store.index
+
+        # Clone names for the strain picker, rebuilt lazily after invalidate()
+        self.clone_index = StrainNameIndex(
+            lambda: [name for name, details in self.plant_genetics.items()
+                     if details.get('ownership_type') == 'Clone'])
 
         self.initialize_ui()
 
-    def load_grow_log(self):
-        try:
-            with open(self.grow_log_file, 'r') as file:
-                return json.load(file)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
+        # Refresh the table when entries change, wherever the change was made
+        self.main_app.events.subscribe(self.on_log_changed, LOG_EVENTS)
+
+    def on_log_changed(self, batch):
+        # Only the selected strain is on screen, so other strains' changes need no redraw
+        if self.strain_var.get() in batch.names():
+            self.update_log_display()
+
+    def add_log_entry(self, entry):
+        self.store.add(entry)
+
+    def add_log_entries(self, entries):
+        """Adds a batch of entries: one index update, one save, one refresh."""
+        self.store.add_many(entries)
+        self.save_grow_log_data()
+        for strain in {entry['strain'] for entry in entries}:
+            self.main_app.events.publish(LOG_ENTRY_ADDED, strain)
+
+    def update_log_entry(self, entry):
+        """Call after editing an entry in place."""
+        self.store.update(entry)
+
+    def remove_log_entries(self, entries):
+        for entry in entries:
+            self.store.delete(entry)
 
     def save_grow_log_data(self):
-        with open(self.grow_log_file, 'w') as file:
-            json.dump(self.grow_log, file, indent=4)
+        self.store.save(on_error=lambda e: messagebox.showerror("Error", f"Failed to save grow log: {e}"))
 
     def initialize_ui(self):
         # Control Panel Frame
@@ -118,12 +148,10 @@ class GrowLogManager:
 
         # Strain Selection
         tk.Label(control_frame, text="Select Strain:", bg='white').pack(side='left', padx=5)
-        self.strain_var = tk.StringVar()
-        strain_options = ["Select Strain"] + sorted([name for name, details in self.plant_genetics.items() 
-                                                   if details.get('ownership_type') == 'Clone'])
-        self.strain_dropdown = ttk.Combobox(control_frame, textvariable=self.strain_var, values=strain_options)
+        self.strain_var = tk.StringVar(value="Select Strain")
+        self.strain_dropdown = StrainPicker(control_frame, self.clone_index, textvariable=self.strain_var,
+                                            command=self.update_log_display)
         self.strain_dropdown.pack(side='left', padx=5)
-        self.strain_dropdown.bind('<<ComboboxSelected>>', self.update_log_display)
 
         # Stage Filter
         tk.Label(control_frame, text="Growth Stage:", bg='white').pack(side='left', padx=5)
@@ -133,11 +161,23 @@ class GrowLogManager:
         stage_dropdown.pack(side='left', padx=5)
         stage_dropdown.bind('<<ComboboxSelected>>', self.update_log_display)
 
+        # Query Filter, e.g. "activity=Watered since 2024-12-01" (see query.py)
+        tk.Label(control_frame, text="Filter:", bg='white').pack(side='left', padx=5)
+        self.filter_var = tk.StringVar()
+        filter_entry = tk.Entry(control_frame, textvariable=self.filter_var)
+        filter_entry.pack(side='left', padx=5, fill='x', expand=True)
+        filter_entry.bind('<Return>', self.update_log_display)
+
         # Add Log Entry Button
         tk.Button(control_frame, text="Add Log Entry", 
                  command=self.show_add_entry_dialog,
                  bg='white').pack(side='right', padx=5)
 
+        # Bulk Entry Button: one activity for a whole room or selection
+        tk.Button(control_frame, text="Bulk Entry",
+                 command=self.show_bulk_entry_dialog,
+                 bg='white').pack(side='right', padx=5)
+
         # Clone Progress Frame
         progress_frame = tk.LabelFrame(self.parent_frame, text="Clone Progress", bg='white')
         progress_frame.pack(fill='x', padx=10, pady=5)
@@ -184,7 +224,8 @@ class GrowLogManager:
         dialog.geometry("400x500")
         dialog.configure(bg='white')
 
-        # Date picker using Calendar
+        # Date picker using Calendar (imported on first use to keep startup fast)
+        from tkcalendar import Calendar
         tk.Label(dialog, text="Date:", bg='white').pack(pady=5)
         cal = Calendar(dialog, selectmode='day', date_pattern='yyyy-mm-dd')
         cal.pack(pady=5)
@@ -239,41 +280,32 @@ class GrowLogManager:
                 "status": status_var.get() or "Healthy"  # Default to Healthy if empty
             }
             
-            # Load existing data with validation
-            try:
-                with open(self.grow_log_file, 'r') as file:
-                    try:
-                        self.grow_log = json.load(file)
-                        if not isinstance(self.grow_log, list):
-                            self.grow_log = []
-                    except json.JSONDecodeError:
-                        self.grow_log = []
-            except FileNotFoundError:
-                self.grow_log = []
-            
-            # Add new entry
-            self.grow_log.append(new_entry)
-            
+            # Add new entry; the in-memory log is authoritative, re-reading the file could race a pending save
+            self.add_log_entry(new_entry)
+
             # Save updated data
-            try:
-                with open(self.grow_log_file, 'w') as file:
-                    json.dump(self.grow_log, file, indent=4)
-                messagebox.showinfo("Success", "Grow log entry saved successfully!")
-                self.update_log_display()
-                dialog.destroy()
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to save entry: {str(e)}")
+            self.save_grow_log_data()
+            self.main_app.events.publish(LOG_ENTRY_ADDED, selected_strain)
+            messagebox.showinfo("Success", "Grow log entry saved successfully!")
+            dialog.destroy()
 
         tk.Button(dialog, text="Save", command=save_entry, bg='white').pack(pady=20)
 
+    def show_bulk_entry_dialog(self):
+        BulkLogDialog(self.parent_frame, self.main_app,
+                      activities=["Watered", "Fed", "Pruned", "Stage Change",
+                                  "Problem Found", "Problem Resolved", "Other"],
+                      statuses=["Healthy", "Needs Attention", "Problems", "Critical"],
+                      stages=["Clone", "Vegetation", "Flowering", "Harvested"],
+                      on_apply=self.add_log_entries)
+
     def edit_entry(self, event):
         if not self.log_tree.selection():
             return
             
-        item = self.log_tree.selection()[0]
-        values = self.log_tree.item(item)['values']
-        
-        if not values:
+        # Rows are inserted with the entry's ID as their item ID
+        entry = self.log_index.get(self.log_tree.selection()[0])
+        if entry is None:
             return
             
         dialog = tk.Toplevel(self.parent_frame)
@@ -282,24 +314,25 @@ class GrowLogManager:
         dialog.configure(bg='white')
 
         # Date picker
+        from tkcalendar import Calendar
         tk.Label(dialog, text="Date:", bg='white').pack(pady=5)
         cal = Calendar(dialog, selectmode='day', date_pattern='yyyy-mm-dd')
         cal.pack(pady=5)
         try:
-            cal.selection_set(values[0])  # Set current date
+            cal.selection_set(entry.get('date', '')[:10])  # Set current date
         except:
             pass
 
         # Stage
         tk.Label(dialog, text="Stage:", bg='white').pack(pady=5)
-        stage_var = tk.StringVar(value=values[1])
+        stage_var = tk.StringVar(value=entry.get('stage', ''))
         stage_menu = ttk.Combobox(dialog, textvariable=stage_var, 
                                 values=["Clone", "Vegetation", "Flowering", "Harvested"])
         stage_menu.pack(pady=5)
 
         # Activity
         tk.Label(dialog, text="Activity:", bg='white').pack(pady=5)
-        activity_var = tk.StringVar(value=values[2])
+        activity_var = tk.StringVar(value=entry.get('activity_type', ''))
         activity_menu = ttk.Combobox(dialog, textvariable=activity_var, 
                                    values=["Watered", "Fed", "Pruned", "Stage Change", 
                                           "Problem Found", "Problem Resolved", "Other"])
@@ -309,35 +342,29 @@ class GrowLogManager:
         tk.Label(dialog, text="Notes:", bg='white').pack(pady=5)
         notes_text = tk.Text(dialog, height=4)
         notes_text.pack(pady=5)
-        notes_text.insert('1.0', values[3])
+        notes_text.insert('1.0', entry.get('notes', ''))
 
         # Status
         tk.Label(dialog, text="Plant Status:", bg='white').pack(pady=5)
-        status_var = tk.StringVar(value=values[4])
+        status_var = tk.StringVar(value=entry.get('status', ''))
         status_menu = ttk.Combobox(dialog, textvariable=status_var, 
                                  values=["Healthy", "Needs Attention", "Problems", "Critical"])
         status_menu.pack(pady=5)
 
         def save_edited_entry():
-            # Find and update the entry in grow_log
-            for entry in self.grow_log:
-                if (entry['date'] == values[0] and 
-                    entry['strain'] == self.strain_var.get() and 
-                    entry['stage'] == values[1]):
-                    
-                    entry['date'] = cal.get_date()
-                    entry['stage'] = stage_var.get()
-                    entry['activity_type'] = activity_var.get()
-                    entry['notes'] = notes_text.get("1.0", "end-1c")
-                    entry['status'] = status_var.get()
-                    break
+            # Update exactly the entry that was opened; its ID stays the same
+            entry['date'] = cal.get_date()
+            entry['stage'] = stage_var.get()
+            entry['activity_type'] = activity_var.get()
+            entry['notes'] = notes_text.get("1.0", "end-1c")
+            entry['status'] = status_var.get()
+            self.update_log_entry(entry)
 
             # Save to file
-            with open(self.grow_log_file, 'w') as file:
-                json.dump(self.grow_log, file, indent=4)
+            self.save_grow_log_data()
 
             # Update display
-            self.update_log_display()
+            self.main_app.events.publish(LOG_ENTRY_UPDATED, self.strain_var.get())
             dialog.destroy()
             messagebox.showinfo("Success", "Entry updated successfully!")
 
@@ -345,17 +372,13 @@ class GrowLogManager:
         def delete_entry():
             if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this entry?"):
                 # Remove from grow_log
-                self.grow_log = [entry for entry in self.grow_log 
-                               if not (entry['date'] == values[0] and 
-                                     entry['strain'] == self.strain_var.get() and 
-                                     entry['stage'] == values[1])]
+                self.remove_log_entries([entry])
                 
                 # Save to file
-                with open(self.grow_log_file, 'w') as file:
-                    json.dump(self.grow_log, file, indent=4)
+                self.save_grow_log_data()
                 
                 # Update display
-                self.update_log_display()
+                self.main_app.events.publish(LOG_ENTRY_DELETED, self.strain_var.get())
                 dialog.destroy()
                 messagebox.showinfo("Success", "Entry deleted successfully!")
 
@@ -377,28 +400,17 @@ class GrowLogManager:
             self.log_tree.delete(item)
 
         if selected_strain and selected_strain != "Select Strain":
-            # Filter and sort entries with validation
-            filtered_entries = []
-            for entry in self.grow_log:
-                try:
-                    if (isinstance(entry, dict) and 
-                        entry.get('strain') == selected_strain and 
-                        (selected_stage == "All" or entry.get('stage') == selected_stage)):
-                        filtered_entries.append(entry)
-                except Exception:
-                    continue  # Skip invalid entries
-            
-            # Sort by date with validation
-            try:
-                filtered_entries.sort(key=lambda x: datetime.strptime(x.get('date', '1900-01-01'), '%Y-%m-%d'))
-            except Exception:
-                # If sorting fails, leave unsorted
-                pass
+            # The index already holds the strain's entries sorted by date
+            filtered_entries = self.log_index.entries_for(selected_strain)
+            if selected_stage != "All":
+                filtered_entries = [entry for entry in filtered_entries if entry.get('stage') == selected_stage]
+
+            filtered_entries = self.apply_log_filter(filtered_entries)
 
             # Update entries in treeview with validation
             for entry in filtered_entries:
                 try:
-                    self.log_tree.insert('', 'end', values=(
+                    self.log_tree.insert('', 'end', iid=entry['id'], values=(
                         entry.get('date', 'No Date'),
                         entry.get('stage', 'Unknown'),
                         entry.get('activity_type', 'Unknown'),
@@ -408,11 +420,19 @@ class GrowLogManager:
                 except Exception:
                     continue  # Skip problematic entries
 
-            # Update progress information
-            if filtered_entries:
-                self.update_progress_info(filtered_entries)
-            else:
-                self.clear_progress_info()
+            # Update progress information from the strain's whole log, not just the filtered rows
+            self.update_progress_info(selected_strain)
+
+    def apply_log_filter(self, entries):
+        """Narrow entries with the query typed into the Filter box"""
+        query_text = self.filter_var.get().strip()
+        if not query_text:
+            return entries
+        try:
+            return filter_log(query_text, entries)
+        except QueryError as e:
+            messagebox.showerror("Invalid Filter", str(e))
+            return entries
 
     def clear_progress_info(self):
         """Clear all progress information labels"""
@@ -420,42 +440,23 @@ class GrowLogManager:
         self.stage_label.config(text="Current Stage: N/A")
         self.harvest_label.config(text="Expected Harvest: N/A")
 
-    def update_progress_info(self, entries):
-        if not entries:
-            self.days_label.config(text="Days in current stage: N/A")
-            self.stage_label.config(text="Current Stage: N/A")
-            self.harvest_label.config(text="Expected Harvest: N/A")
+    def update_progress_info(self, strain_name):
+        # The app's timeline engine caches each strain's current stage run
+        timeline = self.main_app.stage_timelines.timeline(strain_name)
+        if timeline is None:
+            self.clear_progress_info()
             return
 
-        # Get current stage from most recent entry
-        current_stage = entries[-1]['stage']
-        current_date = datetime.strptime(entries[-1]['date'], '%Y-%m-%d')
-        
-        # Find when this stage started
-        stage_start = current_date
-        for entry in reversed(entries):
-            if entry['stage'] != current_stage:
-                stage_start = datetime.strptime(entry['date'], '%Y-%m-%d')
-                break
-
-        # Calculate days in current stage
-        days_in_stage = (datetime.now() - stage_start).days
-
         # Update labels
-        self.days_label.config(text=f"Days in current stage: {days_in_stage}")
-        self.stage_label.config(text=f"Current Stage: {current_stage}")
-
-        # Calculate expected harvest date if in flowering
-        if current_stage == "Flowering":
-            strain_name = self.strain_var.get()
-            if strain_name in self.plant_genetics:
-                flowering_time = self.plant_genetics[strain_name].get('flowering_time', 'Unknown')
-                if flowering_time.isdigit():
-                    days_to_harvest = int(flowering_time) - days_in_stage
-                    if days_to_harvest > 0:
-                        harvest_date = datetime.now() + timedelta(days=days_to_harvest)
-                        self.harvest_label.config(text=f"Expected Harvest: {harvest_date.strftime('%Y-%m-%d')}")
-                        return
+        self.days_label.config(text=f"Days in current stage: {timeline.days_in_stage}")
+        self.stage_label.config(text=f"Current Stage: {timeline.stage}")
+
+        # Show the expected harvest if in flowering and it is still ahead
+        if timeline.stage == "Flowering":
+            window = timeline.harvest_window()
+            if window is not None and window[1] > date.today():
+                self.harvest_label.config(text=f"Expected Harvest: {format_harvest_window(window)}")
+                return
             self.harvest_label.config(text="Expected Harvest: Unknown")
         else:
             self.harvest_label.config(text="Expected Harvest: N/A")
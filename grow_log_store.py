@@ -0,0 +1,60 @@
+# grow_log_store.py
+import json
+import os
+from executor import write_json_text
+from log_index import GrowLogIndex, ingest_log
+
+
+class GrowLogStore:
+    """
+    The grow log: its entries, the rows set aside when loading (written back
+    untouched) and the GrowLogIndex over the entries. The apps load it on
+    first use and hand the same store to the Grow Log tab, clone windows and
+    engines, so there is one copy of the log and none of them needs a tab
+    built to reach it. Changes go through add(), add_many(), update() and
+    delete(), which keep the index in step; save() queues the whole log on
+    the app's background writer so saves stay ordered.
+    """
+
+    def __init__(self, path, executor):
+        self.path = path
+        self.executor = executor
+        # Set when the file isn't JSON at all; the log then starts empty
+        self.error = None
+        # Rows that fail validation are set aside in self.quarantined; `problems` describes them
+        self.entries, self.quarantined, self.problems = self.load()
+        self.index = GrowLogIndex(lambda: self.entries)
+
+    def load(self):
+        """(entries, quarantined, problems) read from the file; a missing file is an empty log."""
+        if not os.path.exists(self.path):
+            return [], [], []
+        try:
+            with open(self.path, 'r') as file:
+                rows = json.load(file)
+        except json.JSONDecodeError:
+            self.error = f"Failed to decode {os.path.basename(self.path)}. Starting with empty grow log."
+            return [], [], []
+        return ingest_log(rows)
+
+    def add(self, entry):
+        self.entries.append(entry)
+        self.index.add(entry)
+
+    def add_many(self, entries):
+        """Adds a batch of entries with one index update, e.g. from a bulk log entry."""
+        self.entries.extend(entries)
+        self.index.add_many(entries)
+
+    def update(self, entry):
+        """Call after editing an entry in place."""
+        self.index.update(entry)
+
+    def delete(self, entry):
+        """Removes an entry from the log; False if it wasn't there."""
+        return self.index.delete(entry)
+
+    def save(self, on_error=None):
+        # Serialize now, write on the background writer
+        text = json.dumps(self.entries + self.quarantined, indent=4)
+        self.executor.submit_write(write_json_text, self.path, text, on_error=on_error)
@@ -0,0 +1,32 @@
+# lineage_render.py
+"""
+Lineage tree rendering that runs in a worker process. Only plain data crosses
+the process boundary: the DOT source goes in and PNG bytes come back, so the
+Tk thread just has to wrap the bytes in a PhotoImage.
+"""
+import io
+
+MAX_TREE_WIDTH = 1200
+MAX_TREE_HEIGHT = 1200
+
+
+def render_lineage_png(dot_source, max_width=MAX_TREE_WIDTH, max_height=MAX_TREE_HEIGHT):
+    """
+    Renders `dot_source` with Graphviz and returns PNG bytes, scaled down to fit
+    within max_width x max_height.
+    """
+    import graphviz
+    from PIL import Image
+
+    png = graphviz.Source(dot_source).pipe(format="png")
+    img = Image.open(io.BytesIO(png))
+    img_width, img_height = img.size
+
+    # Resize image if it's too large
+    if img_width > max_width or img_height > max_height:
+        ratio = min(max_width / img_width, max_height / img_height)
+        img = img.resize((int(img_width * ratio), int(img_height * ratio)), Image.LANCZOS)
+        output = io.BytesIO()
+        img.save(output, format="PNG")
+        png = output.getvalue()
+    return png
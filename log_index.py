@@ -0,0 +1,219 @@
+# log_index.py
+import re
+import uuid
+from bisect import bisect_left, bisect_right
+from datetime import date, time
+
+# "2024-12-25", optionally followed by " 21:14" or " 21:14:08" (a "T" separator is accepted too)
+LOG_DATE_PATTERN = re.compile(r"(\d{4})-(\d{2})-(\d{2})(?:[ T](\d{2}):(\d{2})(?::(\d{2}))?)?")
+NO_TIME = -1  # Sorts date-only entries before timed entries of the same day
+
+
+def parse_log_date(value):
+    """
+    Parses a log date strictly into (day ordinal, seconds since midnight),
+    with NO_TIME when only a date was given. Raises ValueError for anything
+    else, including dates with text around them.
+    """
+    match = LOG_DATE_PATTERN.fullmatch(value.strip()) if isinstance(value, str) else None
+    if match is None:
+        raise ValueError(f"Unrecognized date {value!r}")
+    year, month, day, hour, minute, second = match.groups()
+    ordinal = date(int(year), int(month), int(day)).toordinal()
+    if hour is None:
+        return ordinal, NO_TIME
+    moment = time(int(hour), int(minute), int(second or 0))
+    return ordinal, moment.hour * 3600 + moment.minute * 60 + moment.second
+
+
+def new_entry_id():
+    """A fresh, permanent ID for a grow log entry."""
+    return uuid.uuid4().hex
+
+
+def check_log_entry(entry):
+    """Returns why a grow log row can't be used, or None when it is valid."""
+    if not isinstance(entry, dict):
+        return "not an object"
+    strain = entry.get('strain')
+    if not isinstance(strain, str) or not strain.strip():
+        return "missing strain"
+    try:
+        parse_log_date(entry.get('date'))
+    except ValueError:
+        return f"bad date {entry.get('date')!r}"
+    return None
+
+
+def ingest_log(rows):
+    """
+    Splits rows read from grow_log.json into (entries, quarantined, problems).
+    Only `entries` are shown, sorted or used for date arithmetic; quarantined
+    rows are kept as they were so they can be written back untouched.
+    `problems` describes each quarantined row for the user. Valid entries
+    without an ID, or whose ID is already taken, are given a new one.
+    """
+    if not isinstance(rows, list):
+        return [], [rows], ["grow log is not a list"]
+    entries, quarantined, problems = [], [], []
+    seen_ids = set()
+    for position, row in enumerate(rows):
+        reason = check_log_entry(row)
+        if reason is None:
+            if not isinstance(row.get('id'), str) or row['id'] in seen_ids:
+                row['id'] = new_entry_id()
+            seen_ids.add(row['id'])
+            entries.append(row)
+        else:
+            quarantined.append(row)
+            problems.append(f"Row {position + 1}: {reason}")
+    return entries, quarantined, problems
+
+
+class StrainLog:
+    """One strain's entries, kept sorted by (day ordinal, time, insertion order)."""
+
+    def __init__(self):
+        self.keys = []
+        self.entries = []
+
+    def insert(self, key, entry):
+        position = bisect_right(self.keys, key)
+        self.keys.insert(position, key)
+        self.entries.insert(position, entry)
+
+    def remove(self, key, entry):
+        position = bisect_left(self.keys, key)
+        while position < len(self.keys) and self.keys[position] == key:
+            if self.entries[position] is entry:
+                del self.keys[position]
+                del self.entries[position]
+                return True
+            position += 1
+        return False
+
+
+class GrowLogIndex:
+    """
+    Maps strain -> its grow log entries sorted by date, so per-strain views
+    need no scan or sort, date windows are a binary search and the latest
+    entry is a constant-time lookup.
+
+    Every entry carries an immutable 'id' (assigned by add() if missing), and
+    get() finds an entry by ID in constant time, so edits and deletes address
+    exactly one row even when several look alike.
+
+    `source` is a callable returning the grow log list. Entries must have
+    passed check_log_entry(); whoever mutates the log reports it through
+    add(), update() and remove(), or calls rebuild() after bulk changes.
+    Dates are parsed once, here, and every ordering or day count is done on
+    the stored integers.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.rebuild()
+
+    def rebuild(self):
+        self.strains = {}
+        self.by_id = {}      # entry ID -> entry
+        self.locations = {}  # entry ID -> (strain, (day ordinal, time, sequence))
+        self.sequence = 0
+        for entry in self.source():
+            if isinstance(entry, dict):
+                self.add(entry)
+
+    def add(self, entry):
+        """Files an entry already in the log list."""
+        if not entry.get('id') or entry['id'] in self.by_id:
+            entry['id'] = new_entry_id()
+        strain = entry.get('strain')
+        # The sequence number keeps entries with the same date and time in insertion order
+        key = parse_log_date(entry.get('date')) + (self.sequence,)
+        self.sequence += 1
+        self.strains.setdefault(strain, StrainLog()).insert(key, entry)
+        self.by_id[entry['id']] = entry
+        self.locations[entry['id']] = (strain, key)
+
+    def add_many(self, entries):
+        """Files a batch of new entries just appended to the log list, e.g. from a bulk log entry."""
+        for entry in entries:
+            self.add(entry)
+
+    def remove(self, entry):
+        location = self.locations.pop(entry.get('id'), None)
+        if location is None:
+            return False
+        del self.by_id[entry['id']]
+        strain, key = location
+        strain_log = self.strains.get(strain)
+        if strain_log is None or not strain_log.remove(key, entry):
+            return False
+        if not strain_log.entries:
+            del self.strains[strain]
+        return True
+
+    def update(self, entry):
+        """Re-files an entry after its date or strain was edited in place; its ID is kept."""
+        self.remove(entry)
+        self.add(entry)
+
+    def delete(self, entry):
+        """
+        Removes an entry from the index and from the log list. The rest of
+        the list keeps its order, which is the order of grow_log.json, so the
+        file stays in the order entries were added. Finding and removing the
+        row is one pass over the list at C speed, less than the save that
+        follows every delete. Returns False if the entry wasn't in the index.
+        """
+        if not self.remove(entry):
+            return False
+        log = self.source()
+        try:
+            # IDs are unique, so the only row equal to the entry is the entry itself
+            del log[log.index(entry)]
+        except ValueError:
+            pass  # Already taken out of the list by the caller
+        return True
+
+    def get(self, entry_id):
+        """The entry with `entry_id`, or None."""
+        return self.by_id.get(entry_id)
+
+    def sort_key(self, entry):
+        """The entry's (day ordinal, time, sequence) key, for ordering entries across strains."""
+        return self.locations[entry['id']][1]
+
+    def day(self, entry):
+        """The entry's day ordinal."""
+        return self.locations[entry['id']][1][0]
+
+    def strain_names(self):
+        return list(self.strains)
+
+    def entries_for(self, strain):
+        """The strain's entries, oldest first."""
+        strain_log = self.strains.get(strain)
+        return list(strain_log.entries) if strain_log else []
+
+    def between(self, strain, start, end):
+        """Entries dated from `start` to `end` inclusive (date objects or ordinals), oldest first."""
+        strain_log = self.strains.get(strain)
+        if strain_log is None:
+            return []
+        if isinstance(start, date):
+            start = start.toordinal()
+        if isinstance(end, date):
+            end = end.toordinal()
+        low = bisect_left(strain_log.keys, (start,))
+        high = bisect_left(strain_log.keys, (end + 1,))
+        return strain_log.entries[low:high]
+
+    def latest(self, strain):
+        """The strain's most recent entry, or None."""
+        strain_log = self.strains.get(strain)
+        return strain_log.entries[-1] if strain_log else None
+
+    def count(self, strain):
+        strain_log = self.strains.get(strain)
+        return len(strain_log.entries) if strain_log else 0
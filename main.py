@@ -1,6 +1,7 @@
 # main.py
 from app import CannabisGeneticsApp
 import tkinter as tk
+import multiprocessing
 
 def main():
     root = tk.Tk()
@@ -8,4 +9,5 @@ def main():
     app.main()
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
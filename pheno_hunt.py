@@ -0,0 +1,379 @@
+# pheno_hunt.py
+"""
+Pheno hunts. Seed starts of the same cross started together (Sugermill #1
+and #2, Jedi Kush #1 to #3) are one seed batch: siblings to pick keepers
+from. Each batch is ranked by a score over traits and grow log
+observations (days to flower, days in flower, problems logged), each
+standardized within the batch, since what matters is how a pheno compares
+to its siblings. A plant's clones count towards its observations, as cuts
+are often flowered out to test a pheno while the mother stays in veg.
+"""
+import math
+import re
+from datetime import date
+from roles import split_lineage
+from timeline import entry_stage, FLOWERING_STAGE, HARVESTED_STAGES
+from traits import read_traits, TERPENES
+from events import STRAINS_RESET
+
+SEED_START = "Seed Start"  # ownership_type of a plant grown from seed
+
+# Seeds of one cross started within this many days of each other are one batch
+BATCH_WINDOW_DAYS = 14
+
+# Share of a batch (at least one plant) marked as keepers
+KEEPER_SHARE = 0.25
+
+# Log entries that count as a problem: the monolith's statuses and activity
+PROBLEM_STATUSES = {"Needs Attention", "Problems", "Critical"}
+PROBLEM_ACTIVITIES = {"Problem Found"}
+
+# "10/20/24" in a record's notes: the day the plant was entered
+NOTES_DATE_PATTERN = re.compile(r"\b(\d{1,2})/(\d{1,2})/(\d{4}|\d{2})\b")
+# "Sugermill #2" -> "Sugermill"
+NUMBERED_NAME_PATTERN = re.compile(r"^(.*?)\s*#\s*\d+$")
+
+MAXIMIZE = 1
+MINIMIZE = -1
+
+
+class HuntMetric:
+    """One scored observation: better when higher (MAXIMIZE) or lower (MINIMIZE), and its weight."""
+
+    __slots__ = ("name", "label", "direction", "weight")
+
+    def __init__(self, name, label, direction, weight=1.0):
+        self.name = name
+        self.label = label
+        self.direction = direction
+        self.weight = weight
+
+    def __repr__(self):
+        return f"HuntMetric({self.name!r})"
+
+
+HUNT_METRICS = (
+    HuntMetric("thc", "THC %", MAXIMIZE, 1.0),
+    HuntMetric("yield_gm2", "Yield g/m2", MAXIMIZE, 1.0),
+    HuntMetric("terpenes", "Terpenes %", MAXIMIZE, 0.5),
+    HuntMetric("days_to_flower", "Days to Flower", MINIMIZE, 0.5),
+    HuntMetric("flower_days", "Days in Flower", MINIMIZE, 0.5),
+    HuntMetric("problems", "Problems Logged", MINIMIZE, 1.0),
+)
+
+
+def notes_day(notes):
+    """Day ordinal of the first m/d/y date in a record's notes, or None."""
+    match = NOTES_DATE_PATTERN.search(notes or "")
+    if match is None:
+        return None
+    month, day, year = (int(part) for part in match.groups())
+    if year < 100:
+        year += 2000
+    try:
+        return date(year, month, day).toordinal()
+    except ValueError:
+        return None
+
+
+def is_problem(entry):
+    return entry.get('status') in PROBLEM_STATUSES or entry.get('activity_type') in PROBLEM_ACTIVITIES
+
+
+def log_summary(index, name):
+    """(first day, first flowering day, first harvest day, problem count, entry count) of one plant's log."""
+    first = flowering = harvest = None
+    problems = 0
+    entries = index.entries_for(name)
+    for entry in entries:
+        day = index.day(entry)
+        stage = entry_stage(entry)
+        if first is None:
+            first = day
+        if flowering is None and stage == FLOWERING_STAGE:
+            flowering = day
+        if harvest is None and stage in HARVESTED_STAGES:
+            harvest = day
+        if is_problem(entry):
+            problems += 1
+    return first, flowering, harvest, problems, len(entries)
+
+
+def batch_group(name, details):
+    """
+    What a plant's siblings share: the parents of its cross (in either
+    order), or its name without the "#n" when the lineage is unknown.
+    """
+    parents = split_lineage(details.get('lineage', ''))
+    if parents:
+        return tuple(sorted(parents))
+    match = NUMBERED_NAME_PATTERN.match(name)
+    return ("#", match.group(1) if match else name)
+
+
+class PhenoPlant:
+    """A seed start's batch group, start day and metric values (None when not observed)."""
+
+    __slots__ = ("name", "group", "lineage", "start", "values", "clones")
+
+    def __init__(self, name, group, lineage, start, values, clones):
+        self.name = name
+        self.group = group
+        self.lineage = lineage
+        self.start = start      # Day ordinal: the earlier of the notes date and the first log entry
+        self.values = values    # {metric name: float or None}
+        self.clones = clones    # Clones whose logs were counted
+
+
+class PhenoRanking:
+    """One plant's place in its batch."""
+
+    __slots__ = ("batch", "name", "rank", "score", "keeper", "values")
+
+    def __init__(self, batch, name, rank, score, keeper, values):
+        self.batch = batch
+        self.name = name
+        self.rank = rank
+        self.score = score      # Weighted mean of the plant's within-batch z-scores, better is higher
+        self.keeper = keeper
+        self.values = values
+
+
+class SeedBatch:
+    """
+    Siblings from one cross started together. Rankings are computed from
+    the members' values on the first read and kept until a member's
+    observations change; a batch is a handful of plants, so each metric's
+    mean and spread are recomputed from its members rather than kept as
+    running sums, which drift as edits are added and taken back out.
+    """
+
+    def __init__(self, group, lineage, members, plants, metrics):
+        self.group = group
+        self.lineage = lineage
+        self.members = sorted(members)
+        self.metrics = metrics
+        starts = [plants[name].start for name in self.members if plants[name].start is not None]
+        self.start = min(starts) if starts else None
+        bases = {NUMBERED_NAME_PATTERN.match(name).group(1) if NUMBERED_NAME_PATTERN.match(name) else None
+                 for name in self.members}
+        base = bases.pop() if len(bases) == 1 else None
+        self.label = base or lineage
+        self.rankings = None
+
+    def spread(self, metric, plants):
+        """(mean, standard deviation) of a metric over the members that have it, or None."""
+        values = [plants[name].values.get(metric) for name in self.members]
+        values = [value for value in values if value is not None]
+        if len(values) < 2:
+            return None
+        mean = sum(values) / len(values)
+        std = math.sqrt(sum((value - mean) ** 2 for value in values) / len(values))
+        return (mean, std) if std > 1e-9 else None
+
+    def rank(self, plants):
+        """PhenoRankings of the members, best first."""
+        if self.rankings is not None:
+            return self.rankings
+        spreads = {metric.name: self.spread(metric.name, plants) for metric in self.metrics}
+        informative = [metric for metric in self.metrics if spreads[metric.name] is not None]
+        total_weight = sum(metric.weight for metric in informative)
+        scored = []
+        for name in self.members:
+            values = plants[name].values
+            score = 0.0
+            for metric in informative:
+                value = values.get(metric.name)
+                if value is not None:  # Not observed counts as the batch average
+                    mean, std = spreads[metric.name]
+                    score += metric.weight * metric.direction * (value - mean) / std
+            scored.append((score / total_weight if total_weight else 0.0, name))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        keepers = max(1, round(len(scored) * KEEPER_SHARE)) if informative else 0
+        self.rankings = [PhenoRanking(self, name, rank + 1, score, rank < keepers, plants[name].values)
+                         for rank, (score, name) in enumerate(scored)]
+        return self.rankings
+
+
+class PhenoHuntEngine:
+    """
+    Seed batches and their rankings, kept current from strain and grow log
+    events: an event re-reads only the plants it touches (a clone's log
+    counts for the plant it was cut from). A plant whose observations
+    changed only clears its batch's rankings; only a change of cross or
+    start date regroups that cross's seed starts. `source` returns the
+    plant genetics dict, `index_source` the current GrowLogIndex,
+    `keeper_of` and `descendants_of` come from the CloneRegistry.
+    """
+
+    def __init__(self, source, index_source, keeper_of=None, descendants_of=None, metrics=HUNT_METRICS):
+        self.source = source
+        self.index_source = index_source
+        self.keeper_of = keeper_of or (lambda name: name)
+        self.descendants_of = descendants_of or (lambda name: [])
+        self.metrics = tuple(metrics)
+        self.index = None   # The log index the plants were read from
+        self.dirty = set()
+
+    def apply(self, batch):
+        """Marks the strains touched by an events.ChangeBatch (strain or log events)."""
+        if batch.has(STRAINS_RESET):
+            self.index = None
+        else:
+            self.dirty.update(batch.names())
+
+    # Reading plants
+
+    def read_plant(self, name, index):
+        details = self.source().get(name)
+        if details is None or details.get('ownership_type') != SEED_START:
+            return None
+        first, flowering, harvest, problems, logged = log_summary(index, name)
+        starts = [day for day in (notes_day(details.get('notes')), first) if day is not None]
+        start = min(starts) if starts else None
+
+        clones = [clone for clone, depth in self.descendants_of(name)]
+        flower_lengths = [harvest - flowering] if flowering is not None and harvest is not None else []
+        for clone in clones:
+            clone_first, clone_flowering, clone_harvest, clone_problems, clone_logged = log_summary(index, clone)
+            problems += clone_problems
+            logged += clone_logged
+            if clone_flowering is not None and clone_harvest is not None:
+                flower_lengths.append(clone_harvest - clone_flowering)
+
+        traits = read_traits(details)
+        terpenes = [traits[terpene] for terpene in TERPENES if terpene in traits]
+        values = {
+            "thc": traits.get("thc"),
+            "yield_gm2": traits.get("yield_gm2"),
+            "terpenes": sum(terpenes) if terpenes else None,
+            # Only when the plant was seen before it flowered
+            "days_to_flower": float(flowering - start) if flowering is not None and start is not None
+                              and flowering > start else None,
+            "flower_days": float(min(flower_lengths)) if flower_lengths else None,
+            "problems": float(problems) if logged else None,
+        }
+        return PhenoPlant(name, batch_group(name, details), details.get('lineage', ''), start, values, clones)
+
+    def rebuild(self, index):
+        self.index = index
+        self.dirty = set()
+        self.plants = {}         # name -> PhenoPlant
+        self.groups = {}         # batch group -> names
+        self.group_batches = {}  # batch group -> [SeedBatch]
+        self.batch_of = {}       # name -> SeedBatch
+        self.clone_owner = {}    # clone name -> seed start whose observations include it
+        for name in self.source():
+            plant = self.read_plant(name, index)
+            if plant is not None:
+                self.store(plant)
+        for group in self.groups:
+            self.regroup(group)
+
+    def store(self, plant):
+        self.plants[plant.name] = plant
+        self.groups.setdefault(plant.group, set()).add(plant.name)
+        for clone in plant.clones:
+            self.clone_owner[clone] = plant.name
+
+    def drop(self, name):
+        plant = self.plants.pop(name, None)
+        if plant is None:
+            return None
+        members = self.groups.get(plant.group)
+        if members is not None:
+            members.discard(name)
+            if not members:
+                del self.groups[plant.group]
+        for clone in plant.clones:
+            if self.clone_owner.get(clone) == name:
+                del self.clone_owner[clone]
+        return plant
+
+    def regroup(self, group):
+        """Splits a cross's seed starts into batches by start date."""
+        for batch in self.group_batches.pop(group, ()):
+            for name in batch.members:
+                if self.batch_of.get(name) is batch:
+                    del self.batch_of[name]
+        names = self.groups.get(group)
+        if not names:
+            return
+        dated = sorted((self.plants[name].start, name) for name in names if self.plants[name].start is not None)
+        clusters = []
+        for start, name in dated:
+            if clusters and start - clusters[-1][-1][0] <= BATCH_WINDOW_DAYS:
+                clusters[-1].append((start, name))
+            else:
+                clusters.append([(start, name)])
+        member_lists = [[name for start, name in cluster] for cluster in clusters]
+        undated = [name for name in names if self.plants[name].start is None]
+        if undated:
+            member_lists.append(undated)
+        batches = []
+        for members in member_lists:
+            batch = SeedBatch(group, self.plants[members[0]].lineage, members, self.plants, self.metrics)
+            for name in members:
+                self.batch_of[name] = batch
+            batches.append(batch)
+        self.group_batches[group] = batches
+
+    def refresh(self):
+        """Brings plants and batches up to date with the marked changes."""
+        index = self.index_source()
+        if index is not self.index:
+            self.rebuild(index)
+            return
+        if not self.dirty:
+            return
+        names = set()
+        for name in self.dirty:
+            names.add(name)
+            names.add(self.keeper_of(name))
+            if name in self.clone_owner:
+                names.add(self.clone_owner[name])
+        self.dirty = set()
+
+        regroup = set()
+        for name in names:
+            old = self.drop(name)
+            plant = self.read_plant(name, index)
+            if plant is not None:
+                self.store(plant)
+            if old is not None and plant is not None and (old.group, old.start) == (plant.group, plant.start):
+                self.batch_of[name].rankings = None
+                continue
+            if old is not None:
+                regroup.add(old.group)
+            if plant is not None:
+                regroup.add(plant.group)
+        for group in regroup:
+            self.regroup(group)
+
+    # Reads
+
+    def batches(self):
+        """Every seed batch, most recently started first (undated last); single plants aren't a hunt."""
+        self.refresh()
+        found = [batch for batches in self.group_batches.values() for batch in batches if len(batch.members) > 1]
+        found.sort(key=lambda batch: (batch.start is None, -(batch.start or 0), batch.label))
+        return found
+
+    def rankings(self, batch):
+        self.refresh()
+        return batch.rank(self.plants)
+
+    def ranking(self, name):
+        """The PhenoRanking of one seed start, or None if it isn't in a batch with siblings."""
+        self.refresh()
+        batch = self.batch_of.get(name)
+        if batch is None or len(batch.members) < 2:
+            return None
+        for ranking in batch.rank(self.plants):
+            if ranking.name == name:
+                return ranking
+        return None
+
+    def report(self):
+        """Rankings of every batch, batch by batch, best first within each."""
+        return [ranking for batch in self.batches() for ranking in batch.rank(self.plants)]
@@ -0,0 +1,246 @@
+# punnett.py
+"""
+Genotype ratios at tracked loci (see read_genotypes in traits.py) for a
+cross and the generations bred from it: F1, F2 and later sib-mated
+generations, and backcrosses to either parent. Every locus of a cross is
+projected at once: a locus is a row of allele frequencies padded to the
+widest allele set, a generation is a batched outer product of the two
+sides' gametes, and genotype ratios come out as (loci x alleles x alleles)
+arrays. Loci are assumed to assort independently, apart from sex: loci
+carrying a Y allele follow the sex chromosomes, so each generation is bred
+from its own females and males and those loci are independent only within
+one sex. Projections are cached per parent pair until either parent is
+edited. Imported on first use, like the trait store.
+"""
+import re
+import numpy as np
+from traits import read_genotypes, LOCI, Y_ALLELE
+from events import STRAINS_RESET
+
+F1 = "F1"
+# "F2", "F3", ... (sib-mated) and "BC1", "BC2", ... (backcrossed to the recurrent parent)
+GENERATION_PATTERN = re.compile(r"(F|BC)(\d+)$")
+MAX_GENERATION = 20
+
+FEMALE = "female"
+MALE = "male"
+
+
+def parse_generation(generation):
+    """("F", n) or ("BC", n) for a generation name, raising ValueError for anything else."""
+    match = GENERATION_PATTERN.match(str(generation).upper().strip())
+    if match is None or not 1 <= int(match.group(2)) <= MAX_GENERATION:
+        raise ValueError(f"Unknown generation {generation!r}; expected F1-F{MAX_GENERATION} "
+                         f"or BC1-BC{MAX_GENERATION}")
+    return match.group(1), int(match.group(2))
+
+
+def cross(first_gametes, second_gametes):
+    """
+    Genotype matrix of the offspring of two sets of gametes, one
+    (alleles,) frequency row per locus: symmetric, so entry [a, b] plus
+    [b, a] is the share of a/b offspring.
+    """
+    ordered = np.einsum("la,lb->lab", first_gametes, second_gametes)
+    return (ordered + ordered.transpose(0, 2, 1)) / 2
+
+
+class LocusSet:
+    """
+    The loci two parents were both typed at, their allele sets, and the
+    arrays a projection works on: each parent's gametes and which
+    genotypes carry Y.
+    """
+
+    def __init__(self, first, second):
+        self.loci = sorted(set(first) & set(second))
+        self.alleles = [sorted(set(first[locus]) | set(second[locus])) for locus in self.loci]
+        width = max((len(alleles) for alleles in self.alleles), default=1)
+        self.first = self.gametes(first, width)
+        self.second = self.gametes(second, width)
+        # carries_y[l, a, b]: genotype a/b at locus l carries a Y allele
+        y_index = np.array([alleles.index(Y_ALLELE) if Y_ALLELE in alleles else -1 for alleles in self.alleles])
+        positions = np.arange(width)
+        has_y = (positions[None, :] == y_index[:, None]) & (y_index[:, None] >= 0)
+        self.carries_y = has_y[:, :, None] | has_y[:, None, :]
+        self.sex_linked = y_index >= 0
+
+    def gametes(self, genotypes, width):
+        """(loci, width) gamete frequencies of one parent: half of each of its alleles."""
+        rows = np.repeat(np.arange(len(self.loci)), 2)
+        columns = [alleles.index(allele) for locus, alleles in zip(self.loci, self.alleles)
+                   for allele in genotypes[locus]]
+        gametes = np.zeros((len(self.loci), width))
+        np.add.at(gametes, (rows, columns), 0.5)
+        return gametes
+
+    def population_gametes(self, genotypes, sex=None):
+        """
+        Gametes of a population with genotype matrix `genotypes`, from its
+        females or males only when `sex` is given. At loci where that sex
+        doesn't occur (an all-female feminized line, or any locus without Y
+        when asking for males) the whole population is used.
+        """
+        if sex is not None:
+            chosen = genotypes * (self.carries_y if sex == MALE else ~self.carries_y)
+            totals = chosen.sum(axis=(1, 2))
+            present = totals > 0
+            genotypes = np.where(present[:, None, None], chosen / np.where(present, totals, 1)[:, None, None],
+                                 genotypes)
+        return genotypes.sum(axis=2)
+
+
+class GenotypeProjection:
+    """Genotype ratios of one generation, per locus."""
+
+    def __init__(self, first, second, generation, loci, alleles, genotypes, carries_y):
+        self.first = first
+        self.second = second
+        self.generation = generation
+        self.loci = loci
+        self.alleles = alleles        # Allele symbols per locus, in matrix order
+        self.genotypes = genotypes    # (loci, alleles, alleles) symmetric genotype matrices
+        self.carries_y = carries_y    # (loci, alleles, alleles): genotype is male
+
+    def ratios(self, locus):
+        """[(genotype, share, phenotype or None)] at `locus`, most common first."""
+        index = self.loci.index(locus)
+        matrix, alleles = self.genotypes[index], self.alleles[index]
+        known = LOCI.get(locus)
+        found = []
+        for a in range(len(alleles)):
+            for b in range(a, len(alleles)):
+                share = matrix[a, a] if a == b else matrix[a, b] + matrix[b, a]
+                if share > 1e-12:
+                    genotype = (alleles[a], alleles[b])
+                    found.append((genotype, float(share), known.phenotype(genotype) if known else None))
+        found.sort(key=lambda item: -item[1])
+        return found
+
+    def phenotype_ratios(self, locus):
+        """{phenotype: share} at a known locus, or {} for loci without phenotypes."""
+        shares = {}
+        for genotype, share, phenotype in self.ratios(locus):
+            if phenotype is not None:
+                shares[phenotype] = shares.get(phenotype, 0.0) + share
+        return shares
+
+    def matching(self, index, target):
+        """(alleles, alleles) mask of the genotypes at locus `index` matching a genotype or phenotype."""
+        alleles = self.alleles[index]
+        known = LOCI.get(self.loci[index])
+        mask = np.zeros(self.genotypes[index].shape, dtype=bool)
+        if not isinstance(target, str):
+            target = tuple(sorted(target))
+        for a in range(len(alleles)):
+            for b in range(len(alleles)):
+                genotype = (alleles[a], alleles[b])
+                if isinstance(target, str):
+                    mask[a, b] = known is not None and known.phenotype(genotype) == target
+                else:
+                    mask[a, b] = tuple(sorted(genotype)) == target
+        return mask
+
+    def probability(self, wanted):
+        """
+        Share of offspring matching every {locus: genotype or phenotype} in
+        `wanted`. Loci without Y multiply since they assort independently;
+        loci carrying Y (sex and sex-linked markers) all follow the same sex
+        chromosomes, so they are multiplied within each sex and the sexes
+        summed. 0 when a locus wasn't typed in both parents.
+        """
+        probability = 1.0
+        sex_linked = []
+        for locus, target in wanted.items():
+            if locus not in self.loci:
+                return 0.0
+            index = self.loci.index(locus)
+            mask = self.matching(index, target)
+            if self.carries_y[index].any():
+                sex_linked.append((index, mask))
+            else:
+                probability *= float((self.genotypes[index] * mask).sum())
+        if not sex_linked:
+            return probability
+        joint = 0.0
+        for male in (False, True):
+            # Every Y-carrying locus gives the same share of each sex
+            in_sex = [self.carries_y[index] == male for index, mask in sex_linked]
+            share = float((self.genotypes[sex_linked[0][0]] * in_sex[0]).sum())
+            if share <= 1e-12:
+                continue
+            within = share
+            for (index, mask), chosen in zip(sex_linked, in_sex):
+                within *= float((self.genotypes[index] * (mask & chosen)).sum()) / share
+            joint += within
+        return probability * joint
+
+
+class PunnettProjector:
+    """
+    Projects genotype ratios for crosses between strains in the plant
+    genetics dict (`source` is a callable returning it). Each parent pair's
+    locus arrays and every generation asked of it are cached; strain events
+    drop the pairs involving the strains they touch.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.pairs = {}  # (name, name) sorted -> {"loci": LocusSet or None, generation key: GenotypeProjection}
+
+    def apply(self, batch):
+        """Drops cached pairs touched by an events.ChangeBatch."""
+        if batch.has(STRAINS_RESET):
+            self.pairs = {}
+            return
+        touched = batch.names()
+        self.pairs = {pair: cached for pair, cached in self.pairs.items() if touched.isdisjoint(pair)}
+
+    def genotypes(self, name):
+        details = self.source().get(name)
+        if details is None:
+            raise KeyError(f"Unknown strain {name!r}")
+        return read_genotypes(details)
+
+    def project(self, first, second, generation=F1, recurrent=None):
+        """
+        Genotype ratios of `generation` of first x second: "F1", "F2"... or
+        "BC1", "BC2"... backcrossed to `recurrent` (one of the two parents,
+        `first` by default). Only loci typed in both parents are projected.
+        """
+        kind, count = parse_generation(generation)
+        if kind == "BC":
+            recurrent = first if recurrent is None else recurrent
+            if recurrent not in (first, second):
+                raise ValueError(f"Backcross parent {recurrent!r} must be one of the two parents")
+        pair = (first, second) if first <= second else (second, first)
+        cached = self.pairs.setdefault(pair, {})
+        key = (kind, count, recurrent if kind == "BC" else None)
+        if key in cached:
+            return cached[key]
+
+        if "loci" not in cached:
+            cached["loci"] = LocusSet(self.genotypes(pair[0]), self.genotypes(pair[1]))
+        loci = cached["loci"]
+        if key == ("F", 1, None):
+            genotypes = cross(loci.first, loci.second)
+        elif kind == "F":
+            parents = self.project(first, second, f"F{count - 1}").genotypes
+            genotypes = cross(loci.population_gametes(parents, FEMALE), loci.population_gametes(parents, MALE))
+        else:
+            parents = self.project(first, second, f"BC{count - 1}", recurrent).genotypes if count > 1 \
+                else self.project(first, second, F1).genotypes
+            # The recurrent parent is crossed with offspring of the other sex where that matters
+            recurrent_gametes = loci.first if recurrent == pair[0] else loci.second
+            recurrent_is_male = self.source()[recurrent].get('gender') == 'Male'
+            genotypes = cross(loci.population_gametes(parents, FEMALE if recurrent_is_male else MALE),
+                              recurrent_gametes)
+        projection = GenotypeProjection(first, second, f"{kind}{count}", loci.loci, loci.alleles, genotypes,
+                                        loci.carries_y)
+        cached[key] = projection
+        return projection
+
+
+def project_cross(plant_genetics, first, second, generation=F1, recurrent=None):
+    """One-off projection for scripts: genotype ratios of first x second in `generation`."""
+    return PunnettProjector(lambda: plant_genetics).project(first, second, generation, recurrent)
@@ -0,0 +1,477 @@
+# query.py
+import re
+from functools import lru_cache
+from traits import parse_flowering_time, read_traits, TRAIT_SCHEMA
+
+# A small filter language shared by the Genetics search box, the Grow Log
+# filters and headless callers, e.g.
+#
+#   owned and gender=Female and parent:"Wedding Cake" and flowering_days<60
+#   log: stage=Flowering since 2024-12-01 status!=Healthy
+#   thc>=20 and myrcene>0.5 and dominance=Sativa
+#
+# Terms are joined with "and" (implicit between adjacent terms), "or" and
+# "not", and can be grouped with parentheses. A term is either a comparison
+# (field=value, !=, <, <=, >, >=, or field:value for "contains"), a date bound
+# (since/until/before DATE) or a bare word. Bare words are boolean flags when
+# the field is known ("owned", "parent", "clone") and a name/strain substring
+# match otherwise, so plain searches keep working.
+
+LOG_PREFIX = "log"
+
+DATE_KEYWORDS = ("since", "until", "before")
+
+_TOKEN_RE = re.compile(r'''
+    \s*(?:
+        (?P<quoted>"[^"]*"|'[^']*')
+      | (?P<op>!=|<=|>=|=|<|>|:)
+      | (?P<paren>[()])
+      | (?P<word>[^\s()"'!=<>:]+)
+    )''', re.VERBOSE)
+
+_NUMBER_RE = re.compile(r'-?\d+(?:\.\d+)?')
+
+_TRUE_WORDS = {"true", "yes", "y", "1"}
+_FALSE_WORDS = {"false", "no", "n", "0"}
+
+
+class QueryError(ValueError):
+    """Raised when a filter query cannot be parsed."""
+
+
+def _first_number(value):
+    """Return the first number found in a value, or None."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    match = _NUMBER_RE.search(str(value))
+    return float(match.group()) if match else None
+
+
+def _split_parents(lineage):
+    if not lineage or lineage == "Unknown":
+        return []
+    return [parent.strip() for parent in lineage.split(' x ') if parent.strip()]
+
+
+def _flowering_days(details):
+    """Shortest flowering time in days ("8-9 weeks" -> 56), or None when unknown."""
+    flowering = parse_flowering_time(details.get('flowering_time', 'Unknown'))
+    return None if flowering is None else flowering.low
+
+
+def _run_flowering_days(run, name, details):
+    """
+    flowering_days read from the traits.TraitRangeCache a plan is run with,
+    so a query over the whole collection doesn't reparse every record's
+    flowering time; parses the text when run without one.
+    """
+    trait_ranges = run.trait_ranges
+    if trait_ranges is None:
+        return _flowering_days(details)
+    days = trait_ranges.flowering_days(name)
+    return None if days is None else days[0]
+
+
+# Field getters for strain records, called as getter(name, details)
+STRAIN_FIELDS = {
+    "name": lambda name, details: name,
+    "lineage": lambda name, details: details.get('lineage', 'Unknown'),
+    "parent": lambda name, details: _split_parents(details.get('lineage', '')),
+    "yield": lambda name, details: details.get('yield', 'Unknown'),
+    "flowering_time": lambda name, details: details.get('flowering_time', 'Unknown'),
+    "flowering_days": lambda name, details: _flowering_days(details),
+    "type": lambda name, details: details.get('type', 'Unknown'),
+    "notes": lambda name, details: details.get('notes', ''),
+    "gender": lambda name, details: details.get('gender', 'Unknown'),
+    "owned": lambda name, details: details.get('owned', True),
+    "ownership_type": lambda name, details: details.get('ownership_type', 'None'),
+    "clone": lambda name, details: details.get('ownership_type') == 'Clone',
+    "seed_start": lambda name, details: details.get('ownership_type') == 'Seed Start',
+    "clone_count": lambda name, details: details.get('clone_count', 0),
+}
+
+
+def _trait_getter(column):
+    def getter(name, details):
+        value = read_traits(details).get(column)
+        # Whole numbers compare as "20", not "20.0", for "="
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        return value
+    return getter
+
+
+# Typed genetic_info traits (see traits.TRAIT_SCHEMA). A caller holding a
+# trait_store.TraitStore can pass its query_indexes() to narrow these.
+TRAIT_FIELDS = {column.name for column in TRAIT_SCHEMA}
+for _column in TRAIT_SCHEMA:
+    STRAIN_FIELDS.setdefault(_column.name, _trait_getter(_column.name))
+
+STRAIN_ALIASES = {
+    "strain": "name",
+    "flowering": "flowering_time",
+    "ownership": "ownership_type",
+    "parents": "parent",
+    "seed": "seed_start",
+    "clones": "clone_count",
+}
+
+# Field getters for grow log entries, called as getter(entry)
+LOG_FIELDS = {
+    "date": lambda entry: str(entry.get('date', ''))[:10],
+    "strain": lambda entry: entry.get('strain', ''),
+    "stage": lambda entry: entry.get('stage', 'Unknown'),
+    "activity_type": lambda entry: entry.get('activity_type', 'Unknown'),
+    "notes": lambda entry: entry.get('notes', ''),
+    "status": lambda entry: entry.get('status', 'Unknown'),
+}
+
+LOG_ALIASES = {
+    "name": "strain",
+    "activity": "activity_type",
+}
+
+# Bare words that act as boolean flags rather than substring searches
+STRAIN_FLAGS = {"owned", "clone", "seed_start"}
+
+
+def _coerce_bool(text):
+    lowered = text.lower()
+    if lowered in _TRUE_WORDS:
+        return True
+    if lowered in _FALSE_WORDS:
+        return False
+    return None
+
+
+def _compare(actual, op, expected):
+    """Compare one field value against the query operand."""
+    if isinstance(actual, (list, tuple, set)):
+        if op == "!=":
+            return all(_compare(item, "!=", expected) for item in actual)
+        return any(_compare(item, op, expected) for item in actual)
+
+    if isinstance(actual, bool):
+        wanted = _coerce_bool(expected)
+        if wanted is None:
+            return False
+        if op in ("=", ":"):
+            return actual == wanted
+        if op == "!=":
+            return actual != wanted
+        return False
+
+    if op == ":":
+        return expected.lower() in str(actual).lower()
+    if op == "=":
+        return str(actual).lower() == expected.lower()
+    if op == "!=":
+        return str(actual).lower() != expected.lower()
+
+    # Ordering comparisons are numeric when both sides contain a number,
+    # otherwise lexical (which is correct for ISO dates).
+    right = None if "-" in expected[1:] else _first_number(expected)
+    if right is None:
+        left, right = str(actual), expected
+    else:
+        left = _first_number(actual)
+        if left is None:
+            return False
+    if op == "<":
+        return left < right
+    if op == "<=":
+        return left <= right
+    if op == ">":
+        return left > right
+    if op == ">=":
+        return left >= right
+    return False
+
+
+def _tokenize(text):
+    tokens = []
+    position = 0
+    text = text.strip()
+    while position < len(text):
+        match = _TOKEN_RE.match(text, position)
+        if not match or match.end() == position:
+            raise QueryError(f"Unexpected character at position {position}: {text[position:]!r}")
+        position = match.end()
+        if match.group('quoted') is not None:
+            tokens.append(('value', match.group('quoted')[1:-1]))
+        elif match.group('op') is not None:
+            tokens.append(('op', match.group('op')))
+        elif match.group('paren') is not None:
+            tokens.append(('paren', match.group('paren')))
+        elif match.group('word') is not None:
+            tokens.append(('word', match.group('word')))
+    return tokens
+
+
+class RunContext:
+    """
+    What one run of a plan evaluates against besides the records: the
+    parent strain names and the caller's traits.TraitRangeCache. Passed to
+    the compiled predicate as its first argument, so a cached plan holds no
+    state from the callers that ran it.
+    """
+
+    __slots__ = ("parents", "trait_ranges")
+
+    def __init__(self, parents=(), trait_ranges=None):
+        self.parents = parents
+        self.trait_ranges = trait_ranges
+
+
+class QueryPlan:
+    """
+    A parsed query. `predicate` is the compiled filter, called as
+    predicate(run_context, *record); `conjuncts` lists the top-level AND-ed
+    comparisons as (field, op, value) so callers with an index can narrow the
+    candidates before the predicate runs. Plans are shared through the
+    compile cache and never change after parsing.
+    """
+
+    def __init__(self, text, target, predicate, conjuncts, uses_parents):
+        self.text = text
+        self.target = target
+        self.predicate = predicate
+        self.conjuncts = conjuncts
+        self.uses_parents = uses_parents
+
+    def __repr__(self):
+        return f"QueryPlan({self.text!r}, target={self.target!r})"
+
+    def matches(self, *record, parent_strains=(), trait_ranges=None):
+        """Evaluate one record: (name, details) for strains, (entry,) for the log."""
+        return self.predicate(RunContext(parent_strains, trait_ranges), *record)
+
+    def _candidates(self, indexes):
+        """
+        Ask the available indexes for candidates: the smallest answer, narrowed
+        to the records every other answering index also returned. An index is
+        a callable lookup(op, value) returning candidates, or None when it
+        cannot answer that operator.
+        """
+        if not indexes:
+            return None
+        answers = []
+        for field, op, value in self.conjuncts:
+            lookup = indexes.get(field)
+            if lookup is None:
+                continue
+            found = lookup(op, value)
+            if found is None:
+                continue
+            answers.append(list(found))
+        if not answers:
+            return None
+        answers.sort(key=len)
+        best = answers[0]
+        for other in answers[1:]:
+            if not best:
+                break
+            try:
+                other = set(other)
+                best = [candidate for candidate in best if candidate in other]
+            except TypeError:
+                # Log entries are dicts: intersect by identity
+                other = {id(candidate) for candidate in other}
+                best = [candidate for candidate in best if id(candidate) in other]
+        return best
+
+    def run(self, records, indexes=None, parent_strains=None, trait_ranges=None):
+        """
+        Filter records with this plan. Strain records are a name->details dict
+        and the matching names are returned; log records are a list of entries
+        and the matching entries are returned. `trait_ranges` is the caller's
+        traits.TraitRangeCache over the same records, if it keeps one.
+        """
+        candidates = self._candidates(indexes)
+        if self.target == "log":
+            run = RunContext()
+            pool = records if candidates is None else candidates
+            return [entry for entry in pool if isinstance(entry, dict) and self.predicate(run, entry)]
+
+        if self.uses_parents and parent_strains is None:
+            parent_strains = set()
+            for details in records.values():
+                parent_strains.update(_split_parents(details.get('lineage', '')))
+        run = RunContext(parent_strains if parent_strains is not None else (), trait_ranges)
+
+        pool = records.keys() if candidates is None else [name for name in candidates if name in records]
+        return [name for name in pool if self.predicate(run, name, records[name])]
+
+
+class _Parser:
+    def __init__(self, tokens, target):
+        self.uses_parents = False
+        self.tokens = tokens
+        self.position = 0
+        self.target = target
+        if target == "log":
+            self.fields, self.aliases = LOG_FIELDS, LOG_ALIASES
+        else:
+            self.fields, self.aliases = STRAIN_FIELDS, STRAIN_ALIASES
+        self.conjuncts = []
+
+    def peek(self):
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return (None, None)
+
+    def advance(self):
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def at_keyword(self, *words):
+        kind, value = self.peek()
+        return kind == 'word' and value.lower() in words
+
+    def parse(self):
+        if not self.tokens:
+            return lambda run, *record: True
+        predicate = self.parse_or(top_level=True)
+        if self.position < len(self.tokens):
+            raise QueryError(f"Unexpected token {self.peek()[1]!r}")
+        return predicate
+
+    def parse_or(self, top_level=False):
+        branches = [self.parse_and(top_level)]
+        while self.at_keyword("or"):
+            self.advance()
+            branches.append(self.parse_and(False))
+        if len(branches) == 1:
+            return branches[0]
+        # Index hints only hold for a pure conjunction
+        if top_level:
+            self.conjuncts = []
+        return lambda run, *record: any(branch(run, *record) for branch in branches)
+
+    def parse_and(self, top_level):
+        terms = [self.parse_not(top_level)]
+        while True:
+            kind, value = self.peek()
+            if kind is None or (kind == 'paren' and value == ')') or self.at_keyword("or"):
+                break
+            if self.at_keyword("and"):
+                self.advance()
+            terms.append(self.parse_not(top_level))
+        if len(terms) == 1:
+            return terms[0]
+        return lambda run, *record: all(term(run, *record) for term in terms)
+
+    def parse_not(self, top_level):
+        if self.at_keyword("not"):
+            self.advance()
+            inner = self.parse_not(False)
+            return lambda run, *record: not inner(run, *record)
+        return self.parse_term(top_level)
+
+    def parse_value(self):
+        kind, value = self.advance()
+        if kind not in ('word', 'value'):
+            raise QueryError("Expected a value")
+        return value
+
+    def resolve_field(self, name):
+        name = name.lower()
+        name = self.aliases.get(name, name)
+        return name if name in self.fields else None
+
+    def parse_term(self, top_level):
+        kind, value = self.peek()
+        if kind == 'paren' and value == '(':
+            self.advance()
+            inner = self.parse_or(False)
+            closing = self.advance()
+            if closing != ('paren', ')'):
+                raise QueryError("Missing closing parenthesis")
+            return inner
+
+        if kind == 'value':
+            self.advance()
+            return self.make_search(value)
+
+        if kind != 'word':
+            raise QueryError(f"Unexpected token {value!r}")
+
+        self.advance()
+        lowered = value.lower()
+
+        if lowered in DATE_KEYWORDS:
+            op = {"since": ">=", "until": "<=", "before": "<"}[lowered]
+            return self.make_comparison("date", op, self.parse_value(), top_level)
+
+        next_kind, next_value = self.peek()
+        if next_kind == 'op':
+            self.advance()
+            field = self.resolve_field(value)
+            if field is None:
+                raise QueryError(f"Unknown field {value!r}")
+            return self.make_comparison(field, next_value, self.parse_value(), top_level)
+
+        field = self.resolve_field(value)
+        if self.target != "log" and field in STRAIN_FLAGS:
+            return self.make_comparison(field, "=", "true", top_level)
+        if self.target != "log" and field == "parent":
+            self.uses_parents = True
+            return lambda run, name, details: name in run.parents
+        return self.make_search(value)
+
+    def make_search(self, text):
+        field = "strain" if self.target == "log" else "name"
+        return self.make_comparison(field, ":", text, False)
+
+    def make_comparison(self, field, op, value, top_level):
+        if field not in self.fields:
+            raise QueryError(f"Field {field!r} is not available for {self.target} queries")
+        getter = self.fields[field]
+        if top_level:
+            self.conjuncts.append((field, op, value))
+        if self.target == "log":
+            return lambda run, entry: _compare(getter(entry), op, value)
+        if field == "flowering_days":
+            return lambda run, name, details: _compare(_run_flowering_days(run, name, details), op, value)
+        return lambda run, name, details: _compare(getter(name, details), op, value)
+
+
+@lru_cache(maxsize=128)
+def compile_query(text, default_target="strains"):
+    """
+    Parse a query once into a QueryPlan. Plans are cached by text so repeated
+    keystrokes or refreshes do not reparse. A leading "log:" selects the grow
+    log regardless of the default target.
+    """
+    tokens = _tokenize(text or "")
+    target = default_target
+    if len(tokens) >= 2 and tokens[0] == ('word', LOG_PREFIX) and tokens[1] == ('op', ':'):
+        target = "log"
+        tokens = tokens[2:]
+    parser = _Parser(tokens, target)
+    predicate = parser.parse()
+    return QueryPlan(text, target, predicate, tuple(parser.conjuncts), parser.uses_parents)
+
+
+def filter_strains(query, plant_genetics, indexes=None, parent_strains=None, trait_ranges=None):
+    """Return the names of strains matching a query, sorted case-insensitively."""
+    plan = compile_query(query, "strains")
+    if plan.target != "strains":
+        raise QueryError("Expected a strain query")
+    return sorted(plan.run(plant_genetics, indexes, parent_strains, trait_ranges), key=lambda x: x.lower())
+
+
+def filter_log(query, grow_log, indexes=None):
+    """Return the grow log entries matching a query, in log order."""
+    plan = compile_query(query, "log")
+    if plan.target != "log":
+        raise QueryError("Expected a grow log query")
+    return plan.run(grow_log, indexes)
+
+
+def strains_with_log_matches(query, grow_log, indexes=None):
+    """Return the set of strain names that have at least one matching log entry."""
+    return {entry.get('strain') for entry in filter_log(query, grow_log, indexes)}
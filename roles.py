@@ -0,0 +1,194 @@
+# roles.py
+from array import array
+from collections import Counter
+from events import STRAIN_ADDED, STRAIN_UPDATED, STRAIN_RENAMED, STRAIN_DELETED, STRAINS_RESET
+
+# Roles are the legend keys, so a role doubles as the key into legend_colors
+OWNED_PARENT = "Owned & Parent Strain"
+PARENT = "Parent Strain"
+OWNED = "Owned Strain"
+SEED_START = "Seed Start Strain"
+CLONE = "Clone Strain"
+NOT_OWNED = "Not Owned Strain"
+
+ROLES = (OWNED_PARENT, PARENT, OWNED, SEED_START, CLONE, NOT_OWNED)
+ROLE_CODES = {role: code for code, role in enumerate(ROLES)}
+NO_ROLE = 255  # Free slot in the code array
+
+
+def split_lineage(lineage):
+    """Returns the parent names in an "A x B" lineage string."""
+    if not lineage or lineage == "Unknown":
+        return []
+    return [parent.strip() for parent in lineage.split(" x ") if parent.strip()]
+
+
+def classify(details, is_parent):
+    """
+    The one place the owned/parent/clone/seed-start decision is made.
+    """
+    is_owned = details.get('owned', True)
+    if is_parent:
+        return OWNED_PARENT if is_owned else PARENT
+    if not is_owned:
+        return NOT_OWNED
+    ownership_type = details.get('ownership_type', 'None')
+    if ownership_type == "Clone":
+        return CLONE
+    if ownership_type == "Seed Start":
+        return SEED_START
+    return OWNED
+
+
+class RoleIndex:
+    """
+    Every strain's role, computed once and kept up to date incrementally.
+
+    Each strain gets a small integer ID and its role is stored as one byte in
+    an array indexed by that ID. Parent status is tracked with reference
+    counts over the lineage fields, so changing one strain only re-classifies
+    it and the parents it gained or lost. `source` is a callable returning the
+    plant genetics dict.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.rebuild()
+
+    def rebuild(self):
+        self.ids = {}          # strain name -> ID
+        self.names = []        # ID -> strain name (None once freed)
+        self.codes = array('B')
+        self.free = []         # IDs available for reuse
+        self.lineages = {}     # strain name -> parents named in its lineage
+        self.parent_refs = Counter()
+
+        plant_genetics = self.source()
+        for name, details in plant_genetics.items():
+            parents = split_lineage(details.get('lineage', ''))
+            self.lineages[name] = parents
+            self.parent_refs.update(parents)
+        for name, details in plant_genetics.items():
+            self.store(name, classify(details, self.parent_refs[name] > 0))
+
+    def store(self, name, role):
+        strain_id = self.ids.get(name)
+        if strain_id is None:
+            if self.free:
+                strain_id = self.free.pop()
+                self.names[strain_id] = name
+            else:
+                strain_id = len(self.names)
+                self.names.append(name)
+                self.codes.append(NO_ROLE)
+            self.ids[name] = strain_id
+        self.codes[strain_id] = ROLE_CODES[role]
+
+    def role(self, name):
+        """Returns the role of `name`, or None for names not in the data."""
+        strain_id = self.ids.get(name)
+        if strain_id is None:
+            if name in self.source():
+                self.update([name])
+                return self.role(name)
+            return None
+        return ROLES[self.codes[strain_id]]
+
+    def is_parent(self, name):
+        return self.parent_refs[name] > 0
+
+    def parent_names(self):
+        """All names referenced as a parent in some lineage."""
+        return {name for name, count in self.parent_refs.items() if count > 0}
+
+    def update(self, names):
+        """
+        Re-classifies `names` after they were added or edited, plus any
+        strain whose parent status changed as a result. Returns the names
+        whose role changed.
+        """
+        plant_genetics = self.source()
+        touched = set()
+        for name in names:
+            if name not in plant_genetics:
+                touched |= self.remove(name)
+                continue
+            parents = split_lineage(plant_genetics[name].get('lineage', ''))
+            touched |= self.relink(name, parents)
+            touched.add(name)
+        return self.reclassify(touched)
+
+    def remove(self, name):
+        """Drops a deleted strain and returns the names that need re-classifying."""
+        touched = self.relink(name, [])
+        self.lineages.pop(name, None)
+        strain_id = self.ids.pop(name, None)
+        if strain_id is not None:
+            self.names[strain_id] = None
+            self.codes[strain_id] = NO_ROLE
+            self.free.append(strain_id)
+        touched.discard(name)
+        return touched
+
+    def rename(self, old_name, new_name):
+        """Moves a strain's ID to its new name; lineages pointing at it are updated through update()."""
+        strain_id = self.ids.pop(old_name, None)
+        if strain_id is not None:
+            self.ids[new_name] = strain_id
+            self.names[strain_id] = new_name
+        if old_name in self.lineages:
+            self.lineages[new_name] = self.lineages.pop(old_name)
+        return self.update([new_name])
+
+    def relink(self, name, parents):
+        """Swaps `name`'s lineage references; returns parents whose parent status flipped."""
+        old_parents = self.lineages.get(name, [])
+        if old_parents == parents:
+            return set()
+        flipped = set()
+        for parent in old_parents:
+            self.parent_refs[parent] -= 1
+            if self.parent_refs[parent] <= 0:
+                del self.parent_refs[parent]
+                flipped.add(parent)
+        for parent in parents:
+            if self.parent_refs[parent] == 0:
+                flipped.add(parent)
+            self.parent_refs[parent] += 1
+        self.lineages[name] = parents
+        # A parent dropped and re-added in the same edit didn't actually flip
+        return {parent for parent in flipped if (parent in old_parents) != (parent in parents)}
+
+    def reclassify(self, names):
+        plant_genetics = self.source()
+        changed = set()
+        for name in names:
+            details = plant_genetics.get(name)
+            if details is None:
+                continue
+            role = classify(details, self.parent_refs[name] > 0)
+            if self.role_code(name) != ROLE_CODES[role]:
+                changed.add(name)
+            self.store(name, role)
+        return changed
+
+    def role_code(self, name):
+        strain_id = self.ids.get(name)
+        return NO_ROLE if strain_id is None else self.codes[strain_id]
+
+    def counts(self):
+        """Number of strains per role, e.g. for summaries and exports."""
+        tally = Counter(code for code in self.codes if code != NO_ROLE)
+        return {role: tally[ROLE_CODES[role]] for role in ROLES}
+
+    def apply(self, batch):
+        """Brings the index up to date with an events.ChangeBatch; returns the names whose role changed."""
+        if batch.has(STRAINS_RESET):
+            self.rebuild()
+            return set(self.ids)
+        changed = set()
+        for event in batch:
+            if event.kind == STRAIN_RENAMED:
+                changed |= self.rename(event.old_name, event.name)
+        changed |= self.update(batch.names(STRAIN_ADDED, STRAIN_UPDATED, STRAIN_DELETED))
+        return changed
@@ -0,0 +1,286 @@
+# similarity.py
+"""
+"Strains most like this one" over the numeric traits in a TraitStore:
+terpene percentages, THC/CBD, yield, stretch and flowering days. Each trait
+is standardized (z-scores, so THC in percent and yield in grams weigh the
+same) and strains are compared by cosine similarity or Euclidean distance
+with batched NumPy matrix products. Headless: the apps open it from the
+plant details window, scripts can call most_similar().
+"""
+import warnings
+import numpy as np
+from traits import TRAIT_SCHEMA, TERPENE, CATEGORICAL
+from events import STRAINS_RESET
+
+COSINE = "cosine"
+EUCLIDEAN = "euclidean"
+METRICS = (COSINE, EUCLIDEAN)
+
+TRAIT_VECTOR_COLUMNS = tuple(column.name for column in TRAIT_SCHEMA if column.kind != CATEGORICAL)
+TERPENE_COLUMNS = tuple(column.name for column in TRAIT_SCHEMA if column.kind == TERPENE)
+
+# Strains with fewer known values than this are left out: mostly-imputed
+# vectors sit near the mean and would look similar to everything
+MIN_KNOWN_TRAITS = 2
+
+# Rows per matrix product when building the neighbor table
+BLOCK_SIZE = 512
+
+# Extra neighbors kept per row so an incremental refresh rarely has to
+# recompute a row whose neighbor was edited
+NEIGHBOR_SLACK = 5
+
+# Past this share of changed strains a full rebuild (with fresh
+# standardization) is cheaper than patching the table
+REBUILD_FRACTION = 0.1
+
+
+class TraitVectors:
+    """
+    The standardized trait matrix for a store's rows. Missing values become
+    the column mean (0 after standardizing). The mean and standard deviation
+    are frozen when the vectors are first built, so values edited later are
+    placed on the same scale and the neighbor table can be patched instead
+    of rebuilt.
+    """
+
+    def __init__(self, store, columns, metric):
+        self.store = store
+        self.positions = [store.numeric_position[column] for column in columns]
+        self.metric = metric
+        raw = self.raw()
+        with warnings.catch_warnings():
+            # A trait nobody has recorded yet: mean NaN, treated as 0 / 1 below
+            warnings.simplefilter("ignore", RuntimeWarning)
+            self.mean = np.nanmean(raw, axis=0) if len(raw) else np.zeros(len(columns))
+            self.std = np.nanstd(raw, axis=0) if len(raw) else np.ones(len(columns))
+        self.mean = np.nan_to_num(self.mean)
+        self.std = np.where(np.isnan(self.std) | (self.std == 0), 1.0, self.std)
+        self.refresh()
+
+    def raw(self):
+        used = len(self.store.names)
+        raw = self.store.numbers[:used][:, self.positions]
+        return raw[self.store.live[:used]]
+
+    def refresh(self):
+        """Re-reads every row from the store with the frozen scale."""
+        used = len(self.store.names)
+        raw = self.store.numbers[:used][:, self.positions]
+        known = ~np.isnan(raw)
+        self.valid = self.store.live[:used] & (known.sum(axis=1) >= min(MIN_KNOWN_TRAITS, len(self.positions)))
+        matrix = np.where(known, (raw - self.mean) / self.std, 0.0)
+        matrix[~self.valid] = 0.0
+        if self.metric == COSINE:
+            norms = np.linalg.norm(matrix, axis=1)
+            self.valid &= norms > 0
+            matrix = matrix / np.where(norms > 0, norms, 1.0)[:, None]
+        self.matrix = matrix
+        self.square_norms = np.einsum("ij,ij->i", matrix, matrix)
+
+    def scores(self, rows):
+        """
+        Similarity of `rows` to every row, higher is more alike: cosine
+        similarity, or minus the squared Euclidean distance. Invalid rows and
+        each row itself score -inf.
+        """
+        rows = np.asarray(rows)
+        products = self.matrix[rows] @ self.matrix.T
+        if self.metric == EUCLIDEAN:
+            products = 2 * products - self.square_norms[rows][:, None] - self.square_norms[None, :]
+        products[:, ~self.valid] = -np.inf
+        products[np.arange(len(rows)), rows] = -np.inf
+        return products
+
+    def report(self, score):
+        """The value shown to users: cosine similarity, or the Euclidean distance."""
+        if self.metric == EUCLIDEAN:
+            return float(np.sqrt(max(-score, 0.0)))
+        return float(score)
+
+
+def top_k(scores, k):
+    """(columns, scores) of each row's k highest scores, best first; -inf entries are padding."""
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        return np.empty((len(scores), 0), dtype=np.int64), np.empty((len(scores), 0))
+    columns = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    picked = np.take_along_axis(scores, columns, axis=1)
+    order = np.argsort(-picked, axis=1, kind="stable")
+    return np.take_along_axis(columns, order, axis=1), np.take_along_axis(picked, order, axis=1)
+
+
+class SimilarityEngine:
+    """
+    kNN over a TraitStore's numeric traits. neighbors() answers from a
+    precomputed top-k table for every strain. Strain events mark the strains
+    they touch; the next read recomputes those rows and patches everyone
+    else's lists against them instead of recomputing the whole table. When
+    many strains changed, the table (and the standardization) is rebuilt.
+    """
+
+    def __init__(self, store, columns=TRAIT_VECTOR_COLUMNS, metric=COSINE, k=10):
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric {metric!r}; expected one of {', '.join(METRICS)}")
+        self.store = store
+        self.columns = tuple(columns)
+        self.metric = metric
+        self.k = k
+        self.vectors = None
+        self.dirty = set()  # Names changed since the table was last brought up to date
+
+    def invalidate(self):
+        self.vectors = None
+        self.dirty = set()
+
+    def apply(self, batch):
+        """Marks the strains in an events.ChangeBatch; call after the store has applied it."""
+        if batch.has(STRAINS_RESET):
+            self.invalidate()
+        elif self.vectors is not None:
+            self.dirty.update(batch.names())
+
+    # Building and patching the table
+
+    def build(self):
+        self.vectors = TraitVectors(self.store, self.columns, self.metric)
+        self.dirty = set()
+        self.table_names = dict(self.store.rows)  # name -> row when the table was computed
+        used = len(self.store.names)
+        width = self.k + NEIGHBOR_SLACK
+        self.neighbor_rows = np.full((used, width), -1, dtype=np.int64)
+        self.neighbor_scores = np.full((used, width), -np.inf)
+        rows = np.flatnonzero(self.vectors.valid)
+        self.candidates = max(len(rows) - 1, 0)  # Other comparable strains each row could list
+        for start in range(0, len(rows), BLOCK_SIZE):
+            self.fill_rows(rows[start:start + BLOCK_SIZE])
+
+    def fill_rows(self, rows, scores=None):
+        """Recomputes the neighbor lists of `rows` in full."""
+        if not len(rows):
+            return
+        if scores is None:
+            scores = self.vectors.scores(rows)
+        columns, picked = top_k(scores, self.neighbor_rows.shape[1])
+        self.neighbor_rows[rows] = -1
+        self.neighbor_scores[rows] = -np.inf
+        self.neighbor_rows[rows, :columns.shape[1]] = np.where(np.isfinite(picked), columns, -1)
+        self.neighbor_scores[rows, :columns.shape[1]] = picked
+
+    def grow_table(self, used):
+        if used <= len(self.neighbor_rows):
+            return
+        extra = used - len(self.neighbor_rows)
+        width = self.neighbor_rows.shape[1]
+        self.neighbor_rows = np.vstack([self.neighbor_rows, np.full((extra, width), -1, dtype=np.int64)])
+        self.neighbor_scores = np.vstack([self.neighbor_scores, np.full((extra, width), -np.inf)])
+
+    def changed_rows(self):
+        rows = set()
+        for name in self.dirty:
+            for row in (self.table_names.pop(name, None), self.store.rows.get(name)):
+                if row is not None:
+                    rows.add(row)
+            if name in self.store.rows:
+                self.table_names[name] = self.store.rows[name]
+        return np.array(sorted(rows), dtype=np.int64)
+
+    def patch(self):
+        """
+        Brings the table up to date with the changed strains. Their own rows
+        are recomputed. Every other row drops them from its list and merges
+        in their new scores. A list that held fewer than every other strain
+        is exact only down to its lowest score, since no unchanged strain
+        below that line can have moved up, so merged scores under it are
+        dropped. Rows left with fewer than k exact neighbors are recomputed.
+        """
+        self.vectors.refresh()
+        self.grow_table(len(self.store.names))
+        changed = self.changed_rows()
+        self.dirty = set()
+        if not len(changed):
+            return
+
+        valid = self.vectors.valid
+        old_candidates, self.candidates = self.candidates, max(int(valid.sum()) - 1, 0)
+        changed_scores = self.vectors.scores(changed)
+        # Deleted or no longer comparable strains must not be merged into anyone's list
+        changed_scores[~valid[changed]] = -np.inf
+        width = self.neighbor_rows.shape[1]
+
+        # Rows of changed strains: recompute in full
+        self.fill_rows(changed[valid[changed]], changed_scores[valid[changed]])
+        gone = changed[~valid[changed]]
+        self.neighbor_rows[gone] = -1
+        self.neighbor_scores[gone] = -np.inf
+
+        # Every other row: merge the changed strains' new scores into its list
+        others = np.flatnonzero(valid)
+        others = others[~np.isin(others, changed)]
+        if not len(others):
+            return
+        old_rows = self.neighbor_rows[others]
+        old_scores = self.neighbor_scores[others]
+        listed = np.isfinite(old_scores)
+        lowest = np.where(listed, old_scores, np.inf).min(axis=1)
+        complete = listed.sum(axis=1) >= old_candidates
+        cutoff = np.where(complete, -np.inf, lowest)
+        kept_scores = np.where(np.isin(old_rows, changed), -np.inf, old_scores)
+        # Scores are symmetric, so a changed row's scores against `others` are their scores against it
+        merged_rows = np.hstack([old_rows, np.broadcast_to(changed, (len(others), len(changed)))])
+        merged_scores = np.hstack([kept_scores, changed_scores[:, others].T])
+        merged_scores[merged_scores < cutoff[:, None]] = -np.inf
+        columns, picked = top_k(merged_scores, width)
+        self.neighbor_rows[others] = np.where(np.isfinite(picked), np.take_along_axis(merged_rows, columns, axis=1), -1)
+        self.neighbor_scores[others] = picked
+
+        # Lists that lost exactness below k: recompute
+        exact = np.isfinite(picked).sum(axis=1)
+        short = others[exact < min(self.k, self.candidates)]
+        for start in range(0, len(short), BLOCK_SIZE):
+            self.fill_rows(short[start:start + BLOCK_SIZE])
+
+    def refresh(self):
+        """Builds the table on first use, then patches or rebuilds it after changes."""
+        if self.vectors is None:
+            self.build()
+        elif self.dirty:
+            if len(self.dirty) > REBUILD_FRACTION * max(len(self.store.rows), 1):
+                self.build()
+            else:
+                self.patch()
+
+    # Reads
+
+    def neighbors(self, name, k=None):
+        """
+        Up to `k` strains most like `name`, best first, as (name, score)
+        pairs: cosine similarity (1 is identical) or Euclidean distance in
+        standard deviations (0 is identical). Empty when `name` has too few
+        numeric traits to compare.
+        """
+        k = self.k if k is None else k
+        self.refresh()
+        row = self.store.rows.get(name)
+        if row is None or not self.vectors.valid[row]:
+            return []
+        if k <= self.k:
+            rows, scores = self.neighbor_rows[row, :k], self.neighbor_scores[row, :k]
+        else:
+            columns, picked = top_k(self.vectors.scores([row]), k)
+            rows, scores = columns[0], picked[0]
+        return [(self.store.names[other], self.vectors.report(score))
+                for other, score in zip(rows, scores) if other >= 0 and np.isfinite(score)]
+
+    def comparable(self, name):
+        """Whether `name` has enough numeric traits to be compared."""
+        self.refresh()
+        row = self.store.rows.get(name)
+        return row is not None and bool(self.vectors.valid[row])
+
+
+def most_similar(plant_genetics, name, k=10, metric=COSINE, columns=TRAIT_VECTOR_COLUMNS):
+    """One-off query for scripts: the k strains in `plant_genetics` most like `name`."""
+    from trait_store import TraitStore
+    store = TraitStore(lambda: plant_genetics)
+    return SimilarityEngine(store, columns, metric, k).neighbors(name, k)
@@ -0,0 +1,68 @@
+# similarity_view.py
+import tkinter as tk
+from tkinter import ttk, Toplevel
+from components import PagedTreeview
+
+# Compare-by choices -> column set name understood by the app's get_similarity_engine
+COMPARE_BY = {"Terpenes & traits": "traits", "Terpenes only": "terpenes"}
+METRIC_LABELS = {"Cosine similarity": "cosine", "Euclidean distance": "euclidean"}
+
+
+class SimilarStrainsWindow:
+    """
+    Lists the strains most like one plant by terpene profile and numeric
+    traits, from the app's similarity engines (see similarity.py).
+    Double-clicking a row opens that strain's details.
+    """
+
+    def __init__(self, parent, app, plant_name, background="white", foreground="black"):
+        self.app = app
+        self.plant_name = plant_name
+
+        self.top = Toplevel(parent)
+        self.top.title(f"Strains Similar to {plant_name}")
+        self.top.geometry("600x500")
+        self.top.configure(bg=background)
+
+        controls = tk.Frame(self.top, bg=background)
+        controls.pack(fill='x', padx=10, pady=5)
+
+        self.compare_var = tk.StringVar(value=next(iter(COMPARE_BY)))
+        ttk.Combobox(controls, textvariable=self.compare_var, values=list(COMPARE_BY),
+                     state='readonly', width=18).pack(side='left')
+        self.metric_var = tk.StringVar(value=next(iter(METRIC_LABELS)))
+        ttk.Combobox(controls, textvariable=self.metric_var, values=list(METRIC_LABELS),
+                     state='readonly', width=18).pack(side='left', padx=5)
+        tk.Label(controls, text="Show:", bg=background, fg=foreground).pack(side='left')
+        self.count_var = tk.IntVar(value=10)
+        tk.Spinbox(controls, from_=1, to=100, textvariable=self.count_var, width=4).pack(side='left', padx=5)
+        tk.Button(controls, text="Find", command=self.refresh, bg="white", fg="black").pack(side='left')
+
+        self.status_label = tk.Label(self.top, text="", bg=background, fg=foreground)
+        self.status_label.pack(fill='x', padx=10)
+
+        self.table = PagedTreeview(self.top, ('Strain', 'Score'), lambda row: (row[0], f"{row[1]:.3f}"),
+                                   on_activate=self.on_activate)
+        self.table.pack(fill='both', expand=True, padx=10, pady=10)
+
+        self.refresh()
+
+    def refresh(self):
+        engine = self.app.get_similarity_engine(COMPARE_BY[self.compare_var.get()],
+                                                METRIC_LABELS[self.metric_var.get()])
+        try:
+            count = max(1, int(self.count_var.get()))
+        except (tk.TclError, ValueError):
+            count = 10
+        if not engine.comparable(self.plant_name):
+            self.status_label.config(text=f"'{self.plant_name}' has too few numeric traits to compare. "
+                                          "Add THC, terpene or other values under Genetic Information.")
+            self.table.set_rows([])
+            return
+        rows = engine.neighbors(self.plant_name, count)
+        self.status_label.config(text=f"{len(rows)} most similar strains")
+        self.table.set_rows(rows)
+
+    def on_activate(self, row):
+        if row[0] in self.app.plant_genetics:
+            self.app.show_plant_details(row[0])
@@ -0,0 +1,85 @@
+# strain_index.py
+from bisect import bisect_left
+
+
+class StrainNameIndex:
+    """
+    A sorted, case-insensitive index of strain names for type-ahead lookups.
+
+    The index reads names from `source` (a callable returning an iterable of
+    names) and only rebuilds itself on the first search after invalidate(), so
+    telling it the collection changed costs nothing.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.keys = []   # Lower-cased names, sorted
+        self.names = []  # Original names, same order as keys
+        self.stale = True
+
+    def invalidate(self):
+        """Marks the index out of date; it is rebuilt lazily on the next lookup."""
+        self.stale = True
+
+    def rebuild(self):
+        pairs = sorted((name.lower(), name) for name in self.source())
+        self.keys = [key for key, _ in pairs]
+        self.names = [name for _, name in pairs]
+        self.stale = False
+
+    def ensure_fresh(self):
+        if self.stale:
+            self.rebuild()
+
+    def __len__(self):
+        self.ensure_fresh()
+        return len(self.names)
+
+    def __contains__(self, name):
+        self.ensure_fresh()
+        key = name.lower()
+        position = bisect_left(self.keys, key)
+        while position < len(self.keys) and self.keys[position] == key:
+            if self.names[position] == name:
+                return True
+            position += 1
+        return False
+
+    def all_names(self):
+        self.ensure_fresh()
+        return list(self.names)
+
+    def search(self, text, limit=25):
+        """
+        Returns up to `limit` names matching `text`: prefix matches first (found
+        by binary search), then names containing it anywhere.
+        """
+        self.ensure_fresh()
+        term = text.strip().lower()
+        if not term:
+            return self.names[:limit]
+
+        results = []
+        position = bisect_left(self.keys, term)
+        while position < len(self.keys) and len(results) < limit and self.keys[position].startswith(term):
+            results.append(self.names[position])
+            position += 1
+
+        if len(results) < limit:
+            seen = set(results)
+            for key, name in zip(self.keys, self.names):
+                if term in key and name not in seen:
+                    results.append(name)
+                    if len(results) >= limit:
+                        break
+        return results
+
+    def best_match(self, text):
+        """Returns the exact (case-insensitive) match for `text`, else the top search hit, else None."""
+        self.ensure_fresh()
+        term = text.strip().lower()
+        position = bisect_left(self.keys, term)
+        if position < len(self.keys) and self.keys[position] == term:
+            return self.names[position]
+        matches = self.search(text, limit=1)
+        return matches[0] if matches else None
@@ -0,0 +1,6 @@
+# conftest.py
+import os
+import sys
+
+# The app is a set of flat modules at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,57 @@
+# test_breeding.py
+import numpy as np
+from breeding import Pedigree, BreedingPlanner
+from trait_store import TraitStore
+
+# Founders A, B, C, D; S1 and S2 full sibs of A x B; H a half sib of S1 (A x C);
+# SELF a selfing of A; K a clone of S1
+LINEAGES = {
+    "S1": ["A", "B"],
+    "S2": ["A", "B"],
+    "H": ["A", "C"],
+    "SELF": ["A"],
+    "S1xS2": ["S1", "S2"],
+}
+KEEPERS = {"K": "S1"}
+
+
+def pedigree():
+    return Pedigree(lambda name: LINEAGES.get(name, []), lambda name: KEEPERS.get(name, name))
+
+
+def test_coancestry_matches_hand_worked_values():
+    assert pedigree().coancestry("A", "B") == 0.0
+    assert pedigree().coancestry("A", "S1") == 0.25          # Parent and offspring
+    assert pedigree().coancestry("S1", "S2") == 0.25         # Full sibs
+    assert pedigree().coancestry("S1", "H") == 0.125         # Half sibs
+    assert pedigree().coancestry("A", "A") == 0.5            # Selfing a non-inbred plant
+    assert pedigree().inbreeding("SELF") == 0.5
+    assert pedigree().inbreeding("S1xS2") == 0.25
+    assert pedigree().coancestry("K", "S2") == 0.25          # A clone is its keeper
+
+
+def strain(thc, lineage="Unknown"):
+    return {"genetic_info": {"THC %": f"{thc}%"}, "lineage": lineage}
+
+
+def planner(plants):
+    store = TraitStore(lambda: plants)
+    return BreedingPlanner(store, lambda name: LINEAGES.get(name, []), columns=("thc",))
+
+
+def test_simulation_is_reproducible_and_centered_on_the_midparent():
+    plants = {"A": strain(16), "B": strain(24), "C": strain(20), "D": strain(20)}
+    plans = planner(plants)
+    first = plans.simulate("A", "B", progeny=20000, seed=7)
+    again = plans.simulate("A", "B", progeny=20000, seed=7)
+    assert np.array_equal(first.samples, again.samples)
+    assert not np.array_equal(first.samples, plans.simulate("A", "B", progeny=20000, seed=8).samples)
+
+    # Founders regress toward the population mean (20) by h2 = 0.6: 17.6 and 22.4
+    thc = first.distribution("thc")
+    assert abs(thc.midparent - 20.0) < 1e-9
+    assert abs(thc.mean - 20.0) < 0.05
+    # Vp = 8 over the four founders: Mendelian 0.5 * 0.6 * 8 plus environment 0.4 * 8
+    assert abs(thc.std - np.sqrt(0.5 * 0.6 * 8 + 0.4 * 8)) < 0.05
+    assert first.inbreeding == 0.0
+    assert 0.45 < first.probability("thc", high=20) < 0.55
@@ -0,0 +1,88 @@
+# test_crosses.py
+import random
+import numpy as np
+from breeding import Pedigree, heritability_of
+from crosses import CrossRecommender, CrossObjective, MAXIMIZE, MINIMIZE
+from roles import RoleIndex
+from trait_store import TraitStore
+
+
+def make_collection(females, males, seed):
+    random.seed(seed)
+    plants = {}
+    founders = [f"Founder {i}" for i in range(25)]
+    for name in founders:
+        plants[name] = {"lineage": "Unknown", "gender": random.choice(["Female", "Male"]), "owned": False,
+                        "genetic_info": {"THC": f"{random.uniform(12, 28):.1f}"}}
+
+    def add(name, gender, owned):
+        info = {}
+        if random.random() < 0.7:
+            info = {"THC": f"{random.uniform(12, 28):.1f}", "Myrcene": f"{random.uniform(0, 1.2):.2f}"}
+        plants[name] = {"lineage": f"{random.choice(founders)} x {random.choice(founders)}", "gender": gender,
+                        "owned": owned, "genetic_info": info,
+                        "flowering_time": f"{random.randint(55, 75)} days"}
+
+    for i in range(females):
+        add(f"Female {i}", "Female", True)
+    for i in range(males):
+        add(f"Male {i}", "Male", random.random() < 0.5)
+    # A sib-mated family, so the inbreeding penalty matters
+    add("Sib Female", "Female", True)
+    plants["Sib Male"] = dict(plants["Sib Female"], gender="Male")
+    return plants
+
+
+def brute_force(recommender, objective, lineage_of):
+    """Every cross scored from the planner's genetic values and the recursive Pedigree."""
+    planner = recommender.planner
+    columns = planner.columns
+    mean, std = planner.population()
+    mean = np.nan_to_num(mean)
+    std = np.where(np.isnan(std) | (std == 0), 1.0, std)
+    heritability = np.array([heritability_of(column) for column in columns])
+    pedigree, memo = Pedigree(lineage_of), {}
+
+    def z(name):
+        values = planner.genetic_values(name, pedigree, mean, heritability, memo)
+        return np.where(np.isnan(values), 0.0, (values - mean) / std)
+
+    females, males = recommender.candidates()
+    scores = []
+    for female in females:
+        for male in males:
+            midparent = (z(female) + z(male)) / 2
+            score = -objective.inbreeding_penalty * pedigree.coancestry(female, male)
+            for trait, goal in objective.goals.items():
+                index, weight = columns.index(trait), objective.weights[trait]
+                if goal == MAXIMIZE:
+                    score += weight * midparent[index]
+                elif goal == MINIMIZE:
+                    score -= weight * midparent[index]
+                else:
+                    score -= weight * abs(midparent[index] - (goal - mean[index]) / std[index])
+            scores.append(score)
+    return sorted(scores, reverse=True), len(females) * len(males)
+
+
+def test_recommend_matches_brute_force():
+    plants = make_collection(females=600, males=20, seed=3)
+    roles = RoleIndex(lambda: plants)
+    lineage_of = lambda name: roles.lineages.get(name, [])
+    recommender = CrossRecommender(TraitStore(lambda: plants), lambda: plants, lineage_of)
+    objectives = [
+        CrossObjective({"thc": MAXIMIZE, "flowering_days": MINIMIZE}, {"thc": 1.0, "flowering_days": 0.5}),
+        CrossObjective({"thc": MAXIMIZE, "myrcene": 0.8}, {"thc": 1.0, "myrcene": 2.0}, inbreeding_penalty=10.0),
+    ]
+    for objective in objectives:
+        expected, total = brute_force(recommender, objective, lineage_of)
+        for k in (1, 10, 40):
+            recommendations, scored, possible = recommender.recommend(objective, k=k)
+            assert possible == total
+            assert scored <= total
+            if k == 1:
+                assert scored < total  # The bound pruned something
+            assert np.allclose([cross.score for cross in recommendations], expected[:k])
+            pedigree = Pedigree(lineage_of)
+            for cross in recommendations:
+                assert abs(cross.coancestry - pedigree.coancestry(cross.female, cross.male)) < 1e-9
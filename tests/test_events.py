@@ -0,0 +1,63 @@
+# test_events.py
+from events import EventBus, STRAIN_ADDED, STRAIN_UPDATED, STRAIN_RENAMED, STRAIN_DELETED, LOG_ENTRY_ADDED
+
+
+class IdleRoot:
+    """Stands in for Tk: after_idle callbacks run when run_idle() is called."""
+
+    def __init__(self):
+        self.callbacks = []
+
+    def after_idle(self, callback):
+        self.callbacks.append(callback)
+        return len(self.callbacks)
+
+    def run_idle(self):
+        callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback()
+
+
+def deliver(*published, kinds=None):
+    root = IdleRoot()
+    bus = EventBus(root)
+    batches = []
+    bus.subscribe(lambda batch: batches.append([event.key() for event in batch]), kinds)
+    for event in published:
+        bus.publish(*event)
+    root.run_idle()
+    assert len(batches) <= 1
+    return batches[0] if batches else []
+
+
+def test_rename_round_trips_are_kept_in_order():
+    renames = [(STRAIN_RENAMED, "B", "A"), (STRAIN_RENAMED, "A", "B"), (STRAIN_RENAMED, "B", "A")]
+    assert deliver(*renames) == renames
+
+
+def test_add_delete_add_ends_added():
+    events = [(STRAIN_ADDED, "X", None), (STRAIN_DELETED, "X", None), (STRAIN_ADDED, "X", None)]
+    assert deliver(*events) == events
+
+
+def test_repeats_of_the_previous_event_are_dropped():
+    assert deliver((STRAIN_UPDATED, "X"), (STRAIN_UPDATED, "X"), (STRAIN_UPDATED, "Y"), (STRAIN_UPDATED, "X")) \
+        == [(STRAIN_UPDATED, "X", None), (STRAIN_UPDATED, "Y", None)]
+    # Something else happened to X in between: both updates are kept
+    assert deliver((STRAIN_UPDATED, "X"), (STRAIN_RENAMED, "X", "W"), (STRAIN_UPDATED, "X")) \
+        == [(STRAIN_UPDATED, "X", None), (STRAIN_RENAMED, "X", "W"), (STRAIN_UPDATED, "X", None)]
+
+
+def test_subscribers_get_only_their_kinds_and_a_fresh_batch_per_flush():
+    root = IdleRoot()
+    bus = EventBus(root)
+    strains, logs = [], []
+    bus.subscribe(lambda batch: strains.append(batch.names()), (STRAIN_UPDATED,))
+    bus.subscribe(lambda batch: logs.append(batch.names()), (LOG_ENTRY_ADDED,))
+    bus.publish(STRAIN_UPDATED, "X")
+    bus.publish(LOG_ENTRY_ADDED, "Y")
+    root.run_idle()
+    bus.publish(STRAIN_UPDATED, "X")
+    root.run_idle()
+    assert strains == [{"X"}, {"X"}]
+    assert logs == [{"Y"}]
@@ -0,0 +1,41 @@
+# test_grow_log_store.py
+import json
+from grow_log_store import GrowLogStore
+
+
+class InlineExecutor:
+    """Runs writes as soon as they are submitted."""
+
+    def submit_write(self, fn, *args, on_done=None, on_error=None):
+        fn(*args)
+
+
+def test_load_edit_and_save_round_trip(tmp_path):
+    path = tmp_path / "grow_log.json"
+    rows = [
+        {"date": "2024-01-02", "strain": "A", "notes": "first"},
+        {"date": "not a date", "strain": "A"},
+        {"date": "2024-01-01", "strain": "B", "notes": "second"},
+    ]
+    path.write_text(json.dumps(rows))
+    store = GrowLogStore(str(path), InlineExecutor())
+    assert store.error is None
+    assert len(store.entries) == 2 and store.quarantined == [rows[1]]
+    assert len(store.problems) == 1
+
+    store.add({"date": "2024-01-03", "strain": "A", "notes": "third"})
+    assert [entry['notes'] for entry in store.index.entries_for("A")] == ["first", "third"]
+    assert store.delete(store.entries[0])
+    store.save()
+
+    again = GrowLogStore(str(path), InlineExecutor())
+    assert [entry['notes'] for entry in again.entries] == ["second", "third"]
+    assert again.quarantined == [rows[1]]  # Unreadable rows are written back untouched
+
+
+def test_missing_and_undecodable_files_start_empty(tmp_path):
+    assert GrowLogStore(str(tmp_path / "missing.json"), InlineExecutor()).entries == []
+    path = tmp_path / "grow_log.json"
+    path.write_text("{not json")
+    store = GrowLogStore(str(path), InlineExecutor())
+    assert store.entries == [] and store.error
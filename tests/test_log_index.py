@@ -0,0 +1,59 @@
+# test_log_index.py
+import random
+from log_index import GrowLogIndex
+
+
+def entry(strain, day):
+    return {'strain': strain, 'date': f"2024-01-{day:02d}", 'notes': ''}
+
+
+def test_delete_removes_exactly_one_entry():
+    log = [entry("A", 1), entry("A", 1), entry("B", 2)]
+    index = GrowLogIndex(lambda: log)
+    twin = log[1]
+    assert index.delete(twin)
+    assert len(log) == 2 and all(row is not twin for row in log)
+    assert index.get(twin['id']) is None
+    assert [row['id'] for row in index.entries_for("A")] == [log[0]['id']]
+    assert not index.delete(twin)
+
+
+def test_random_adds_edits_and_deletes_stay_consistent():
+    random.seed(5)
+    log = [entry(random.choice("ABC"), random.randint(1, 28)) for _ in range(100)]
+    index = GrowLogIndex(lambda: log)
+    order = [row['id'] for row in log]
+    for step in range(1000):
+        action = random.random()
+        if action < 0.4 and log:
+            index.delete(random.choice(log))
+        elif action < 0.6 and log:
+            row = random.choice(log)
+            row['date'] = f"2024-02-{random.randint(1, 28):02d}"
+            index.update(row)
+        elif action < 0.8:
+            rows = [entry(random.choice("ABC"), random.randint(1, 28)) for _ in range(random.randint(1, 3))]
+            log.extend(rows)
+            index.add_many(rows)
+            order.extend(row['id'] for row in rows)
+        else:
+            row = entry(random.choice("ABC"), random.randint(1, 28))
+            log.append(row)
+            index.add(row)
+            order.append(row['id'])
+        assert [row['id'] for row in log] == [row_id for row_id in order if row_id in index.by_id]
+    assert sorted(row['id'] for row in log) == sorted(index.by_id)
+    fresh = GrowLogIndex(lambda: log)
+    for strain in "ABC":
+        assert {row['id'] for row in index.entries_for(strain)} == {row['id'] for row in fresh.entries_for(strain)}
+        assert [index.day(row) for row in index.entries_for(strain)] == \
+            [fresh.day(row) for row in fresh.entries_for(strain)]
+
+
+def test_delete_keeps_log_order():
+    log = [entry("A", day) for day in range(1, 6)]
+    index = GrowLogIndex(lambda: log)
+    first, second, third, fourth, fifth = log
+    index.delete(second)
+    index.delete(first)
+    assert log == [third, fourth, fifth]
@@ -0,0 +1,78 @@
+# test_pheno_hunt.py
+import random
+from clones import CloneRegistry
+from events import ChangeBatch, ChangeEvent, LOG_ENTRY_ADDED, STRAIN_ADDED, STRAIN_UPDATED
+from log_index import GrowLogIndex
+from pheno_hunt import PhenoHuntEngine
+
+
+def seed_start(lineage, notes, thc):
+    return {'lineage': lineage, 'ownership_type': 'Seed Start', 'notes': notes, 'genetic_info': {'THC': str(thc)}}
+
+
+def engine(plant_genetics, index, registry):
+    return PhenoHuntEngine(lambda: plant_genetics, lambda: index, registry.keeper_of, registry.descendants)
+
+
+def summary(hunts):
+    return sorted((ranking.batch.label, ranking.name, round(ranking.score, 9), ranking.rank, ranking.keeper)
+                  for ranking in hunts.report())
+
+
+def test_edit_round_trip_leaves_siblings_tied():
+    plant_genetics = {f"Tied #{i}": seed_start("A x B", "3/1/24", 20.1) for i in (1, 2)}
+    log = []
+    index, registry = GrowLogIndex(lambda: log), CloneRegistry(lambda: plant_genetics)
+    hunts = engine(plant_genetics, index, registry)
+    assert [ranking.keeper for ranking in hunts.report()] == [False, False]  # Nothing tells them apart
+
+    for thc in (27.3, 20.1):
+        plant_genetics["Tied #1"]['genetic_info'] = {'THC': str(thc)}
+        hunts.apply(ChangeBatch([ChangeEvent(STRAIN_UPDATED, "Tied #1")]))
+        hunts.report()
+    assert [ranking.keeper for ranking in hunts.report()] == [False, False]
+    assert summary(hunts) == summary(engine(plant_genetics, index, registry))
+
+
+def test_incremental_updates_match_rebuild():
+    random.seed(3)
+    plant_genetics = {}
+    for cross in range(20):
+        for i in range(1, 7):
+            plant_genetics[f"Cross{cross} #{i}"] = seed_start(
+                f"P{cross} x Q{cross}", f"{random.choice([1, 2, 5])}/{random.randint(1, 28)}/24",
+                round(random.uniform(15, 30), 1))
+    log = []
+    index, registry = GrowLogIndex(lambda: log), CloneRegistry(lambda: plant_genetics)
+    hunts = engine(plant_genetics, index, registry)
+    hunts.report()
+    names = list(plant_genetics)
+    for step in range(600):
+        name = random.choice(names)
+        action = random.random()
+        if action < 0.5:
+            entry = {'date': f"2024-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}", 'strain': name,
+                     'stage': random.choice(['Vegetative', 'Flowering', 'Harvested']),
+                     'status': random.choice(['Healthy', 'Problems'])}
+            log.append(entry)
+            index.add(entry)
+            hunts.apply(ChangeBatch([ChangeEvent(LOG_ENTRY_ADDED, name)]))
+        elif action < 0.85:
+            # Values revisited often, so edits are taken back out as well as put in
+            plant_genetics[name]['genetic_info'] = {'THC': str(random.choice([20.1, 20.1, 27.3, 18.45]))}
+            hunts.apply(ChangeBatch([ChangeEvent(STRAIN_UPDATED, name)]))
+        elif action < 0.95:
+            plant_genetics[name]['notes'] = f"{random.choice([1, 2, 5])}/{random.randint(1, 28)}/24"
+            hunts.apply(ChangeBatch([ChangeEvent(STRAIN_UPDATED, name)]))
+        else:
+            clone = f"{name} Clone {step}"
+            plant_genetics[clone] = {'ownership_type': 'Clone', 'mother': name}
+            registry.update([clone])
+            hunts.apply(ChangeBatch([ChangeEvent(STRAIN_ADDED, clone)]))
+            entry = {'date': '2024-06-01', 'strain': clone, 'stage': 'Flowering', 'status': 'Critical'}
+            log.append(entry)
+            index.add(entry)
+            hunts.apply(ChangeBatch([ChangeEvent(LOG_ENTRY_ADDED, clone)]))
+        if step % 10 == 0:
+            hunts.ranking(name)
+    assert summary(hunts) == summary(engine(plant_genetics, index, registry))
@@ -0,0 +1,86 @@
+# test_punnett.py
+import pytest
+from events import ChangeBatch, ChangeEvent, STRAIN_RENAMED, STRAIN_UPDATED
+from punnett import PunnettProjector, parse_generation
+
+
+def plant(gender, **loci):
+    return {"gender": gender, "genetic_info": {f"Locus: {locus}": genotype for locus, genotype in loci.items()}}
+
+
+def collection():
+    # "red" rides the X: the mother is Xr/Xr, the father X/Y
+    return {
+        "Mother": plant("Female", red="Xr/Xr", purple="P/p", THCAS="BT/BD"),
+        "Father": plant("Male", red="X/Y", purple="P/p", THCAS="BT/BD"),
+    }
+
+
+def shares(projection, locus):
+    return {genotype: round(share, 12) for genotype, share, phenotype in projection.ratios(locus)}
+
+
+def test_autosomal_ratios():
+    projector = PunnettProjector(collection)
+    f1 = projector.project("Mother", "Father")
+    assert shares(f1, "purple") == {("P", "P"): 0.25, ("P", "p"): 0.5, ("p", "p"): 0.25}
+    assert f1.phenotype_ratios("chemotype") == {"Type I (THC)": 0.25, "Type II (THC:CBD)": 0.5,
+                                                "Type III (CBD)": 0.25}
+    assert f1.probability({"purple": ("p", "p"), "chemotype": "Type III (CBD)"}) == 0.0625
+    assert projector.project("Mother", "Father", "F3").ratios("purple") == f1.ratios("purple")
+
+
+def test_sex_linked_ratios():
+    projector = PunnettProjector(collection)
+    f1 = projector.project("Mother", "Father", "F1")
+    assert shares(f1, "red") == {("X", "Xr"): 0.5, ("Xr", "Y"): 0.5}
+    f2 = projector.project("Mother", "Father", "F2")
+    assert shares(f2, "red") == {("Xr", "Xr"): 0.25, ("X", "Xr"): 0.25, ("Xr", "Y"): 0.25, ("X", "Y"): 0.25}
+    # F2 mothers give Xr 3/4, X 1/4; F2 fathers Xr 1/4, X 1/4, Y 1/2
+    f3 = projector.project("Mother", "Father", "F3")
+    assert shares(f3, "red") == {("Xr", "Y"): 0.375, ("X", "Xr"): 0.25, ("Xr", "Xr"): 0.1875,
+                                 ("X", "Y"): 0.125, ("X", "X"): 0.0625}
+    assert f3.phenotype_ratios("sex") == {"Female": 0.5, "Male": 0.5}
+
+
+def test_backcrosses_use_the_other_sex():
+    projector = PunnettProjector(collection)
+    # Back to the mother: her sons' X came from her
+    to_mother = projector.project("Mother", "Father", "BC1", "Mother")
+    assert shares(to_mother, "red") == {("Xr", "Xr"): 0.5, ("Xr", "Y"): 0.5}
+    # Back to the father: F1 daughters are Xr/X
+    to_father = projector.project("Mother", "Father", "BC1", "Father")
+    assert shares(to_father, "red") == {("X", "Xr"): 0.25, ("X", "X"): 0.25, ("Xr", "Y"): 0.25, ("X", "Y"): 0.25}
+    with pytest.raises(ValueError):
+        projector.project("Mother", "Father", "BC1", "Someone")
+    with pytest.raises(ValueError):
+        parse_generation("F0")
+
+
+def test_joint_probability_conditions_sex_linked_loci_on_sex():
+    projector = PunnettProjector(collection)
+    f2 = projector.project("Mother", "Father", "F2")
+    # Every F2 female is Xr/Xr or Xr/X, so half of them (a quarter of all) are Xr/Xr
+    assert f2.probability({"sex": "Female", "red": ("Xr", "Xr")}) == 0.25
+    assert f2.probability({"sex": "Male", "red": ("Xr", "Xr")}) == 0.0
+    assert f2.probability({"sex": "Male", "red": ("X", "Y")}) == 0.25
+    assert f2.probability({"sex": "Female", "red": ("Xr", "Xr"), "purple": ("P", "P")}) == 0.0625
+    assert f2.probability({"sex": "Female"}) == 0.5
+    assert f2.probability({"red": ("Xr", "Xr")}) == 0.25
+    assert f2.probability({"unknown": ("A", "A")}) == 0.0
+
+
+def test_events_drop_cached_pairs():
+    plants = collection()
+    projector = PunnettProjector(lambda: plants)
+    projector.project("Mother", "Father", "F2")
+    projector.apply(ChangeBatch([ChangeEvent(STRAIN_UPDATED, "Someone Else")]))
+    assert ("Father", "Mother") in projector.pairs
+
+    plants["Mother"]["genetic_info"]["Locus: purple"] = "p/p"
+    projector.apply(ChangeBatch([ChangeEvent(STRAIN_UPDATED, "Mother")]))
+    assert shares(projector.project("Mother", "Father"), "purple") == {("P", "p"): 0.5, ("p", "p"): 0.5}
+
+    plants["Dam"] = plants.pop("Mother")
+    projector.apply(ChangeBatch([ChangeEvent(STRAIN_RENAMED, "Dam", "Mother")]))
+    assert not projector.pairs
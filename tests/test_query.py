@@ -0,0 +1,131 @@
+# test_query.py
+import random
+import pytest
+from query import compile_query, filter_strains, filter_log, strains_with_log_matches, QueryError
+from trait_store import TraitStore
+from traits import TraitRangeCache
+
+
+def make_genetics():
+    return {
+        "Fast": {"flowering_time": "7-8 weeks", "lineage": "A x B"},
+        "Slow": {"flowering_time": "10-11 weeks", "lineage": "Fast x C"},
+        "Unknown": {"flowering_time": "Unknown"},
+    }
+
+
+def collection():
+    return {
+        "Wedding Cake": {"lineage": "Triangle Kush x Animal Mints", "gender": "Female", "owned": True,
+                         "type": "Hybrid", "genetic_info": {"THC": "25%", "Myrcene": "0.6"}},
+        "Triangle Kush": {"lineage": "Unknown", "gender": "Female", "owned": False, "type": "Indica",
+                          "genetic_info": {"THC": "20", "Dominance": "Indica"}},
+        "Animal Mints": {"lineage": "Unknown", "gender": "Male", "owned": True, "type": "Hybrid",
+                         "genetic_info": {"THC": "18.5"}},
+        "Cake Mints #1": {"lineage": "Wedding Cake x Animal Mints", "gender": "Female", "owned": True,
+                          "ownership_type": "Seed Start", "type": "Hybrid", "genetic_info": {}},
+    }
+
+
+def names(query, plant_genetics=None, **kwargs):
+    return filter_strains(query, plant_genetics if plant_genetics is not None else collection(), **kwargs)
+
+
+def test_boolean_operators_and_grouping():
+    assert names("owned and gender=Female") == ["Cake Mints #1", "Wedding Cake"]
+    assert names("owned gender=Female") == names("owned and gender=Female")  # Implicit and
+    assert names("gender=Male or type=Indica") == ["Animal Mints", "Triangle Kush"]
+    assert names("not owned") == ["Triangle Kush"]
+    assert names("owned and not (gender=Male or seed)") == ["Wedding Cake"]
+
+
+def test_quoted_values_and_bare_words():
+    assert names('lineage:"Animal Mints"') == ["Cake Mints #1", "Wedding Cake"]
+    assert names("'wedding cake'") == ["Wedding Cake"]
+    assert names("mints") == ["Animal Mints", "Cake Mints #1"]  # Bare words search names
+    assert names("") == sorted(collection(), key=str.lower)
+
+
+def test_parent_flag_and_field():
+    assert names("parent") == ["Animal Mints", "Triangle Kush", "Wedding Cake"]
+    assert names('parent:"Wedding Cake"') == ["Cake Mints #1"]
+    # Parent names a caller already holds are used as given
+    assert names("parent", parent_strains={"Triangle Kush"}) == ["Triangle Kush"]
+
+
+def test_numeric_ranges():
+    assert names("thc>=20") == ["Triangle Kush", "Wedding Cake"]
+    assert names("thc>18 and thc<25") == ["Animal Mints", "Triangle Kush"]
+    assert names("thc=20") == ["Triangle Kush"]
+    assert names("thc!=20") == ["Animal Mints", "Cake Mints #1", "Wedding Cake"]
+    assert names("myrcene>0.5 and dominance!=Indica") == ["Wedding Cake"]
+
+
+def test_log_queries_with_date_bounds():
+    log = [
+        {"date": "2024-11-20", "strain": "Wedding Cake", "stage": "Vegetative", "status": "Healthy"},
+        {"date": "2024-12-02", "strain": "Wedding Cake", "stage": "Flowering", "status": "Healthy"},
+        {"date": "2024-12-05", "strain": "Animal Mints", "stage": "Flowering", "status": "Problems"},
+        {"date": "2025-01-10", "strain": "Cake Mints #1", "stage": "Flowering", "status": "Healthy"},
+    ]
+    assert compile_query("log: stage=Flowering").target == "log"
+    found = filter_log("log: stage=Flowering since 2024-12-01 status!=Healthy", log)
+    assert found == [log[2]]
+    assert filter_log("since 2024-12-01 before 2025-01-10", log) == [log[1], log[2]]
+    assert filter_log("until 2024-12-02 wedding", log) == log[:2]
+    assert strains_with_log_matches("log: stage=Flowering", log) == {"Wedding Cake", "Animal Mints", "Cake Mints #1"}
+    with pytest.raises(QueryError):
+        filter_strains("log: stage=Flowering", collection())
+
+
+@pytest.mark.parametrize("query", ["thc>=", "(owned", "owned)", "colour=red", "owned and", "gender=Female !",
+                                   "log: thc>20"])
+def test_malformed_queries_raise(query):
+    with pytest.raises(QueryError):
+        compile_query(query)
+
+
+def test_cached_plans_keep_no_state_between_runs():
+    plan = compile_query("parent")
+    assert compile_query("parent") is plan
+    assert plan.run(collection(), parent_strains={"Animal Mints"}) == ["Animal Mints"]
+    assert sorted(plan.run(collection())) == ["Animal Mints", "Triangle Kush", "Wedding Cake"]
+    assert plan.run({"Solo": {"lineage": "Unknown"}}) == []
+    assert not plan.matches("Animal Mints", {})
+    assert plan.matches("Animal Mints", {}, parent_strains={"Animal Mints"})
+    assert not hasattr(plan, "context")
+
+
+def test_index_narrowed_runs_match_full_scans():
+    random.seed(11)
+    plant_genetics = {}
+    for i in range(300):
+        info = {}
+        if random.random() < 0.8:
+            info["THC"] = f"{random.choice([15, 18.5, 20, 22, 25, 27.5])}%"
+        if random.random() < 0.5:
+            info["Myrcene"] = str(random.choice([0.2, 0.5, 0.9]))
+        if random.random() < 0.6:
+            info["Dominance"] = random.choice(["Indica", "Sativa", "Hybrid"])
+        plant_genetics[f"Strain {i}"] = {"owned": random.random() < 0.5, "genetic_info": info,
+                                         "gender": random.choice(["Female", "Male"])}
+    indexes = TraitStore(lambda: plant_genetics).query_indexes()
+    queries = ["thc>=20", "thc<20 and myrcene>0.3", "thc=20 owned", "thc!=20 and dominance=sativa",
+               "dominance=Indica and myrcene<=0.5 and gender=Female", "thc>=22 or myrcene>0.5",
+               "not thc>=20", "thc>20 and (dominance=Indica or dominance=Hybrid)", "myrcene=0.9 strain"]
+    for query in queries:
+        plan = compile_query(query)
+        assert sorted(plan.run(plant_genetics, indexes)) == sorted(plan.run(plant_genetics)), query
+
+
+def test_flowering_days_reads_trait_range_cache():
+    plant_genetics = make_genetics()
+    ranges = TraitRangeCache(lambda: plant_genetics)
+    assert filter_strains("flowering_days<60", plant_genetics) == ["Fast"]
+    assert filter_strains("flowering_days<60", plant_genetics, trait_ranges=ranges) == ["Fast"]
+    assert set(ranges.records) == set(plant_genetics)
+
+    # Cached ranges follow edits to the text they were parsed from
+    plant_genetics["Slow"]["flowering_time"] = "6 weeks"
+    assert filter_strains("flowering_days<60", plant_genetics, trait_ranges=ranges) == ["Fast", "Slow"]
+    assert filter_strains("not flowering_days<60", plant_genetics, trait_ranges=ranges) == ["Unknown"]
@@ -0,0 +1,84 @@
+# test_similarity.py
+import random
+import numpy as np
+from events import ChangeBatch, ChangeEvent, STRAIN_ADDED, STRAIN_UPDATED, STRAIN_DELETED
+from trait_store import TraitStore
+from similarity import SimilarityEngine, COSINE, EUCLIDEAN, top_k
+
+K = 5
+
+
+def strain(rng):
+    return {"genetic_info": {"THC": f"{rng.uniform(10, 30):.3f}", "CBD": f"{rng.uniform(0, 5):.3f}",
+                             "Myrcene": f"{rng.uniform(0, 2):.3f}", "Limonene": f"{rng.uniform(0, 2):.3f}"}}
+
+
+def expected_neighbors(engine, name):
+    """Brute force over the engine's current (frozen) standardization."""
+    vectors = engine.vectors
+    row = engine.store.rows.get(name)
+    if row is None or not vectors.valid[row]:
+        return []
+    columns, picked = top_k(vectors.scores([row]), K)
+    return [(engine.store.names[other], vectors.report(score))
+            for other, score in zip(columns[0], picked[0]) if np.isfinite(score)]
+
+
+def check(engine, plants):
+    for name in plants:
+        found = engine.neighbors(name, K)
+        wanted = expected_neighbors(engine, name)
+        assert all(other is not None for other, score in found)
+        assert [other for other, score in found] == [other for other, score in wanted], name
+        assert np.allclose([score for other, score in found], [score for other, score in wanted])
+
+
+def run_fuzz(metric, seed):
+    rng = random.Random(seed)
+    plants = {f"S{i}": strain(rng) for i in range(200)}
+    store = TraitStore(lambda: plants)
+    engine = SimilarityEngine(store, metric=metric, k=K)
+    engine.refresh()
+    for step in range(60):
+        events = []
+        for _ in range(rng.randint(1, 4)):  # Few enough changes to patch rather than rebuild
+            action = rng.random()
+            name = rng.choice(list(plants))
+            if action < 0.4:
+                plants[name] = strain(rng)
+                events.append(ChangeEvent(STRAIN_UPDATED, name))
+            elif action < 0.7:
+                del plants[name]
+                events.append(ChangeEvent(STRAIN_DELETED, name))
+            elif action < 0.85:
+                plants[name] = {"genetic_info": {}}  # No longer comparable
+                events.append(ChangeEvent(STRAIN_UPDATED, name))
+            else:
+                plants[f"A{step}_{len(events)}"] = strain(rng)
+                events.append(ChangeEvent(STRAIN_ADDED, f"A{step}_{len(events)}"))
+        batch = ChangeBatch(events)
+        store.apply(batch)
+        engine.apply(batch)
+        check(engine, plants)
+
+
+def test_patch_matches_rebuild_with_deletions_cosine():
+    run_fuzz(COSINE, 1)
+
+
+def test_patch_matches_rebuild_with_deletions_euclidean():
+    run_fuzz(EUCLIDEAN, 2)
+
+
+def test_deleted_strain_leaves_neighbor_lists():
+    rng = random.Random(3)
+    plants = {f"S{i}": strain(rng) for i in range(30)}
+    store = TraitStore(lambda: plants)
+    engine = SimilarityEngine(store, k=K)
+    victim = engine.neighbors("S0", 1)[0][0]
+    del plants[victim]
+    batch = ChangeBatch([ChangeEvent(STRAIN_DELETED, victim)])
+    store.apply(batch)
+    engine.apply(batch)
+    assert all(victim not in [other for other, score in engine.neighbors(name)] for name in plants)
+    assert all(other is not None for name in plants for other, score in engine.neighbors(name))
@@ -0,0 +1,63 @@
+# test_trait_store.py
+import random
+import numpy as np
+from events import ChangeBatch, ChangeEvent, STRAIN_ADDED, STRAIN_UPDATED, STRAIN_DELETED, STRAIN_RENAMED
+from trait_store import TraitStore
+
+
+def strain(thc=None, aroma=None, flowering="Unknown"):
+    info = {}
+    if thc is not None:
+        info["THC %"] = f"{thc}%"
+    if aroma is not None:
+        info["Aroma"] = aroma
+    return {"genetic_info": info, "flowering_time": flowering, "type": "Hybrid"}
+
+
+def batch(*events):
+    return ChangeBatch([ChangeEvent(*event) for event in events])
+
+
+def snapshot(store):
+    """Every live strain's numeric row and category texts, independent of row numbers."""
+    rows = {}
+    for name, row in store.rows.items():
+        categories = tuple(store.categories[column][code] if code >= 0 else None
+                           for column, code in zip(store.categorical_columns, store.codes[row]))
+        rows[name] = (tuple(np.nan_to_num(store.numbers[row], nan=-1.0)), categories)
+    return rows
+
+
+def test_filter_sort_and_lookup():
+    plants = {"A": strain(18, "Citrus"), "B": strain(25, "citrus"), "C": strain(), "D": strain(22, "Gas")}
+    store = TraitStore(lambda: plants)
+    assert store.filter(ranges={"thc": (20, None)}) == ["B", "D"]
+    assert sorted(store.filter(equals={"aroma": "CITRUS"})) == ["A", "B"]
+    assert store.sort("thc", descending=True) == ["B", "D", "A", "C"]  # Missing last
+    assert sorted(store.lookup("thc", ">=", "20")) == ["B", "D"]
+    assert store.aggregate("thc")["count"] == 3
+
+
+def test_events_match_rebuild():
+    random.seed(7)
+    plants = {f"S{i}": strain(random.uniform(10, 30), random.choice(["Gas", "Fruit"])) for i in range(50)}
+    store = TraitStore(lambda: plants)
+    for step in range(300):
+        name = random.choice(list(plants))
+        action = random.random()
+        if action < 0.4:
+            plants[name] = strain(random.choice([None, random.uniform(10, 30)]), random.choice([None, "Gas", "Pine"]))
+            store.apply(batch((STRAIN_UPDATED, name)))
+        elif action < 0.6:
+            del plants[name]
+            store.apply(batch((STRAIN_DELETED, name)))
+        elif action < 0.8:
+            new_name = f"N{step}"
+            plants[new_name] = plants.pop(name)
+            store.apply(batch((STRAIN_RENAMED, new_name, name)))
+        else:
+            plants[f"A{step}"] = strain(random.uniform(10, 30))
+            store.apply(batch((STRAIN_ADDED, f"A{step}")))
+    assert snapshot(store) == snapshot(TraitStore(lambda: plants))
+    assert sorted(store.filter(ranges={"thc": (20, None)})) == \
+        sorted(TraitStore(lambda: plants).filter(ranges={"thc": (20, None)}))
@@ -0,0 +1,140 @@
+# timeline.py
+from datetime import date
+from events import STRAINS_RESET
+
+HARVESTED_STAGES = {"Harvested"}
+FLOWERING_STAGE = "Flowering"
+
+
+def entry_stage(entry):
+    """
+    The growth stage an entry records. GrowLogManager entries have a 'stage';
+    the modular app's log only has 'status', which holds the stage there.
+    """
+    return entry.get('stage') or entry.get('status') or "Unknown"
+
+
+class StageRun:
+    """Where one plant's log currently stands: the latest stage and the day it began."""
+
+    __slots__ = ("strain", "stage", "stage_start", "last_day", "entry_count")
+
+    def __init__(self, strain, stage, stage_start, last_day, entry_count):
+        self.strain = strain
+        self.stage = stage
+        self.stage_start = stage_start  # Day ordinal of the first entry of the current stage
+        self.last_day = last_day        # Day ordinal of the most recent entry
+        self.entry_count = entry_count
+
+
+class PlantTimeline:
+    """A StageRun evaluated against a given day, with the projected harvest window."""
+
+    __slots__ = ("strain", "stage", "stage_start", "last_day", "days_in_stage",
+                 "harvest_start", "harvest_end")
+
+    def __init__(self, run, today, flowering):
+        self.strain = run.strain
+        self.stage = run.stage
+        self.stage_start = run.stage_start
+        self.last_day = run.last_day
+        self.days_in_stage = today - run.stage_start
+        self.harvest_start = self.harvest_end = None
+        if run.stage == FLOWERING_STAGE and flowering is not None:
+            self.harvest_start = run.stage_start + flowering[0]
+            self.harvest_end = run.stage_start + flowering[1]
+
+    def harvest_window(self):
+        """(earliest, latest) harvest dates, or None when it can't be projected."""
+        if self.harvest_start is None:
+            return None
+        return date.fromordinal(self.harvest_start), date.fromordinal(self.harvest_end)
+
+
+class StageTimelineEngine:
+    """
+    Current stage, stage start, days in stage and harvest window for every
+    plant with a grow log, computed in one pass over a GrowLogIndex.
+
+    Each strain's StageRun is cached and only recomputed after its log
+    changed (invalidate()/apply() with log events), so refreshing the whole
+    room after one edit costs one strain's walk. Day counts and harvest
+    windows depend on today's date and the strain's flowering time, so they
+    are evaluated from the cached runs on every call, which is only
+    arithmetic. `index_source` returns the current GrowLogIndex and
+    `flowering_source(strain)` its (shortest, longest) flowering days or
+    None, e.g. TraitRangeCache.flowering_days.
+    """
+
+    def __init__(self, index_source, flowering_source):
+        self.index_source = index_source
+        self.flowering_source = flowering_source
+        self.runs = {}       # strain -> StageRun
+        self.dirty = set()   # strains whose cached run is stale
+        self.index = None    # The index the cache was built from
+
+    def invalidate(self, names=None):
+        """Marks `names` (or everything, if None) for recomputation."""
+        if names is None:
+            self.index = None
+        else:
+            self.dirty.update(names)
+
+    def apply(self, batch):
+        """Invalidates the strains touched by an events.ChangeBatch."""
+        self.invalidate(None if batch.has(STRAINS_RESET) else batch.names())
+
+    def compute_run(self, index, strain):
+        entries = index.entries_for(strain)
+        if not entries:
+            return None
+        stage = entry_stage(entries[-1])
+        stage_start = index.day(entries[-1])
+        # Walk back only over the current stage's run of entries
+        for entry in reversed(entries):
+            if entry_stage(entry) != stage:
+                break
+            stage_start = index.day(entry)
+        return StageRun(strain, stage, stage_start, index.day(entries[-1]), len(entries))
+
+    def refresh(self):
+        """Brings the cached runs up to date and returns them by strain."""
+        index = self.index_source()
+        if index is not self.index:
+            # First use, or the log was reloaded: recompute everything
+            self.index = index
+            self.dirty = set(index.strain_names())
+            self.runs = {}
+        for strain in self.dirty:
+            run = self.compute_run(index, strain)
+            if run is None:
+                self.runs.pop(strain, None)
+            else:
+                self.runs[strain] = run
+        self.dirty = set()
+        return self.runs
+
+    def timeline(self, strain, today=None):
+        """The PlantTimeline for one strain, or None if it has no log entries."""
+        run = self.refresh().get(strain)
+        if run is None:
+            return None
+        today = date.today().toordinal() if today is None else today
+        return PlantTimeline(run, today, self.flowering_source(strain))
+
+    def timelines(self, today=None, include_harvested=False):
+        """
+        PlantTimelines for every active plant (harvested ones only on request),
+        soonest projected harvest first, then longest in stage.
+        """
+        today = date.today().toordinal() if today is None else today
+        results = []
+        for run in self.refresh().values():
+            if run.stage in HARVESTED_STAGES and not include_harvested:
+                continue
+            results.append(PlantTimeline(run, today, self.flowering_source(run.strain)))
+        no_harvest = float('inf')
+        results.sort(key=lambda timeline: (
+            timeline.harvest_start if timeline.harvest_start is not None else no_harvest,
+            -timeline.days_in_stage, timeline.strain))
+        return results
@@ -0,0 +1,81 @@
+# trait_map.py
+import weakref
+
+
+class TraitMap(dict):
+    """
+    A read-only genetic_info mapping. Clones are given their mother's
+    TraitMap object itself rather than a copy: nothing can change it in
+    place, so sharing it is safe and an edit to one plant never shows up on
+    another. A plant gets its own map only when its traits diverge (see
+    with_changes), so memory grows with the number of distinct trait sets,
+    not with the number of clones. Serializes with json like any dict.
+    """
+
+    __slots__ = ("__weakref__",)
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("TraitMap is read-only; use with_changes() to derive an edited copy")
+
+    __setitem__ = __delitem__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+    __ior__ = _read_only
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (TraitMap, (dict(self),))
+
+    def with_changes(self, changes=None, removed=()):
+        """
+        A TraitMap with `changes` applied and the `removed` keys dropped.
+        Returns this same map when nothing would differ, so saving unchanged
+        traits keeps the plant on the shared version.
+        """
+        changes = changes or {}
+        if (all(key in self and self[key] == value for key, value in changes.items())
+                and not any(key in self for key in removed)):
+            return self
+        values = dict(self)
+        values.update(changes)
+        for key in removed:
+            values.pop(key, None)
+        return TraitMap(values)
+
+
+EMPTY_TRAITS = TraitMap()
+
+
+class TraitMapPool:
+    """
+    Hands out one shared TraitMap per distinct set of traits, so records
+    loaded from JSON (where every clone has its own copy of its mother's
+    traits) or saved back to an earlier state share storage again. Holds
+    its maps weakly: a version nobody uses any more is freed.
+    """
+
+    def __init__(self):
+        self.maps = weakref.WeakValueDictionary()  # frozen items -> TraitMap
+
+    def intern(self, mapping):
+        if not mapping:
+            return EMPTY_TRAITS
+        try:
+            key = frozenset(mapping.items())
+        except TypeError:
+            # Unhashable values (hand-edited JSON) can't be pooled; still protect them
+            return mapping if isinstance(mapping, TraitMap) else TraitMap(mapping)
+        shared = self.maps.get(key)
+        if shared is None:
+            shared = mapping if isinstance(mapping, TraitMap) else TraitMap(mapping)
+            self.maps[key] = shared
+        return shared
+
+    def share_all(self, plant_genetics):
+        """Replaces every record's genetic_info with its pooled TraitMap."""
+        for details in plant_genetics.values():
+            details['genetic_info'] = self.intern(details.get('genetic_info') or {})
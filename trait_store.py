@@ -0,0 +1,243 @@
+# trait_store.py
+"""
+Typed genetic traits held column by column in NumPy arrays, one row per
+strain, so range filters, sorting and aggregates over the whole collection
+run as array operations instead of loops over dicts of strings. Imported
+on first use: the apps build the store lazily so NumPy stays out of startup.
+"""
+import numpy as np
+from traits import TRAIT_SCHEMA, CATEGORICAL, read_traits
+from events import STRAIN_RENAMED, STRAINS_RESET
+
+INITIAL_CAPACITY = 256
+MISSING_CODE = -1
+
+
+class TraitStore:
+    """
+    Row `i` of every column belongs to strain `names[i]`; `rows` maps a name
+    to its row (the strain's ID here). Numeric and terpene traits live in a
+    float matrix with NaN for "not recorded"; categorical traits are int
+    codes into a per-column category list, MISSING_CODE when not recorded.
+    Deleted strains free their row for reuse. Kept current from strain
+    events like the other indexes. `source` is a callable returning the
+    plant genetics dict.
+    """
+
+    def __init__(self, source, schema=TRAIT_SCHEMA):
+        self.source = source
+        self.numeric_columns = [column.name for column in schema if column.kind != CATEGORICAL]
+        self.categorical_columns = [column.name for column in schema if column.kind == CATEGORICAL]
+        self.numeric_position = {name: i for i, name in enumerate(self.numeric_columns)}
+        self.categorical_position = {name: i for i, name in enumerate(self.categorical_columns)}
+        self.rebuild()
+
+    # Keeping the arrays current
+
+    def rebuild(self):
+        self.names = []      # row -> strain name, None for a freed row
+        self.rows = {}       # strain name -> row
+        self.free_rows = []
+        self.numbers = np.full((INITIAL_CAPACITY, len(self.numeric_columns)), np.nan)
+        self.codes = np.full((INITIAL_CAPACITY, len(self.categorical_columns)), MISSING_CODE, dtype=np.int32)
+        self.live = np.zeros(INITIAL_CAPACITY, dtype=bool)
+        self.categories = {name: [] for name in self.categorical_columns}      # code -> text
+        self.category_codes = {name: {} for name in self.categorical_columns}  # casefolded text -> code
+        for name, details in self.source().items():
+            self.store(name, details)
+
+    def allocate_row(self, name):
+        if self.free_rows:
+            row = self.free_rows.pop()
+            self.names[row] = name
+        else:
+            row = len(self.names)
+            self.names.append(name)
+            if row >= len(self.live):
+                self.grow(2 * len(self.live))
+        self.rows[name] = row
+        self.live[row] = True
+        return row
+
+    def grow(self, capacity):
+        numbers = np.full((capacity, self.numbers.shape[1]), np.nan)
+        numbers[:len(self.numbers)] = self.numbers
+        codes = np.full((capacity, self.codes.shape[1]), MISSING_CODE, dtype=np.int32)
+        codes[:len(self.codes)] = self.codes
+        live = np.zeros(capacity, dtype=bool)
+        live[:len(self.live)] = self.live
+        self.numbers, self.codes, self.live = numbers, codes, live
+
+    def category_code(self, column, text):
+        codes = self.category_codes[column]
+        key = text.casefold()
+        if key not in codes:
+            codes[key] = len(self.categories[column])
+            self.categories[column].append(text)
+        return codes[key]
+
+    def store(self, name, details):
+        """Writes one strain's parsed traits into its row, allocating the row if needed."""
+        row = self.rows.get(name)
+        if row is None:
+            row = self.allocate_row(name)
+        values = read_traits(details)
+        self.numbers[row] = [values.get(column, np.nan) for column in self.numeric_columns]
+        self.codes[row] = [self.category_code(column, values[column]) if column in values else MISSING_CODE
+                           for column in self.categorical_columns]
+
+    def discard(self, name):
+        row = self.rows.pop(name, None)
+        if row is None:
+            return
+        self.names[row] = None
+        self.live[row] = False
+        self.numbers[row] = np.nan
+        self.codes[row] = MISSING_CODE
+        self.free_rows.append(row)
+
+    def update(self, names):
+        """Re-reads added, edited or deleted strains."""
+        plant_genetics = self.source()
+        for name in names:
+            details = plant_genetics.get(name)
+            if details is None:
+                self.discard(name)
+            else:
+                self.store(name, details)
+
+    def apply(self, batch):
+        """Brings the store up to date with an events.ChangeBatch."""
+        if batch.has(STRAINS_RESET):
+            self.rebuild()
+            return
+        for event in batch:
+            if event.kind == STRAIN_RENAMED and event.old_name in self.rows and event.name not in self.rows:
+                row = self.rows.pop(event.old_name)
+                self.rows[event.name] = row
+                self.names[row] = event.name
+        self.update(batch.names())
+
+    # Vectorized reads
+
+    def column(self, name):
+        """The raw column over all rows: floats for numeric traits, category codes otherwise."""
+        used = len(self.names)
+        if name in self.numeric_position:
+            return self.numbers[:used, self.numeric_position[name]]
+        if name in self.categorical_position:
+            return self.codes[:used, self.categorical_position[name]]
+        raise KeyError(f"Unknown trait column {name!r}")
+
+    def row_mask(self, names=None):
+        """Live rows, narrowed to `names` when given."""
+        used = len(self.names)
+        if names is None:
+            return self.live[:used].copy()
+        mask = np.zeros(used, dtype=bool)
+        mask[[self.rows[name] for name in names if name in self.rows]] = True
+        return mask
+
+    def names_where(self, mask):
+        return [self.names[row] for row in np.flatnonzero(mask)]
+
+    def range_mask(self, column, low=None, high=None):
+        """Rows whose value lies in [low, high]; missing values never match."""
+        values = self.column(column)
+        mask = self.live[:len(self.names)] & ~np.isnan(values)
+        if low is not None:
+            mask &= values >= low
+        if high is not None:
+            mask &= values <= high
+        return mask
+
+    def equals_mask(self, column, text):
+        """Rows whose categorical value is `text`, ignoring case."""
+        code = self.category_codes[column].get(text.casefold())
+        if code is None:
+            return np.zeros(len(self.names), dtype=bool)
+        return self.live[:len(self.names)] & (self.column(column) == code)
+
+    def filter(self, ranges=None, equals=None, names=None):
+        """
+        Names of strains within every (low, high) in `ranges` and equal to
+        every value in `equals` (both keyed by column), in row order.
+        """
+        mask = self.row_mask(names)
+        for column, (low, high) in (ranges or {}).items():
+            mask &= self.range_mask(column, low, high)
+        for column, text in (equals or {}).items():
+            mask &= self.equals_mask(column, text)
+        return self.names_where(mask)
+
+    def sort(self, column, names=None, descending=False):
+        """Names ordered by a column; strains without the trait come last either way."""
+        rows = np.flatnonzero(self.row_mask(names))
+        if column in self.categorical_position:
+            # Order codes by their text, keeping missing codes at the end
+            order = sorted(range(len(self.categories[column])), key=lambda code: self.categories[column][code].lower())
+            ranks = np.empty(len(order) + 1, dtype=np.float64)
+            ranks[order] = np.arange(len(order))
+            ranks[-1] = np.nan  # MISSING_CODE indexes the last slot
+            keys = ranks[self.column(column)[rows]]
+        else:
+            keys = self.column(column)[rows]
+        if descending:
+            keys = -keys
+        # NaN sorts last; stable so ties keep row order
+        return [self.names[row] for row in rows[np.argsort(keys, kind="stable")]]
+
+    def aggregate(self, column, names=None):
+        """
+        Summary of a column over `names` (every strain by default): count,
+        mean, median, min and max for numeric traits, {category: count} for
+        categorical ones.
+        """
+        values = self.column(column)[self.row_mask(names)]
+        if column in self.categorical_position:
+            counts = np.bincount(values[values != MISSING_CODE], minlength=len(self.categories[column]))
+            return {self.categories[column][code]: int(count) for code, count in enumerate(counts) if count}
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return {"count": 0, "mean": None, "median": None, "min": None, "max": None}
+        return {"count": int(len(values)), "mean": float(values.mean()), "median": float(np.median(values)),
+                "min": float(values.min()), "max": float(values.max())}
+
+    # Query language indexes
+
+    def lookup(self, column, op, value):
+        """
+        Candidate names for a query comparison on a trait field (see
+        QueryPlan._candidates), or None when the store can't answer it.
+        """
+        if column in self.categorical_position:
+            if op == "=":
+                return self.names_where(self.equals_mask(column, value))
+            return None
+        try:
+            number = float(value)
+        except ValueError:
+            return None
+        values = self.column(column)
+        live = self.live[:len(self.names)]
+        with np.errstate(invalid="ignore"):
+            if op == "=":
+                mask = values == number
+            elif op == "!=":
+                mask = ~(values == number)  # Strains without the trait match "!="
+            elif op == "<":
+                mask = values < number
+            elif op == "<=":
+                mask = values <= number
+            elif op == ">":
+                mask = values > number
+            elif op == ">=":
+                mask = values >= number
+            else:
+                return None
+        return self.names_where(live & mask)
+
+    def query_indexes(self):
+        """{field: lookup(op, value)} for QueryPlan.run, one per trait column."""
+        return {column: (lambda op, value, column=column: self.lookup(column, op, value))
+                for column in self.numeric_columns + self.categorical_columns}
@@ -0,0 +1,402 @@
+# traits.py
+import re
+from events import STRAINS_RESET
+
+# "65-70", "8 to 9", "63", "7.5"
+RANGE_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*(?:(?:-|–|to)\s*(\d+(?:\.\d+)?))?")
+
+DAYS_PER_UNIT = {
+    "d": 1, "day": 1, "days": 1,
+    "w": 7, "wk": 7, "wks": 7, "week": 7, "weeks": 7,
+    "mo": 30, "month": 30, "months": 30,
+}
+# A bare number this small is a week count ("9"); anything larger is days ("65")
+MAX_BARE_WEEKS = 20
+
+GRAMS_PER_UNIT = {
+    "g": 1, "gr": 1, "gram": 1, "grams": 1,
+    "kg": 1000, "oz": 28.35, "ounce": 28.35, "ounces": 28.35,
+    "lb": 453.6, "lbs": 453.6, "pound": 453.6, "pounds": 453.6,
+}
+# Suffixes meaning "per square meter" / "per square foot"; per-foot figures are converted to per-meter
+PER_SQUARE_METER = ("psm", "gsm", "/m2", "/m²", "/sqm", "per m2", "per square meter", "m2", "m²")
+PER_SQUARE_FOOT = ("/ft2", "/ft²", "/sqft", "per sq ft", "per square foot", "sqft", "ft2", "ft²")
+SQUARE_FEET_PER_METER = 10.764
+PER_PLANT = ("/plant", "per plant", "a plant", "each")
+
+# Word yields become a 1-4 size class
+YIELD_CLASSES = {
+    "low": 1, "small": 1,
+    "medium": 2, "moderate": 2, "average": 2,
+    "high": 3, "large": 3, "heavy": 3,
+    "very high": 4, "very large": 4, "huge": 4, "xl": 4,
+}
+
+
+class NumericRange:
+    """A low-high range of a trait in a normalized unit ("days", "g", "g/m2", "g/plant" or "class")."""
+
+    __slots__ = ("low", "high", "unit")
+
+    def __init__(self, low, high, unit):
+        self.low = low
+        self.high = high
+        self.unit = unit
+
+    def midpoint(self):
+        return (self.low + self.high) / 2
+
+    def __eq__(self, other):
+        return (isinstance(other, NumericRange)
+                and (self.low, self.high, self.unit) == (other.low, other.high, other.unit))
+
+    def __repr__(self):
+        return f"NumericRange({self.low!r}, {self.high!r}, {self.unit!r})"
+
+
+def find_range(text):
+    """Returns (low, high, text after the numbers) for the first number or range in `text`, or None."""
+    match = RANGE_PATTERN.search(text)
+    if match is None:
+        return None
+    low = float(match.group(1))
+    high = float(match.group(2)) if match.group(2) else low
+    if high < low:
+        low, high = high, low
+    return low, high, text[match.end():].strip()
+
+
+def parse_flowering_time(text):
+    """
+    Normalizes flowering time text ("65-70 days", "8-9 weeks", "9-10 wks",
+    "63") to a NumericRange in days, or None when there is no number in it.
+    """
+    if not isinstance(text, str):
+        text = str(text)
+    found = find_range(text.lower())
+    if found is None:
+        return None
+    low, high, rest = found
+    unit = re.match(r"[a-z]*", rest).group()
+    if unit in DAYS_PER_UNIT:
+        factor = DAYS_PER_UNIT[unit]
+    else:
+        factor = 7 if high <= MAX_BARE_WEEKS else 1
+    return NumericRange(round(low * factor), round(high * factor), "days")
+
+
+def parse_yield(text):
+    """
+    Normalizes yield text to a NumericRange: "250-300 gpsm" -> g/m2,
+    "2 oz per plant" -> g/plant, "1g" -> g, "Large" -> a 1-4 size class.
+    Returns None for "Unknown" and anything else without a number or size word.
+    """
+    if not isinstance(text, str):
+        text = str(text)
+    lowered = text.lower().strip()
+    found = find_range(lowered)
+    if found is None:
+        for word in sorted(YIELD_CLASSES, key=len, reverse=True):
+            if word in lowered:
+                size = YIELD_CLASSES[word]
+                return NumericRange(size, size, "class")
+        return None
+
+    low, high, rest = found
+    unit_word = re.match(r"[a-z]*", rest).group()
+    grams = GRAMS_PER_UNIT.get(unit_word, 1)  # "gpsm", "gsm" and bare numbers are grams
+
+    if any(suffix in rest for suffix in PER_SQUARE_FOOT):
+        grams *= SQUARE_FEET_PER_METER
+        unit = "g/m2"
+    elif any(suffix in rest for suffix in PER_SQUARE_METER):
+        unit = "g/m2"
+    elif any(suffix in rest for suffix in PER_PLANT):
+        unit = "g/plant"
+    else:
+        unit = "g"
+    return NumericRange(round(low * grams, 1), round(high * grams, 1), unit)
+
+
+class TraitRangeCache:
+    """
+    Parsed flowering time and yield ranges per strain. A record's text is
+    parsed the first time it is asked for and again only after it was edited
+    (the cached copy is kept next to the text it came from), so harvest
+    projections over the whole collection do no string parsing. `source` is
+    a callable returning the plant genetics dict.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.records = {}  # name -> (flowering text, flowering range, yield text, yield range)
+
+    def ranges(self, name):
+        """(flowering range, yield range) for `name`; either may be None."""
+        details = self.source().get(name)
+        if details is None:
+            self.records.pop(name, None)
+            return None, None
+        flowering_text = details.get('flowering_time', 'Unknown')
+        yield_text = details.get('yield', 'Unknown')
+        cached = self.records.get(name)
+        if cached is None or cached[0] != flowering_text or cached[2] != yield_text:
+            cached = (flowering_text, parse_flowering_time(flowering_text),
+                      yield_text, parse_yield(yield_text))
+            self.records[name] = cached
+        return cached[1], cached[3]
+
+    def flowering(self, name):
+        return self.ranges(name)[0]
+
+    def yield_range(self, name):
+        return self.ranges(name)[1]
+
+    def flowering_days(self, name):
+        """(shortest, longest) flowering days for `name`, or None if unknown."""
+        flowering = self.flowering(name)
+        if flowering is None:
+            return None
+        return flowering.low, flowering.high
+
+    def apply(self, batch):
+        """Drops the cached ranges of strains touched by an events.ChangeBatch."""
+        if batch.has(STRAINS_RESET):
+            self.records = {}
+            return
+        for name in batch.names():
+            self.records.pop(name, None)
+
+
+# Typed genetic_info traits. genetic_info stays a free-form name -> text map;
+# the schema says which of its keys mean what, so the numbers in it can be
+# filtered, sorted and summed (see trait_store.py).
+NUMERIC = "numeric"
+TERPENE = "terpene"
+CATEGORICAL = "categorical"
+
+TERPENES = ("myrcene", "limonene", "caryophyllene", "pinene", "linalool", "humulene", "terpinolene", "ocimene")
+
+# A free-text terpene profile: "Myrcene 0.8%, Limonene: 0.4, b-Caryophyllene 0.3%"
+TERPENE_PROFILE_KEYS = ("terpenes", "terpene profile", "terps")
+TERPENE_AMOUNT_PATTERN = re.compile(r"([a-z][a-z -]*?)\s*[:=]?\s*(\d+(?:\.\d+)?)\s*%?")
+
+
+def normalize_trait_key(key):
+    """Lowercase words only: "THC (%)" -> "thc", "b-Caryophyllene" -> "b caryophyllene"."""
+    return " ".join(re.findall(r"[a-z0-9]+", str(key).lower()))
+
+
+class TraitColumn:
+    """One typed trait: its query/column name, kind, unit and the genetic_info keys that hold it."""
+
+    __slots__ = ("name", "kind", "unit", "label", "keys")
+
+    def __init__(self, name, kind, unit=None, label=None, keys=()):
+        self.name = name
+        self.kind = kind
+        self.unit = unit
+        self.label = label or name
+        self.keys = tuple(dict.fromkeys(normalize_trait_key(key) for key in (name, self.label) + tuple(keys)))
+
+    def __repr__(self):
+        return f"TraitColumn({self.name!r}, {self.kind!r})"
+
+
+TRAIT_SCHEMA = (
+    TraitColumn("thc", NUMERIC, "%", "THC %", ("thc percent", "thc content", "thc level")),
+    TraitColumn("cbd", NUMERIC, "%", "CBD %", ("cbd percent", "cbd content", "cbd level")),
+    TraitColumn("yield_gm2", NUMERIC, "g/m2", "Yield g/m2", ("yield", "indoor yield", "yield gm2", "yield psm")),
+    TraitColumn("stretch", NUMERIC, "x", "Stretch", ("stretch factor", "flower stretch")),
+    # Read from the record's flowering_time, not genetic_info
+    TraitColumn("flowering_days", NUMERIC, "days", "Flowering Days"),
+) + tuple(
+    TraitColumn(terpene, TERPENE, "%", f"{terpene.title()} %",
+                (f"terp {terpene}", f"{terpene} terpene", f"b {terpene}", f"beta {terpene}",
+                 f"a {terpene}", f"alpha {terpene}"))
+    for terpene in TERPENES
+) + (
+    TraitColumn("dominance", CATEGORICAL, None, "Dominance", ("indica sativa", "genetics type", "sativa indica")),
+    TraitColumn("aroma", CATEGORICAL, None, "Aroma", ("smell", "scent", "nose")),
+    TraitColumn("structure", CATEGORICAL, None, "Structure", ("plant structure", "growth structure")),
+)
+
+TRAIT_COLUMNS = {column.name: column for column in TRAIT_SCHEMA}
+TRAIT_KEYS = {key: column for column in TRAIT_SCHEMA for key in column.keys}
+
+
+def parse_trait_number(column, text):
+    """
+    The number a genetic_info value gives for a numeric or terpene column
+    (the midpoint of a range like "18-22%"), or None when there isn't one.
+    Yields must be per square meter; a stretch in percent is converted to a
+    factor ("100%" doubles -> 2.0).
+    """
+    if column.name == "yield_gm2":
+        found = parse_yield(text)
+        if found is None or found.unit not in ("g/m2", "g"):
+            return None
+        return found.midpoint()
+    found = find_range(str(text).lower())
+    if found is None:
+        return None
+    low, high, rest = found
+    value = (low + high) / 2
+    if column.name == "stretch" and rest.startswith("%"):
+        value = 1 + value / 100
+    return value
+
+
+def read_traits(details):
+    """
+    Typed trait values for one strain record as {column name: value}: floats
+    for numeric and terpene columns, stripped text for categorical ones.
+    genetic_info keys are matched through the schema, a free-text terpene
+    profile is split into its terpenes, and the record's own yield,
+    flowering_time and type fill in what genetic_info doesn't say.
+    """
+    found = {}
+    for key, text in (details.get('genetic_info') or {}).items():
+        normalized = normalize_trait_key(key)
+        column = TRAIT_KEYS.get(normalized)
+        if column is None:
+            if normalized in TERPENE_PROFILE_KEYS:
+                for terpene, amount in TERPENE_AMOUNT_PATTERN.findall(str(text).lower()):
+                    column = TRAIT_KEYS.get(normalize_trait_key(terpene))
+                    if column is not None and column.kind == TERPENE:
+                        found.setdefault(column.name, float(amount))
+            continue
+        if column.name in found or column.name == "flowering_days":
+            continue
+        if column.kind == CATEGORICAL:
+            value = str(text).strip()
+            if value and value != "Unknown":
+                found[column.name] = value
+        else:
+            value = parse_trait_number(column, text)
+            if value is not None:
+                found[column.name] = value
+
+    if "yield_gm2" not in found:
+        recorded = parse_yield(details.get('yield', 'Unknown'))
+        if recorded is not None and recorded.unit == "g/m2":
+            found["yield_gm2"] = recorded.midpoint()
+    flowering = parse_flowering_time(details.get('flowering_time', 'Unknown'))
+    if flowering is not None:
+        found["flowering_days"] = float(flowering.low)
+    if "dominance" not in found:
+        plant_type = str(details.get('type', 'Unknown')).strip()
+        if plant_type and plant_type != "Unknown":
+            found["dominance"] = plant_type
+    return found
+
+
+def invalid_trait_values(genetic_info):
+    """genetic_info keys that name a numeric trait but whose value has no usable number."""
+    invalid = []
+    for key, text in genetic_info.items():
+        column = TRAIT_KEYS.get(normalize_trait_key(key))
+        if column is not None and column.kind != CATEGORICAL and column.name != "flowering_days":
+            if parse_trait_number(column, text) is None:
+                invalid.append(key)
+    return invalid
+
+
+# Genotypes at tracked loci. A genetic_info key "Locus: <name>" holds the
+# plant's two alleles, e.g. "Locus: THCAS" = "BT/BD" or "Locus: Purple" =
+# "P/p"; allele symbols are case-sensitive. Sex comes from the record's
+# gender (X/X or X/Y) unless a "Locus: Sex" entry says otherwise. Markers on
+# the sex chromosomes are written with "Y" as a male's second allele
+# ("Xr/Y"), so they follow the sex chromosomes through crosses (see punnett.py).
+LOCUS_PREFIX = "locus"
+ALLELE_SEPARATOR = re.compile(r"\s*[/|,;]\s*|\s+")
+SEX_LOCUS = "sex"
+Y_ALLELE = "Y"
+SEX_GENOTYPES = {"Female": ("X", "X"), "Male": ("X", "Y")}
+
+
+class Locus:
+    """A locus with known alleles: its label, the keys naming it and the phenotype of each genotype."""
+
+    __slots__ = ("name", "label", "keys", "phenotypes", "alleles")
+
+    def __init__(self, name, label, phenotypes, keys=()):
+        self.name = name
+        self.label = label
+        self.keys = tuple(dict.fromkeys(normalize_trait_key(key) for key in (name, label) + tuple(keys)))
+        self.phenotypes = {tuple(sorted(genotype)): phenotype for genotype, phenotype in phenotypes.items()}
+        self.alleles = {allele for genotype in self.phenotypes for allele in genotype}
+
+    def phenotype(self, genotype):
+        return self.phenotypes.get(tuple(sorted(genotype)))
+
+    def __repr__(self):
+        return f"Locus({self.name!r})"
+
+
+KNOWN_LOCI = (
+    # THCA / CBDA synthase: BT and BD are codominant, B0 is a non-functional allele
+    Locus("chemotype", "Chemotype", {
+        ("BT", "BT"): "Type I (THC)", ("BT", "B0"): "Type I (THC)",
+        ("BT", "BD"): "Type II (THC:CBD)",
+        ("BD", "BD"): "Type III (CBD)", ("BD", "B0"): "Type III (CBD)",
+        ("B0", "B0"): "Type IV (CBG)",
+    }, ("thcas cbdas", "thcas", "cbdas", "b locus", "synthase")),
+    Locus(SEX_LOCUS, "Sex", {("X", "X"): "Female", ("X", "Y"): "Male", ("Y", "Y"): "Not viable"}),
+)
+LOCUS_KEYS = {key: locus for locus in KNOWN_LOCI for key in locus.keys}
+LOCI = {locus.name: locus for locus in KNOWN_LOCI}
+
+
+def locus_of(key):
+    """
+    The locus a genetic_info key names ("Locus: THCAS" -> "chemotype",
+    "Locus: Purple" -> "purple"), or None when the key isn't a genotype.
+    Known loci may leave out the "Locus:" prefix.
+    """
+    normalized = normalize_trait_key(key)
+    words = normalized.split(" ", 1)
+    if words[0] == LOCUS_PREFIX:
+        if len(words) == 1:
+            return None
+        normalized = words[1]
+    elif normalized not in LOCUS_KEYS:
+        return None
+    locus = LOCUS_KEYS.get(normalized)
+    return locus.name if locus is not None else normalized
+
+
+def parse_genotype(text, locus=None):
+    """
+    The two alleles in a genotype value ("BT/BD", "A a", "Aa" for
+    single-letter alleles), sorted so phase doesn't matter, or None. A
+    known `locus` only accepts its own alleles.
+    """
+    alleles = [allele for allele in ALLELE_SEPARATOR.split(str(text).strip()) if allele]
+    if len(alleles) == 1 and len(alleles[0]) == 2:
+        alleles = list(alleles[0])
+    if len(alleles) != 2:
+        return None
+    if locus in LOCI and not LOCI[locus].alleles.issuperset(alleles):
+        return None
+    return tuple(sorted(alleles))
+
+
+def read_genotypes(details):
+    """{locus: (allele, allele)} for one strain record, sex included when its gender is known."""
+    genotypes = {}
+    for key, text in (details.get('genetic_info') or {}).items():
+        locus = locus_of(key)
+        if locus is not None and locus not in genotypes:
+            genotype = parse_genotype(text, locus)
+            if genotype is not None:
+                genotypes[locus] = genotype
+    if SEX_LOCUS not in genotypes and details.get('gender') in SEX_GENOTYPES:
+        genotypes[SEX_LOCUS] = SEX_GENOTYPES[details['gender']]
+    return genotypes
+
+
+def invalid_genotype_values(genetic_info):
+    """genetic_info keys that name a locus but whose value isn't two (known) alleles."""
+    return [key for key, text in genetic_info.items()
+            if locus_of(key) is not None and parse_genotype(text, locus_of(key)) is None]